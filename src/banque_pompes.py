@@ -0,0 +1,458 @@
+import numpy as np
+
+from carburant import Carburant
+from statut import Statut
+
+
+class BanquePompes:
+    """Représente un parc de pompes stocké en colonnes.
+
+    Les volumes maximaux et disponibles de toutes les pompes sont rangés
+    dans deux tableaux NumPy contigus, au lieu d'un objet `Pompe` par
+    pompe. Les opérations vectorisées s'appliquent à des tableaux
+    d'indices et suivent les règles de `Pompe._remplir` et
+    `Pompe._servir` : chaque volume est limité par la place ou le volume
+    restant, et un indice répété est traité comme des appels successifs.
+    `pompe` fournit une vue qui s'utilise comme une `Pompe`.
+
+    Examples
+    --------
+    >>> from substance_chimique import SubstanceChimique
+    >>> butane = SubstanceChimique(
+    ...     nom='butane', numero_cas='106-97-8', numero_ce='203-448-7')
+    >>> gpl = Carburant(nom='GPL', composition_chimique={butane: 1.0})
+    >>> banque = BanquePompes([gpl, gpl, gpl], [10, 10, 10], [5, 0, 10])
+    >>> banque.servir([0, 0, 1, 2], [3, 3, 1, 4])
+    array([3, 2, 0, 4])
+    >>> banque.vide([0, 1, 2])
+    array([ True,  True, False])
+    >>> banque.remplir([1, 2], [12, 12])
+    array([10,  4])
+    >>> pompe = banque.pompe(2)
+    >>> pompe._servir(3), pompe.volume_disponible
+    (3, 7)
+
+    """
+
+    def __init__(
+            self, carburants: list[Carburant] = (),
+            volumes_maximaux=(), volumes_disponibles=None) -> None:
+        """Initialise un parc de pompes.
+
+        Parameters
+        ----------
+        carburants : list[Carburant]
+            Les carburants des pompes.
+        volumes_maximaux : Sequence[int] ou np.ndarray
+            Les volumes maximaux des pompes, > 0.
+        volumes_disponibles : Sequence[int] ou np.ndarray
+            Les volumes disponibles des pompes. Par défaut, les pompes sont
+            vides.
+
+        """
+        # Vérification des arguments
+        carburants = list(carburants)
+        maximaux = self.__entiers(volumes_maximaux)
+        if volumes_disponibles is None:
+            disponibles = np.zeros_like(maximaux)
+        else:
+            disponibles = self.__entiers(volumes_disponibles)
+        if not len(carburants) == len(maximaux) == len(disponibles):
+            raise ValueError("Les arguments doivent avoir la même longueur.")
+        if not all(isinstance(c, Carburant) for c in carburants):
+            raise TypeError("Le carburant doit être de type 'Carburant'.")
+        if np.any(maximaux <= 0):
+            raise ValueError("Le volume maximal doit être > 0.")
+        if np.any((disponibles < 0) | (disponibles > maximaux)):
+            raise ValueError(
+                "Le volume disponible doit être entre 0 et le volume maximal."
+            )
+
+        # Assignation des attributs
+        self.__carburants = carburants
+        self.__maximaux = maximaux.copy()
+        self.__disponibles = disponibles.copy()
+        self.__taille = len(carburants)
+
+    @staticmethod
+    def __entiers(valeurs) -> np.ndarray:
+        """Convertit des volumes en tableau d'entiers."""
+        valeurs = np.asarray(valeurs).reshape(-1)
+        if len(valeurs) == 0:
+            return valeurs.astype(np.int64)
+        if not np.issubdtype(valeurs.dtype, np.integer):
+            raise TypeError("Les volumes doivent être des entiers.")
+        return valeurs.astype(np.int64)
+
+    def __len__(self) -> int:
+        """Retourne le nombre de pompes du parc."""
+        return self.__taille
+
+    @property
+    def volumes_maximaux(self) -> np.ndarray:
+        """Les volumes maximaux des pompes, en lecture seule."""
+        return self.__lecture_seule(self.__maximaux)
+
+    @property
+    def volumes_disponibles(self) -> np.ndarray:
+        """Les volumes disponibles des pompes, en lecture seule."""
+        return self.__lecture_seule(self.__disponibles)
+
+    def __lecture_seule(self, colonne: np.ndarray) -> np.ndarray:
+        """Retourne une vue en lecture seule des pompes d'une colonne."""
+        vue = colonne[:self.__taille]
+        vue.flags.writeable = False
+        return vue
+
+    def ajouter(
+            self, carburant: Carburant, volume_maximal: int,
+            volume_disponible: int = 0) -> int:
+        """Ajoute une pompe au parc.
+
+        Parameters
+        ----------
+        carburant : Carburant
+            Le carburant de la pompe.
+        volume_maximal : int
+            Le volume maximal de la pompe.
+        volume_disponible : int
+            Le volume disponible de la pompe.
+
+        Returns
+        -------
+        int
+            L'indice de la pompe.
+
+        """
+        # Vérification des arguments, comme Pompe
+        if not isinstance(carburant, Carburant):
+            raise TypeError("Le carburant doit être de type 'Carburant'.")
+        if not isinstance(volume_maximal, int):
+            raise TypeError("Le volume maximal doit être de type 'int'.")
+        if not isinstance(volume_disponible, int):
+            raise TypeError("Le volume disponible doit être de type 'int'.")
+        if not volume_maximal > 0:
+            raise ValueError("Le volume maximal doit être > 0.")
+        if not 0 <= volume_disponible <= volume_maximal:
+            raise ValueError(
+                "Le volume disponible doit être entre 0 et le volume maximal."
+            )
+
+        # Les colonnes doublent de capacité quand elles sont pleines
+        if self.__taille == len(self.__maximaux):
+            capacite = max(2 * self.__taille, 16)
+            for nom in ('_BanquePompes__maximaux',
+                        '_BanquePompes__disponibles'):
+                colonne = np.zeros(capacite, dtype=np.int64)
+                colonne[:self.__taille] = getattr(self, nom)[:self.__taille]
+                setattr(self, nom, colonne)
+
+        # Ajout de la pompe
+        indice = self.__taille
+        self.__carburants.append(carburant)
+        self.__maximaux[indice] = volume_maximal
+        self.__disponibles[indice] = volume_disponible
+        self.__taille += 1
+        return indice
+
+    def pompe(self, indice: int) -> 'VuePompe':
+        """Retourne une vue d'une pompe, utilisable comme une `Pompe`.
+
+        Parameters
+        ----------
+        indice : int
+            L'indice de la pompe.
+
+        Returns
+        -------
+        VuePompe
+            La vue de la pompe.
+
+        """
+        if not -self.__taille <= indice < self.__taille:
+            raise IndexError("L'indice de la pompe est invalide.")
+        return VuePompe(self, indice % self.__taille)
+
+    def carburant(self, indice: int) -> Carburant:
+        """Retourne le carburant d'une pompe."""
+        return self.__carburants[indice]
+
+    def changer_carburant(self, indice: int, carburant: Carburant) -> None:
+        """Remplace le carburant d'une pompe."""
+        if not isinstance(carburant, Carburant):
+            raise TypeError("Le carburant doit être de type 'Carburant'.")
+        self.__carburants[indice] = carburant
+
+    def vide(self, indices=None) -> np.ndarray:
+        """Indique quelles pompes sont vides.
+
+        Parameters
+        ----------
+        indices : Sequence[int] ou np.ndarray
+            Les indices des pompes. Par défaut, toutes les pompes.
+
+        Returns
+        -------
+        np.ndarray
+            True pour chaque pompe vide, False sinon.
+
+        """
+        disponibles = self.__disponibles[:self.__taille]
+        if indices is None:
+            return disponibles == 0
+        return disponibles[self.__indices(indices)] == 0
+
+    def remplir(self, indices, volumes) -> np.ndarray:
+        """Remplit des pompes.
+
+        Parameters
+        ----------
+        indices : Sequence[int] ou np.ndarray
+            Les indices des pompes, éventuellement répétés.
+        volumes : Sequence[int] ou np.ndarray
+            Les volumes à ajouter, > 0.
+
+        Returns
+        -------
+        np.ndarray
+            Les volumes ajoutés, limités par la place restante.
+
+        """
+        return self.__appliquer(indices, volumes, 1)
+
+    def servir(self, indices, volumes) -> np.ndarray:
+        """Sert du carburant.
+
+        Parameters
+        ----------
+        indices : Sequence[int] ou np.ndarray
+            Les indices des pompes, éventuellement répétés.
+        volumes : Sequence[int] ou np.ndarray
+            Les volumes à servir, > 0.
+
+        Returns
+        -------
+        np.ndarray
+            Les volumes servis, limités par le volume disponible.
+
+        """
+        return self.__appliquer(indices, volumes, -1)
+
+    def _remplir_un(self, indice: int, volume: int) -> int:
+        """Remplit une pompe, sans passer par les tableaux d'indices."""
+        if not volume > 0:
+            raise ValueError("Le volume doit être > 0.")
+        disponible = int(self.__disponibles[indice])
+        ajoute = min(volume, int(self.__maximaux[indice]) - disponible)
+        self.__disponibles[indice] = disponible + ajoute
+        return ajoute
+
+    def _servir_un(self, indice: int, volume: int) -> int:
+        """Sert une pompe, sans passer par les tableaux d'indices."""
+        if not volume > 0:
+            raise ValueError("Le volume doit être > 0.")
+        disponible = int(self.__disponibles[indice])
+        servi = min(volume, disponible)
+        self.__disponibles[indice] = disponible - servi
+        return servi
+
+    def _fixer_un(self, indice: int, volume: int) -> None:
+        """Remplace le volume disponible d'une pompe."""
+        if not 0 <= volume <= self.__maximaux[indice]:
+            raise ValueError(
+                "Le volume disponible doit être entre 0 et le volume maximal."
+            )
+        self.__disponibles[indice] = volume
+
+    def __indices(self, indices) -> np.ndarray:
+        """Vérifie et convertit des indices de pompes."""
+        indices = np.asarray(indices, dtype=np.intp).reshape(-1)
+        if np.any((indices < 0) | (indices >= self.__taille)):
+            raise IndexError("L'indice de la pompe est invalide.")
+        return indices
+
+    def __appliquer(self, indices, volumes, signe: int) -> np.ndarray:
+        """Ajoute (signe 1) ou retire (signe -1) des volumes aux pompes.
+
+        Parameters
+        ----------
+        indices : Sequence[int] ou np.ndarray
+            Les indices des pompes, éventuellement répétés.
+        volumes : Sequence[int] ou np.ndarray
+            Les volumes demandés, > 0.
+        signe : int
+            1 pour un remplissage, -1 pour un service.
+
+        Returns
+        -------
+        np.ndarray
+            Les volumes réellement ajoutés ou retirés.
+
+        """
+        # Vérification des arguments
+        indices = self.__indices(indices)
+        volumes = self.__entiers(volumes)
+        if len(indices) != len(volumes):
+            raise ValueError("Il faut un volume par pompe.")
+        if not np.all(volumes > 0):
+            raise ValueError("Le volume doit être > 0.")
+        if not len(indices):
+            return volumes
+
+        # Regroupement des demandes par pompe, dans l'ordre
+        ordre = np.argsort(indices, kind='stable')
+        indices, volumes = indices[ordre], volumes[ordre]
+        debuts = np.flatnonzero(np.concatenate(
+            [[True], indices[1:] != indices[:-1]]))
+
+        # Volumes cumulés de chaque pompe, avant et après chaque demande
+        cumul = np.cumsum(volumes)
+        origines = cumul[debuts] - volumes[debuts]
+        apres = cumul - np.repeat(origines, np.diff(
+            np.concatenate([debuts, [len(indices)]])))
+        avant = apres - volumes
+
+        # Chaque demande est limitée par ce qui reste après les précédentes
+        disponibles = self.__disponibles[indices]
+        if signe > 0:
+            limites = self.__maximaux[indices] - disponibles
+        else:
+            limites = disponibles
+        effectifs = np.minimum(apres, limites) - np.minimum(avant, limites)
+
+        # Mise à jour des pompes, une fois par pompe
+        self.__disponibles[indices[debuts]] += \
+            signe * np.add.reduceat(effectifs, debuts)
+        resultat = np.empty_like(effectifs)
+        resultat[ordre] = effectifs
+        return resultat
+
+
+class VuePompe:
+    """Vue d'une pompe d'un `BanquePompes`, utilisable comme une `Pompe`.
+
+    La vue ne stocke que la banque et l'indice de la pompe : ses volumes
+    sont lus et modifiés dans les colonnes de la banque.
+
+    """
+
+    __slots__ = ('banque', 'indice')
+
+    def __init__(self, banque: BanquePompes, indice: int) -> None:
+        """Initialise une vue.
+
+        Parameters
+        ----------
+        banque : BanquePompes
+            La banque de la pompe.
+        indice : int
+            L'indice de la pompe dans la banque.
+
+        """
+        self.banque = banque
+        self.indice = indice
+
+    @property
+    def carburant(self) -> Carburant:
+        """Le carburant de la pompe."""
+        return self.banque.carburant(self.indice)
+
+    @carburant.setter
+    def carburant(self, carburant: Carburant) -> None:
+        self.banque.changer_carburant(self.indice, carburant)
+
+    @property
+    def volume_maximal(self) -> int:
+        """Le volume maximal de la pompe."""
+        return int(self.banque.volumes_maximaux[self.indice])
+
+    @property
+    def volume_disponible(self) -> int:
+        """Le volume disponible de la pompe."""
+        return int(self.banque.volumes_disponibles[self.indice])
+
+    def _vide(self) -> bool:
+        """Indique si la pompe est vide.
+
+        Returns
+        -------
+        bool
+            True si la pompe est vide, False sinon.
+
+        """
+        return self.volume_disponible == 0
+
+    def _volumes(self) -> tuple[int]:
+        """Retourne le volume disponible, sous la forme de `_fixer_volumes`.
+
+        Returns
+        -------
+        tuple[int]
+            Le volume disponible de la pompe.
+
+        """
+        return (self.volume_disponible,)
+
+    def _fixer_volumes(self, volumes: tuple[int]) -> None:
+        """Remplace le volume disponible, pour restaurer un état sauvegardé.
+
+        Parameters
+        ----------
+        volumes : tuple[int]
+            Le volume disponible de la pompe.
+
+        """
+        volume, = volumes
+        self.banque._fixer_un(self.indice, volume)
+
+    def _remplir(self, volume: int) -> int:
+        """Remplit la pompe.
+
+        Parameters
+        ----------
+        volume : int
+            Le volume à ajouter à la pompe.
+
+        Returns
+        -------
+        int
+            Le volume ajouté à la pompe.
+
+        """
+        return self.banque._remplir_un(self.indice, volume)
+
+    def _servir(self, volume: int) -> int:
+        """Sert du carburant.
+
+        Parameters
+        ----------
+        volume : int
+            Le volume à servir.
+
+        Returns
+        -------
+        int
+            Le volume servi.
+
+        """
+        return self.banque._servir_un(self.indice, volume)
+
+    def _essayer_servir(self, volume: int) -> tuple[Statut, int]:
+        """Sert du carburant, sans lever d'exception en cas de refus.
+
+        Parameters
+        ----------
+        volume : int
+            Le volume à servir.
+
+        Returns
+        -------
+        tuple[Statut, int]
+            Le statut de la demande et le volume servi, nul en cas de refus.
+
+        """
+        if not volume > 0:
+            return Statut.VOLUME_INVALIDE, 0
+        if self._vide():
+            return Statut.POMPE_VIDE, 0
+        return Statut.SERVI, self._servir(volume)
@@ -0,0 +1,52 @@
+"""Mesure du démarrage d'un parc de stations depuis un instantané.
+
+Compare la reconstruction par les constructeurs qui vérifient leurs
+arguments à la lecture d'un instantané, avec et sans validation.
+
+Usage : python bench_instantane.py
+"""
+import os
+import tempfile
+import timeit
+
+from carburant import Carburant
+from instantane import ecrire_instantane, lire_instantane
+from pompe import Pompe
+from station import Station
+from substance_chimique import SubstanceChimique
+
+
+def creer_parc(nombre_stations: int) -> list[Station]:
+    """Crée un parc de stations de six carburants, dont un en groupe."""
+    octane = ('octane', '111-65-9', '203-892-1')
+    butane = ('butane', '106-97-8', '203-448-7')
+    stations = []
+    for _ in range(nombre_stations):
+        substances = [SubstanceChimique(*octane), SubstanceChimique(*butane)]
+        pompes, prix = {}, {}
+        for i in range(6):
+            carburant = Carburant(
+                f'carburant-{i}',
+                {substances[0]: 0.5 + i / 20, substances[1]: 0.5 - i / 20})
+            pompes[carburant.nom] = Pompe(carburant, 1000, 500) if i else [
+                Pompe(carburant, 1000, 500), Pompe(carburant, 1000, 500)]
+            prix[carburant.nom] = 1.5
+        stations.append(Station(pompes=pompes, prix=prix))
+    return stations
+
+
+if __name__ == '__main__':
+    nombre_stations = 10_000
+    chemin = os.path.join(tempfile.mkdtemp(), 'parc.instantane')
+    ecrire_instantane(chemin, creer_parc(nombre_stations))
+    print(f"{nombre_stations} stations, "
+          f"{os.path.getsize(chemin) / 1e6:.2f} Mo")
+    for nom, fonction in (
+            ('constructeurs', lambda: creer_parc(nombre_stations)),
+            ('instantané validé', lambda: lire_instantane(chemin)),
+            ('instantané de confiance',
+             lambda: lire_instantane(chemin, valider=False)),
+            ('instantané en banque',
+             lambda: lire_instantane(chemin, valider=False, banque=True))):
+        duree = min(timeit.repeat(fonction, number=1, repeat=3))
+        print(f"{nom:>24} : {duree:.3f} s")
@@ -0,0 +1,102 @@
+"""Mesure de la latence de `Station.servir` selon le nombre de pompes.
+
+Compare `Station`, qui indexe les pompes par nom de carburant, à
+l'implémentation d'origine de la vérification de pompe, reproduite
+ci-dessous, qui reconstruisait la liste des carburants à chaque
+transaction. Compare ensuite le coût par transaction de `servir` et de
+`servir_lot`, puis celui d'un refus par `servir` et par `essayer_servir`.
+
+Usage : python bench_station.py
+"""
+import timeit
+
+import numpy as np
+
+from carburant import Carburant
+from pompe import Pompe
+from station import Station
+from statut import Statut
+from substance_chimique import SubstanceChimique
+
+
+class StationOrigine(Station):
+    """Station dont la vérification de pompe parcourt toutes les pompes."""
+
+    def essayer_servir(self, nom_carburant: str, volume: int):
+        carburants_station = [p.carburant.nom for p in self.pompes.values()]
+        if nom_carburant not in carburants_station:
+            return Statut.POMPE_INVALIDE, 0
+        return super().essayer_servir(nom_carburant, volume)
+
+
+def creer_station(classe: type, nombre_pompes: int) -> Station:
+    """Crée une station de `nombre_pompes` carburants distincts."""
+    octane = SubstanceChimique(
+        nom='octane', numero_cas='111-65-9', numero_ce='203-892-1')
+    pompes, prix = {}, {}
+    for i in range(nombre_pompes):
+        nom = f'carburant-{i}'
+        pompes[nom] = Pompe(
+            carburant=Carburant(nom, {octane: 1.0}),
+            volume_maximal=10 ** 12, volume_disponible=10 ** 12)
+        prix[nom] = 1.5
+    return classe(pompes=pompes, prix=prix)
+
+
+def mesurer_servir(station: Station, repetitions: int = 20_000) -> float:
+    """Retourne la latence moyenne de `servir`, en µs."""
+    nom = f'carburant-{len(station.pompes) - 1}'
+    duree = timeit.timeit(
+        lambda: station.servir(nom, 1), number=repetitions)
+    return duree / repetitions * 1e6
+
+
+def mesurer_servir_lot(
+        station: Station, nombre: int = 1_000_000) -> tuple[float, float]:
+    """Retourne le coût par transaction de `servir` et de `servir_lot`."""
+    generateur = np.random.default_rng(0)
+    noms = [f'carburant-{i}' for i in generateur.integers(
+        0, len(station.pompes), nombre)]
+    volumes = generateur.integers(1, 50, nombre)
+    debut = timeit.default_timer()
+    station.servir_lot(noms, volumes)
+    lot = (timeit.default_timer() - debut) / nombre * 1e6
+    transactions = list(zip(noms, volumes.tolist()))[:nombre // 10]
+    debut = timeit.default_timer()
+    for nom, volume in transactions:
+        station.servir(nom, volume)
+    unitaire = (timeit.default_timer() - debut) / len(transactions) * 1e6
+    return unitaire, lot
+
+
+def mesurer_refus(repetitions: int = 200_000) -> tuple[float, float]:
+    """Retourne le coût d'un refus (pompe vide), avec et sans exception."""
+    station = creer_station(Station, 1)
+    station.servir('carburant-0', 10 ** 12)
+
+    def servir():
+        try:
+            station.servir('carburant-0', 1)
+        except ValueError:
+            pass
+
+    exception = timeit.timeit(servir, number=repetitions)
+    statut = timeit.timeit(
+        lambda: station.essayer_servir('carburant-0', 1), number=repetitions)
+    return exception / repetitions * 1e6, statut / repetitions * 1e6
+
+
+if __name__ == '__main__':
+    print(f"{'pompes':>8} {'origine (µs)':>14} {'indexée (µs)':>14}")
+    for nombre_pompes in (1, 10, 100, 200, 500):
+        origine = mesurer_servir(creer_station(StationOrigine, nombre_pompes))
+        indexee = mesurer_servir(creer_station(Station, nombre_pompes))
+        print(f"{nombre_pompes:>8} {origine:>14.2f} {indexee:>14.2f}")
+
+    unitaire, lot = mesurer_servir_lot(creer_station(Station, 100))
+    print(f"\nservir : {unitaire:.3f} µs, servir_lot : {lot:.3f} µs "
+          "par transaction")
+
+    exception, statut = mesurer_refus()
+    print(f"refus : servir {exception:.3f} µs, essayer_servir "
+          f"{statut:.3f} µs")
@@ -0,0 +1,80 @@
+"""Mesure du coût des recherches par substance et de la mémoire occupée.
+
+Compare `SubstanceChimique` (slots, hash précalculé) à l'implémentation
+d'origine, reproduite ci-dessous, qui recalculait `repr` à chaque hash.
+
+Usage : python bench_substance_chimique.py
+"""
+import timeit
+import tracemalloc
+
+from substance_chimique import SubstanceChimique
+
+
+class SubstanceChimiqueOrigine:
+    """Implémentation d'origine : attributs en __dict__, hash via repr."""
+
+    def __init__(self, nom: str, numero_cas: str, numero_ce: str) -> None:
+        self.nom = nom
+        self.__numero_cas = numero_cas
+        self.__numero_ce = numero_ce
+
+    def __eq__(self, other: 'SubstanceChimiqueOrigine') -> bool:
+        if self.nom == other.nom and \
+            self.__numero_cas == other.__numero_cas and \
+                self.__numero_ce == other.__numero_ce:
+            return True
+        if self.nom == other.nom or \
+            self.__numero_cas == other.__numero_cas or \
+                self.__numero_ce == other.__numero_ce:
+            raise ValueError("Une des deux substances est erronée.")
+        return False
+
+    def __repr__(self) -> str:
+        return f"SubstanceChimique(nom='{self.nom}', " \
+               f"numero_cas='{self.__numero_cas}', " \
+               f"numero_ce='{self.__numero_ce}')"
+
+    def __hash__(self) -> int:
+        return hash(self.__repr__())
+
+
+SUBSTANCES = [
+    ('gazole', '68476-34-6', '270-676-1'),
+    ('essence', '86290-81-5', '289-220-8'),
+    ('octane', '111-65-9', '203-892-1'),
+    ('heptane', '142-82-5', '205-563-8'),
+    ('éthanol', '64-17-5', '200-578-6'),
+    ('butane', '106-97-8', '203-448-7'),
+    ('propane', '74-98-6', '200-827-9'),
+]
+
+
+def mesurer_recherche(classe: type, repetitions: int = 200_000) -> float:
+    """Retourne le coût moyen d'une recherche dans un dict, en ns."""
+    substances = [classe(*arguments) for arguments in SUBSTANCES]
+    composition = {substance: 1 / len(substances) for substance in substances}
+    cle = substances[3]
+    duree = timeit.timeit(
+        'composition[cle]', number=repetitions,
+        globals={'composition': composition, 'cle': cle})
+    return duree / repetitions * 1e9
+
+
+def mesurer_memoire(classe: type, nombre: int = 100_000) -> float:
+    """Retourne la mémoire occupée par instance, en octets."""
+    nom, numero_cas, numero_ce = SUBSTANCES[0]
+    tracemalloc.start()
+    avant, _ = tracemalloc.get_traced_memory()
+    instances = [classe(nom, numero_cas, numero_ce) for _ in range(nombre)]
+    apres, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del instances
+    return (apres - avant) / nombre
+
+
+if __name__ == '__main__':
+    for classe in (SubstanceChimiqueOrigine, SubstanceChimique):
+        print(f"{classe.__name__:>26} : "
+              f"recherche {mesurer_recherche(classe):7.1f} ns, "
+              f"mémoire {mesurer_memoire(classe):6.1f} o/instance")
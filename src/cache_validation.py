@@ -0,0 +1,238 @@
+import sqlite3
+import time
+from collections import OrderedDict
+
+from substance_chimique import SubstanceChimique
+
+
+class CacheValidation:
+    """Mémo persistant des validations de numéros CAS et CE.
+
+    Les résultats de `SubstanceChimique.valide_cas` et `valide_ce` sont
+    conservés dans une base SQLite partageable entre processus. À
+    l'ouverture, les entrées les plus récentes sont chargées en mémoire ;
+    les lectures se font ensuite sans accès disque, et les nouvelles
+    entrées et dates d'accès sont écrites par lots. Le cache est borné :
+    les entrées les moins récemment utilisées sont évincées, en mémoire
+    comme sur disque.
+
+    Attributes
+    ----------
+    succes : int
+        Le nombre de validations trouvées dans le cache.
+    echecs : int
+        Le nombre de validations calculées faute d'être dans le cache.
+
+    Examples
+    --------
+    >>> import os, tempfile
+    >>> chemin = os.path.join(tempfile.mkdtemp(), 'validations.sqlite')
+    >>> with CacheValidation(chemin) as cache:
+    ...     cache.valide_cas('64-17-5')
+    True
+    >>> with CacheValidation(chemin) as cache:
+    ...     cache.valide_cas('64-17-5'), cache.succes, cache.echecs
+    (True, 1, 0)
+
+    """
+
+    def __init__(
+            self, chemin: str, taille_maximale: int = 100_000,
+            taille_lot_ecriture: int = 1_000) -> None:
+        """Ouvre (ou crée) un cache de validation.
+
+        Parameters
+        ----------
+        chemin : str
+            Le chemin de la base SQLite.
+        taille_maximale : int
+            Le nombre maximal d'entrées conservées.
+        taille_lot_ecriture : int
+            Le nombre d'accès en attente au-delà duquel ils sont écrits.
+
+        """
+        # Vérification des arguments
+        if not isinstance(taille_maximale, int):
+            raise TypeError("La taille maximale doit être de type 'int'.")
+        if not isinstance(taille_lot_ecriture, int):
+            raise TypeError("La taille de lot doit être de type 'int'.")
+        if not taille_maximale > 0:
+            raise ValueError("La taille maximale doit être > 0.")
+        if not taille_lot_ecriture > 0:
+            raise ValueError("La taille de lot doit être > 0.")
+
+        # Ouverture de la base, en mode WAL pour les accès concurrents
+        self.__connexion = sqlite3.connect(
+            chemin, timeout=30, isolation_level=None)
+        self.__connexion.execute('PRAGMA journal_mode=WAL')
+        self.__connexion.execute('PRAGMA synchronous=NORMAL')
+        self.__connexion.execute(
+            'CREATE TABLE IF NOT EXISTS validations ('
+            'genre TEXT, numero TEXT, valide INTEGER, acces INTEGER, '
+            'PRIMARY KEY (genre, numero)) WITHOUT ROWID')
+        self.__connexion.execute(
+            'CREATE INDEX IF NOT EXISTS validations_acces '
+            'ON validations (acces)')
+
+        # Chargement des entrées les plus récentes, de la plus ancienne
+        # à la plus récente pour respecter l'ordre LRU
+        lignes = self.__connexion.execute(
+            'SELECT genre, numero, valide FROM ('
+            'SELECT * FROM validations ORDER BY acces DESC LIMIT ?'
+            ') ORDER BY acces', (taille_maximale,))
+        self.__memoire: OrderedDict[tuple[str, str], bool] = OrderedDict(
+            ((genre, numero), bool(valide))
+            for genre, numero, valide in lignes)
+
+        # Écritures en attente : clé -> (validité, date d'accès)
+        self.__en_attente: dict[tuple[str, str], tuple[bool, int]] = {}
+
+        self.taille_maximale = taille_maximale
+        self.taille_lot_ecriture = taille_lot_ecriture
+        self.succes = 0
+        self.echecs = 0
+
+    def __len__(self) -> int:
+        """Retourne le nombre d'entrées en mémoire."""
+        return len(self.__memoire)
+
+    def __enter__(self) -> 'CacheValidation':
+        return self
+
+    def __exit__(self, *exception) -> None:
+        self.fermer()
+
+    def __valider(self, genre: str, numero: str) -> bool:
+        """Retourne la validité d'un numéro, depuis le cache si possible.
+
+        Parameters
+        ----------
+        genre : str
+            'cas' ou 'ce'.
+        numero : str
+            Le numéro à vérifier.
+
+        Returns
+        -------
+        bool
+            True si le numéro est valide, False sinon.
+
+        """
+        cle = (genre, numero)
+        valide = self.__memoire.get(cle)
+        if valide is not None:
+            self.succes += 1
+            self.__memoire.move_to_end(cle)
+        else:
+            self.echecs += 1
+            if genre == 'cas':
+                valide = SubstanceChimique.valide_cas(numero)
+            else:
+                valide = SubstanceChimique.valide_ce(numero)
+            self.__memoire[cle] = valide
+
+            # Éviction en mémoire de l'entrée la moins récente
+            if len(self.__memoire) > self.taille_maximale:
+                self.__memoire.popitem(last=False)
+
+        # La date d'accès sera écrite avec le prochain lot
+        self.__en_attente[cle] = (valide, time.time_ns())
+        if len(self.__en_attente) >= self.taille_lot_ecriture:
+            self.synchroniser()
+        return valide
+
+    def valide_cas(self, numero_cas: str) -> bool:
+        """Vérifie si un numéro CAS est valide, voir `valide_cas`.
+
+        Parameters
+        ----------
+        numero_cas : str
+            Le numéro CAS à vérifier.
+
+        Returns
+        -------
+        bool
+            True si le numéro CAS est valide, False sinon.
+
+        """
+        return self.__valider('cas', numero_cas)
+
+    def valide_ce(self, numero_ce: str) -> bool:
+        """Vérifie si un numéro CE est valide, voir `valide_ce`.
+
+        Parameters
+        ----------
+        numero_ce : str
+            Le numéro CE à vérifier.
+
+        Returns
+        -------
+        bool
+            True si le numéro CE est valide, False sinon.
+
+        """
+        return self.__valider('ce', numero_ce)
+
+    def creer_substance(
+            self, nom: str, numero_cas: str,
+            numero_ce: str) -> SubstanceChimique:
+        """Crée une substance en vérifiant ses numéros via le cache.
+
+        Les erreurs sont celles du constructeur de `SubstanceChimique`.
+
+        Parameters
+        ----------
+        nom : str
+            Le nom de la substance chimique.
+        numero_cas : str
+            Le numéro CAS de la substance chimique.
+        numero_ce : str
+            Le numéro CE de la substance chimique.
+
+        Returns
+        -------
+        SubstanceChimique
+            La substance créée.
+
+        """
+        # Les arguments mal typés sont signalés par le constructeur
+        if not all(isinstance(argument, str)
+                   for argument in (nom, numero_cas, numero_ce)):
+            return SubstanceChimique(nom, numero_cas, numero_ce)
+
+        # Vérification des numéros CAS et CE
+        if not self.valide_cas(numero_cas):
+            raise ValueError(f"Le numéro CAS {numero_cas} est invalide.")
+        if not self.valide_ce(numero_ce):
+            raise ValueError(f"Le numéro CE {numero_ce} est invalide.")
+
+        return SubstanceChimique._creer(nom, numero_cas, numero_ce)
+
+    def synchroniser(self) -> None:
+        """Écrit les accès en attente et évince les entrées en trop."""
+        if not self.__en_attente:
+            return
+        lignes = [
+            (genre, numero, int(valide), acces)
+            for (genre, numero), (valide, acces)
+            in self.__en_attente.items()]
+
+        # Une seule transaction par lot ; la date d'accès la plus récente
+        # l'emporte lorsque plusieurs processus écrivent la même entrée
+        with self.__connexion:
+            self.__connexion.execute('BEGIN IMMEDIATE')
+            self.__connexion.executemany(
+                'INSERT INTO validations VALUES (?, ?, ?, ?) '
+                'ON CONFLICT DO UPDATE SET acces = max(acces, excluded.acces)',
+                lignes)
+            self.__connexion.execute(
+                'DELETE FROM validations WHERE (genre, numero) IN ('
+                'SELECT genre, numero FROM validations ORDER BY acces '
+                'LIMIT max(0, (SELECT count(*) FROM validations) - ?))',
+                (self.taille_maximale,))
+        self.__en_attente.clear()
+
+    def fermer(self) -> None:
+        """Écrit les accès en attente et ferme la base."""
+        self.synchroniser()
+        self.__connexion.close()
@@ -1,3 +1,6 @@
+import numpy as np
+
+from composition import CompositionCompacte
 from substance_chimique import SubstanceChimique
 
 
@@ -10,6 +13,8 @@ class Carburant:
         Le nom du carburant.
     composition_chimique : dict[SubstanceChimique, float]
         La composition chimique du carburant.
+    TOLERANCE : float
+        L'écart toléré entre la somme des proportions et 1.
 
     Examples
     --------
@@ -19,8 +24,22 @@ class Carburant:
     ...     nom='propane', numero_cas='74-98-6', numero_ce='200-827-9')
     >>> carburant = Carburant(
     ...     nom='SP95', composition_chimique={butane: 0.95, propane: 0.05})
+    >>> carburant.composition_compacte.proportion(propane)
+    0.05
+    >>> carburant == Carburant(
+    ...     nom='SP95', composition_chimique={propane: 0.05, butane: 0.95})
+    True
+
+    Notes
+    -----
+    L'égalité et le hash reposent sur la composition compacte, calculée au
+    premier besoin : la composition chimique ne doit plus être modifiée
+    une fois le carburant comparé ou utilisé comme clé.
 
     """
+
+    TOLERANCE = 1e-9
+
     def __init__(
             self, nom: str,
             composition_chimique: dict[SubstanceChimique, float]):
@@ -40,9 +59,9 @@ class Carburant:
         if not isinstance(composition_chimique, dict):
             raise TypeError("La composition chimique doit être un 'dict'.")
 
-        # Vérification de la somme des proportions
+        # Vérification de la somme des proportions, aux arrondis près
         proportions = composition_chimique.values()
-        if not sum(proportions) == 1:
+        if not abs(sum(proportions) - 1) <= self.TOLERANCE:
             raise ValueError("La somme des proportions doit être égale à 1.")
 
         # Les proportions doivent être supérieures à 0
@@ -52,3 +71,192 @@ class Carburant:
         # Assignation des attributs
         self.nom = nom
         self.composition_chimique = composition_chimique
+        self.__composition_compacte = None
+
+    @classmethod
+    def _creer(
+            cls, nom: str,
+            composition_chimique: dict[SubstanceChimique, float]
+            ) -> 'Carburant':
+        """Crée un carburant sans vérifier sa composition.
+
+        Réservé aux chemins qui ont déjà vérifié les proportions, par
+        exemple en lot avec `depuis_matrice`.
+
+        Parameters
+        ----------
+        nom : str
+            Le nom du carburant.
+        composition_chimique : dict[SubstanceChimique, float]
+            La composition chimique, déjà vérifiée.
+
+        Returns
+        -------
+        Carburant
+            Le carburant créé.
+
+        """
+        carburant = cls.__new__(cls)
+        carburant.nom = nom
+        carburant.composition_chimique = composition_chimique
+        carburant.__composition_compacte = None
+        return carburant
+
+    @classmethod
+    def _depuis_compacte(
+            cls, nom: str,
+            composition_compacte: CompositionCompacte) -> 'Carburant':
+        """Crée un carburant à partir d'une composition compacte calculée.
+
+        La somme des proportions n'est pas vérifiée : la composition est
+        supposée issue d'un calcul déjà normalisé (un mélange, par exemple).
+
+        Parameters
+        ----------
+        nom : str
+            Le nom du carburant.
+        composition_compacte : CompositionCompacte
+            La composition chimique du carburant.
+
+        Returns
+        -------
+        Carburant
+            Le carburant créé.
+
+        """
+        carburant = cls.__new__(cls)
+        carburant.nom = nom
+        carburant.composition_chimique = composition_compacte.vers_dict()
+        carburant.__composition_compacte = composition_compacte
+        return carburant
+
+    @classmethod
+    def depuis_matrice(
+            cls, noms: list[str], substances: list[SubstanceChimique],
+            proportions, tolerance: float = None,
+            renormaliser: bool = False) -> tuple[list, np.ndarray]:
+        """Crée un lot de carburants à partir d'une matrice de proportions.
+
+        Toutes les lignes sont vérifiées d'un coup : les proportions sont
+        positives ou nulles (une proportion nulle signifie que la substance
+        est absente) et leur somme vaut 1 à la tolérance près.
+
+        Parameters
+        ----------
+        noms : list[str]
+            Les noms des carburants, un par ligne.
+        substances : list[SubstanceChimique]
+            Les substances, une par colonne.
+        proportions : array_like
+            La matrice (carburants, substances) des proportions.
+        tolerance : float
+            L'écart toléré entre la somme d'une ligne et 1. Par défaut,
+            `Carburant.TOLERANCE`.
+        renormaliser : bool
+            Diviser chaque ligne par sa somme au lieu de rejeter celles
+            dont la somme s'écarte de 1.
+
+        Returns
+        -------
+        tuple[list[Carburant], np.ndarray]
+            Les carburants, None pour chaque ligne rejetée, et le masque
+            booléen des lignes rejetées.
+
+        Examples
+        --------
+        >>> butane = SubstanceChimique(
+        ...     nom='butane', numero_cas='106-97-8', numero_ce='203-448-7')
+        >>> propane = SubstanceChimique(
+        ...     nom='propane', numero_cas='74-98-6', numero_ce='200-827-9')
+        >>> carburants, erreurs = Carburant.depuis_matrice(
+        ...     ['GPL', 'Butane', 'Erreur'], [butane, propane],
+        ...     [[0.8, 0.2], [1.0, 0.0], [0.5, 0.4]])
+        >>> erreurs
+        array([False, False,  True])
+        >>> len(carburants[1].composition_chimique), carburants[2]
+        (1, None)
+
+        """
+        # Vérification des arguments
+        if tolerance is None:
+            tolerance = cls.TOLERANCE
+        proportions = np.array(proportions, dtype=np.float64, ndmin=2)
+        if not proportions.shape == (len(noms), len(substances)):
+            raise ValueError(
+                "La matrice doit avoir une ligne par nom et une colonne "
+                "par substance.")
+        if not all(isinstance(nom, str) for nom in noms):
+            raise TypeError("Le nom doit être de type 'str'.")
+        if not all(isinstance(s, SubstanceChimique) for s in substances):
+            raise TypeError(
+                "Les substances doivent être de type 'SubstanceChimique'.")
+
+        # Une substance ne peut apparaître que dans une colonne
+        if len(set(substances)) != len(substances):
+            raise ValueError("Une substance apparaît deux fois.")
+
+        # Vérification de toutes les lignes à la fois
+        sommes = proportions.sum(axis=1)
+        erreurs = ~np.all(np.isfinite(proportions), axis=1)
+        erreurs |= np.any(proportions < 0, axis=1) | ~(sommes > 0)
+        if renormaliser:
+            proportions = proportions / np.where(erreurs, 1, sommes)[:, None]
+        else:
+            erreurs |= ~(np.abs(sommes - 1) <= tolerance)
+
+        # Construction des carburants valides, à partir des cases non nulles
+        lignes, colonnes = np.nonzero(proportions * ~erreurs[:, None])
+        valeurs = proportions[lignes, colonnes].tolist()
+        colonnes = colonnes.tolist()
+        bornes = np.searchsorted(lignes, np.arange(len(noms) + 1)).tolist()
+        carburants = []
+        for i, (nom, erreur) in enumerate(zip(noms, erreurs.tolist())):
+            if erreur:
+                carburants.append(None)
+                continue
+            debut, fin = bornes[i], bornes[i + 1]
+            composition = dict(zip(
+                [substances[j] for j in colonnes[debut:fin]],
+                valeurs[debut:fin]))
+            carburants.append(cls._creer(nom, composition))
+        return carburants, erreurs
+
+    @property
+    def composition_compacte(self) -> CompositionCompacte:
+        """La composition chimique sous forme de vecteur creux."""
+        if self.__composition_compacte is None:
+            self.__composition_compacte = CompositionCompacte(
+                self.composition_chimique)
+        return self.__composition_compacte
+
+    def __eq__(self, other: 'Carburant') -> bool:
+        """Vérifie si deux carburants sont égaux.
+
+        Parameters
+        ----------
+        other : Carburant
+            L'autre carburant à comparer.
+
+        Returns
+        -------
+        bool
+            True si les noms et compositions sont identiques, False sinon.
+
+        """
+        if self is other:
+            return True
+        if not isinstance(other, Carburant):
+            return NotImplemented
+        return self.nom == other.nom and \
+            self.composition_compacte == other.composition_compacte
+
+    def __hash__(self) -> int:
+        """Retourne le hash de l'instance.
+
+        Returns
+        -------
+        int
+            Le hash de l'instance.
+
+        """
+        return hash((self.nom, self.composition_compacte))
@@ -0,0 +1,235 @@
+import csv
+import json
+import mmap
+import os
+from typing import Callable, Iterator
+
+from registre_substances import RegistreSubstances
+from substance_chimique import SubstanceChimique
+
+# Champs attendus pour chaque substance du catalogue
+CHAMPS = ('nom', 'numero_cas', 'numero_ce')
+
+
+def charger_catalogue(
+        chemin: str, format_fichier: str = None, taille_lot: int = 10_000,
+        registre: RegistreSubstances = None,
+        sur_rejet: Callable[[int, str, str], None] = None,
+        colonnes: dict[str, str] = None, delimiteur: str = ',',
+        encodage: str = 'utf-8') -> Iterator[SubstanceChimique]:
+    """Charge un catalogue de substances en flux, lot par lot.
+
+    Le fichier est projeté en mémoire et lu ligne à ligne ; les numéros
+    CAS et CE de chaque lot sont vérifiés d'un coup avec `valide_cas_lot`
+    et `valide_ce_lot`. Seul le lot courant est conservé en mémoire, quelle
+    que soit la taille du fichier.
+
+    Dans un fichier CSV, un champ entre guillemets peut contenir des fins
+    de ligne : l'enregistrement s'étend alors sur plusieurs lignes et
+    porte le numéro de la première.
+
+    Parameters
+    ----------
+    chemin : str
+        Le chemin du fichier, au format CSV (avec en-tête) ou JSONL.
+    format_fichier : str
+        'csv' ou 'jsonl'. Par défaut, déduit de l'extension du fichier.
+    taille_lot : int
+        Le nombre de lignes vérifiées ensemble.
+    registre : RegistreSubstances
+        Si renseigné, chaque substance y est ajoutée et c'est l'instance
+        enregistrée qui est renvoyée. Les conflits sont rejetés.
+    sur_rejet : Callable[[int, str, str], None]
+        Appelée pour chaque ligne rejetée avec le numéro de ligne (à partir
+        de 1), son contenu et la raison du rejet. Les lignes mal formées
+        sont signalées à la lecture, les numéros invalides à la
+        vérification du lot : l'ordre des rejets n'est donc pas celui du
+        fichier.
+    colonnes : dict[str, str]
+        Le nom de la colonne (CSV) ou de la clé (JSONL) de chaque champ,
+        par exemple {'numero_cas': 'CAS no.'}. Par défaut, le nom du champ.
+    delimiteur : str
+        Le délimiteur des fichiers CSV.
+    encodage : str
+        L'encodage du fichier.
+
+    Yields
+    ------
+    SubstanceChimique
+        Les substances valides, dans l'ordre du fichier.
+
+    """
+    # Vérification des arguments
+    if format_fichier is None:
+        format_fichier = os.path.splitext(chemin)[1].lstrip('.').lower()
+    if format_fichier not in ('csv', 'jsonl'):
+        raise ValueError("Le format doit être 'csv' ou 'jsonl'.")
+    if not isinstance(taille_lot, int):
+        raise TypeError("La taille de lot doit être de type 'int'.")
+    if not taille_lot > 0:
+        raise ValueError("La taille de lot doit être > 0.")
+    colonnes = {champ: champ for champ in CHAMPS} | (colonnes or {})
+
+    def rejeter(numero: int, ligne: str, raison: str):
+        if sur_rejet is not None:
+            sur_rejet(numero, ligne, raison)
+
+    lignes = _lignes(chemin, encodage, rejeter)
+    if format_fichier == 'csv':
+        lignes = _lignes_csv(lignes, colonnes, delimiteur, rejeter)
+    else:
+        lignes = _lignes_jsonl(lignes, colonnes, rejeter)
+
+    # Regroupement des lignes en lots
+    lot = []
+    for enregistrement in lignes:
+        lot.append(enregistrement)
+        if len(lot) == taille_lot:
+            yield from _valider_lot(lot, registre, rejeter)
+            lot = []
+    if lot:
+        yield from _valider_lot(lot, registre, rejeter)
+
+
+def _lignes(
+        chemin: str, encodage: str,
+        rejeter: Callable) -> Iterator[tuple[int, str]]:
+    """Lit les lignes d'un fichier projeté en mémoire.
+
+    Yields
+    ------
+    tuple[int, str]
+        Le numéro de la ligne et son contenu, sans fin de ligne.
+
+    """
+    with open(chemin, 'rb') as fichier:
+        # Un fichier vide ne peut pas être projeté en mémoire
+        if os.fstat(fichier.fileno()).st_size == 0:
+            return
+        with mmap.mmap(
+                fichier.fileno(), 0, access=mmap.ACCESS_READ) as carte:
+            lignes = enumerate(iter(carte.readline, b''), start=1)
+            for numero, brute in lignes:
+                try:
+                    ligne = brute.decode(encodage).rstrip('\r\n')
+                except UnicodeDecodeError:
+                    rejeter(numero, repr(brute), "Encodage invalide.")
+                    continue
+                if numero == 1:
+                    ligne = ligne.removeprefix('\ufeff')
+                yield numero, ligne
+
+
+def _lignes_csv(
+        lignes: Iterator[tuple[int, str]], colonnes: dict[str, str],
+        delimiteur: str, rejeter: Callable) -> Iterator[tuple]:
+    """Extrait les champs des enregistrements d'un fichier CSV."""
+    enregistrements = _enregistrements_csv(lignes, delimiteur, rejeter)
+
+    # Le premier enregistrement est l'en-tête
+    for _, _, entete in enregistrements:
+        break
+    else:
+        return
+    manquantes = [colonnes[c] for c in CHAMPS if colonnes[c] not in entete]
+    if manquantes:
+        raise ValueError(f"Colonnes absentes de l'en-tête : {manquantes}.")
+    indices = [entete.index(colonnes[champ]) for champ in CHAMPS]
+    largeur = len(entete)
+
+    for numero, ligne, champs in enregistrements:
+        if len(champs) != largeur:
+            rejeter(numero, ligne, "Nombre de colonnes incorrect.")
+            continue
+        yield (numero, ligne, *(champs[i].strip() for i in indices))
+
+
+def _enregistrements_csv(
+        lignes: Iterator[tuple[int, str]], delimiteur: str,
+        rejeter: Callable) -> Iterator[tuple[int, str, list[str]]]:
+    """Découpe les lignes d'un fichier CSV en enregistrements non vides.
+
+    Yields
+    ------
+    tuple[int, str, list[str]]
+        Le numéro de la première ligne de l'enregistrement, ses lignes et
+        ses champs.
+
+    """
+    # Lignes lues pour l'enregistrement en cours
+    lues = []
+
+    def texte():
+        for numero, ligne in lignes:
+            lues.append((numero, ligne))
+            yield ligne + '\n'
+
+    lecteur = csv.reader(texte(), delimiter=delimiteur)
+    while True:
+        lues.clear()
+        try:
+            champs = next(lecteur)
+        except StopIteration:
+            return
+        except csv.Error as erreur:
+            rejeter(lues[0][0], '\n'.join(ligne for _, ligne in lues),
+                    f"CSV invalide : {erreur}.")
+            continue
+        contenu = '\n'.join(ligne for _, ligne in lues)
+        if contenu.strip():
+            yield lues[0][0], contenu, champs
+
+
+def _lignes_jsonl(
+        lignes: Iterator[tuple[int, str]], colonnes: dict[str, str],
+        rejeter: Callable) -> Iterator[tuple]:
+    """Extrait les champs des lignes d'un fichier JSONL."""
+    for numero, ligne in lignes:
+        if not ligne.strip():
+            continue
+        try:
+            objet = json.loads(ligne)
+        except json.JSONDecodeError:
+            rejeter(numero, ligne, "JSON invalide.")
+            continue
+        if not isinstance(objet, dict):
+            rejeter(numero, ligne, "La ligne doit être un objet JSON.")
+            continue
+        champs = [objet.get(colonnes[champ]) for champ in CHAMPS]
+        if not all(isinstance(champ, str) for champ in champs):
+            rejeter(numero, ligne, "Les champs doivent être de type 'str'.")
+            continue
+        yield (numero, ligne, *champs)
+
+
+def _valider_lot(
+        lot: list[tuple], registre: RegistreSubstances,
+        rejeter: Callable) -> Iterator[SubstanceChimique]:
+    """Vérifie un lot en une passe et crée les substances valides."""
+    _, _, _, numeros_cas, numeros_ce = zip(*lot)
+    cas_valides = SubstanceChimique.valide_cas_lot(numeros_cas).tolist()
+    ce_valides = SubstanceChimique.valide_ce_lot(numeros_ce).tolist()
+
+    for enregistrement, cas_valide, ce_valide in zip(
+            lot, cas_valides, ce_valides):
+        numero, ligne, nom, numero_cas, numero_ce = enregistrement
+
+        # Vérification des numéros CAS et CE
+        if not cas_valide:
+            rejeter(
+                numero, ligne, f"Le numéro CAS {numero_cas} est invalide.")
+            continue
+        if not ce_valide:
+            rejeter(
+                numero, ligne, f"Le numéro CE {numero_ce} est invalide.")
+            continue
+
+        # Les numéros sont déjà vérifiés
+        substance = SubstanceChimique._creer(nom, numero_cas, numero_ce)
+        if registre is not None:
+            try:
+                substance = registre.ajouter(substance)
+            except ValueError as erreur:
+                rejeter(numero, ligne, str(erreur))
+                continue
+        yield substance
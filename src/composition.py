@@ -0,0 +1,206 @@
+import numpy as np
+
+from substance_chimique import SubstanceChimique
+
+
+class CompositionCompacte:
+    """Composition chimique sous forme de vecteur creux.
+
+    Les substances sont identifiées par leur clé 64 bits
+    (`SubstanceChimique.cle`), rangées par ordre croissant dans un tableau
+    auquel correspond le tableau des proportions (float64). Les
+    comparaisons, le hash et les produits scalaires sont des opérations sur
+    ces tableaux, qui ne sont pas modifiables.
+
+    Attributes
+    ----------
+    cles : np.ndarray
+        Les clés des substances, triées (int64).
+    proportions : np.ndarray
+        Les proportions correspondantes (float64).
+    substances : tuple[SubstanceChimique, ...]
+        Les substances, dans l'ordre des clés.
+
+    Examples
+    --------
+    >>> butane = SubstanceChimique(
+    ...     nom='butane', numero_cas='106-97-8', numero_ce='203-448-7')
+    >>> propane = SubstanceChimique(
+    ...     nom='propane', numero_cas='74-98-6', numero_ce='200-827-9')
+    >>> gpl = CompositionCompacte({butane: 0.8, propane: 0.2})
+    >>> gpl.proportion(propane)
+    0.2
+    >>> gpl == CompositionCompacte({propane: 0.2, butane: 0.8})
+    True
+    >>> round(gpl.produit_scalaire(gpl), 2)
+    0.68
+
+    """
+
+    __slots__ = ('cles', 'proportions', 'substances', '__hash')
+
+    def __init__(
+            self, composition: dict[SubstanceChimique, float]) -> None:
+        """Initialise une composition compacte.
+
+        Parameters
+        ----------
+        composition : dict[SubstanceChimique, float]
+            La composition chimique.
+
+        """
+        # Vérification du type de l'argument
+        if not isinstance(composition, dict):
+            raise TypeError("La composition chimique doit être un 'dict'.")
+
+        # Tri des substances par clé
+        substances = list(composition)
+        cles = np.fromiter(
+            (substance.cle for substance in substances),
+            dtype=np.int64, count=len(substances))
+        ordre = np.argsort(cles, kind='stable')
+        cles = cles[ordre]
+        if np.any(cles[1:] == cles[:-1]):
+            raise ValueError("Une substance apparaît deux fois.")
+        proportions = np.fromiter(
+            composition.values(), dtype=np.float64,
+            count=len(substances))[ordre]
+
+        self.__initialiser(
+            cles, proportions,
+            tuple(substances[i] for i in ordre.tolist()))
+
+    @classmethod
+    def _depuis_tableaux(
+            cls, cles: np.ndarray, proportions: np.ndarray,
+            substances: tuple) -> 'CompositionCompacte':
+        """Crée une composition à partir de tableaux déjà triés.
+
+        Parameters
+        ----------
+        cles : np.ndarray
+            Les clés des substances, triées et distinctes.
+        proportions : np.ndarray
+            Les proportions correspondantes.
+        substances : tuple[SubstanceChimique, ...]
+            Les substances, dans l'ordre des clés.
+
+        Returns
+        -------
+        CompositionCompacte
+            La composition créée.
+
+        """
+        composition = cls.__new__(cls)
+        composition.__initialiser(
+            np.asarray(cles, dtype=np.int64),
+            np.asarray(proportions, dtype=np.float64), tuple(substances))
+        return composition
+
+    def __initialiser(
+            self, cles: np.ndarray, proportions: np.ndarray,
+            substances: tuple) -> None:
+        """Assigne les attributs et verrouille les tableaux."""
+        cles.flags.writeable = False
+        proportions.flags.writeable = False
+        self.cles = cles
+        self.proportions = proportions
+        self.substances = substances
+        self.__hash = hash((cles.tobytes(), proportions.tobytes()))
+
+    def __len__(self) -> int:
+        """Retourne le nombre de substances de la composition."""
+        return len(self.cles)
+
+    def __eq__(self, other: 'CompositionCompacte') -> bool:
+        """Vérifie si deux compositions sont identiques.
+
+        Parameters
+        ----------
+        other : CompositionCompacte
+            L'autre composition à comparer.
+
+        Returns
+        -------
+        bool
+            True si les substances et proportions sont les mêmes.
+
+        """
+        if self is other:
+            return True
+        if not isinstance(other, CompositionCompacte):
+            return NotImplemented
+        return self.__hash == other.__hash and \
+            np.array_equal(self.cles, other.cles) and \
+            np.array_equal(self.proportions, other.proportions)
+
+    def __hash__(self) -> int:
+        """Retourne le hash, calculé une fois pour toutes.
+
+        Returns
+        -------
+        int
+            Le hash de la composition.
+
+        """
+        return self.__hash
+
+    def __repr__(self) -> str:
+        """Retourne une représentation de la composition.
+
+        Returns
+        -------
+        str
+            La représentation de la composition.
+
+        """
+        return f"CompositionCompacte({self.vers_dict()!r})"
+
+    def proportion(self, substance: SubstanceChimique) -> float:
+        """Retourne la proportion d'une substance.
+
+        Parameters
+        ----------
+        substance : SubstanceChimique
+            La substance recherchée.
+
+        Returns
+        -------
+        float
+            Sa proportion, 0.0 si elle est absente de la composition.
+
+        """
+        cle = substance.cle
+        position = int(np.searchsorted(self.cles, cle))
+        if position < len(self.cles) and self.cles[position] == cle:
+            return float(self.proportions[position])
+        return 0.0
+
+    def produit_scalaire(self, other: 'CompositionCompacte') -> float:
+        """Retourne le produit scalaire de deux compositions.
+
+        Parameters
+        ----------
+        other : CompositionCompacte
+            L'autre composition.
+
+        Returns
+        -------
+        float
+            La somme des produits des proportions des substances communes.
+
+        """
+        _, ici, la = np.intersect1d(
+            self.cles, other.cles, assume_unique=True, return_indices=True)
+        return float(self.proportions[ici] @ other.proportions[la])
+
+    def vers_dict(self) -> dict[SubstanceChimique, float]:
+        """Retourne la composition sous forme de dictionnaire.
+
+        Returns
+        -------
+        dict[SubstanceChimique, float]
+            La composition chimique.
+
+        """
+        return dict(zip(self.substances, self.proportions.tolist()))
@@ -0,0 +1,31 @@
+from typing import NamedTuple
+
+
+class Evenement(NamedTuple):
+    """Opération réussie sur une station-service, transmise à ses abonnés.
+
+    Attributes
+    ----------
+    operation : str
+        'servir', 'remplir' ou 'prix'.
+    nom_carburant : str
+        Le nom du carburant, clé de la pompe.
+    volume : int
+        Le volume servi ou ajouté, nul pour un changement de prix.
+    prix : float
+        Le prix facturé pour un service, le prix après l'opération sinon.
+    horodatage : float
+        L'instant de l'opération, en secondes depuis l'epoch.
+    repartition : tuple[tuple[int, int], ...]
+        Pour un service, l'indice et le volume de chaque pompe qui a
+        servi : 0 pour une pompe simple, sa position dans le groupe pour
+        un `GroupePompes`. Vide pour les autres opérations.
+
+    """
+
+    operation: str
+    nom_carburant: str
+    volume: int
+    prix: float
+    horodatage: float
+    repartition: tuple[tuple[int, int], ...] = ()
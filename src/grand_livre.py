@@ -0,0 +1,242 @@
+import csv
+import functools
+import threading
+from decimal import ROUND_HALF_UP, Decimal
+
+from evenement import Evenement
+from station import Station
+
+_UNITE = Decimal(1)
+
+
+@functools.lru_cache(maxsize=1024)
+def _prix_centimes(prix: float) -> Decimal:
+    """Retourne le prix unitaire exact, en centimes."""
+    # Un scalaire NumPy s'affiche autrement, par exemple 'np.float64(1.1)'
+    return Decimal(repr(float(prix))) * 100
+
+
+def montant_centimes(volume: int, prix: float) -> int:
+    """Retourne le montant d'une vente, en centimes entiers.
+
+    Le prix est lu tel qu'il s'affiche (`repr`), si bien que 1.1 vaut
+    exactement 110 centimes par unité, et le montant est arrondi au
+    centime le plus proche, la moitié vers le haut.
+
+    Parameters
+    ----------
+    volume : int
+        Le volume vendu.
+    prix : float
+        Le prix unitaire.
+
+    Returns
+    -------
+    int
+        Le montant, en centimes.
+
+    Examples
+    --------
+    >>> montant_centimes(3, 1.1)
+    330
+    >>> montant_centimes(1, 1.005)
+    101
+
+    """
+    montant = _prix_centimes(prix) * volume
+    return int(montant.quantize(_UNITE, rounding=ROUND_HALF_UP))
+
+
+class GrandLivre:
+    """Grand livre des recettes d'une station-service, en centimes entiers.
+
+    Le grand livre s'abonne à la station : chaque service réussi est
+    compté au prix facturé, transmis par l'événement avant qu'une pompe
+    vidée ne fasse passer le prix à None. Les totaux par carburant et par
+    pompe, une pompe étant désignée par son carburant et son indice dans
+    le groupe (0 pour une pompe simple), sont des entiers, sans dérive
+    d'arrondi, et se lisent en temps constant.
+
+    Le montant d'une vente servie par plusieurs pompes d'un groupe est
+    réparti entre elles au prorata des volumes, de sorte que les parts
+    arrondies ont pour somme le montant de la vente.
+
+    Si un chemin est donné, les ventes sont aussi ajoutées à un fichier
+    CSV (horodatage, carburant, indice de pompe, volume, centimes), à
+    raison d'une ligne par pompe, par lots de `taille_lot` lignes.
+
+    Examples
+    --------
+    >>> from carburant import Carburant
+    >>> from pompe import Pompe
+    >>> from substance_chimique import SubstanceChimique
+    >>> octane = SubstanceChimique(
+    ...     nom='octane', numero_cas='111-65-9', numero_ce='203-892-1')
+    >>> sp98 = Carburant(nom='SP98', composition_chimique={octane: 1.0})
+    >>> station = Station(
+    ...     pompes={'SP98': Pompe(sp98, 10, 8)}, prix={'SP98': 1.1})
+    >>> grand_livre = GrandLivre(station)
+    >>> station.servir('SP98', 3)
+    >>> station.servir('SP98', 5)
+    >>> grand_livre.total_carburant('SP98'), station.prix['SP98']
+    (880, None)
+    >>> grand_livre.total_pompe('SP98', 0)
+    880
+
+    """
+
+    def __init__(
+            self, station: Station, chemin: str = None,
+            taille_lot: int = 256) -> None:
+        """Initialise un grand livre vide et s'abonne à la station.
+
+        Parameters
+        ----------
+        station : Station
+            La station dont les recettes sont comptées.
+        chemin : str
+            Le fichier CSV où ajouter les ventes. Par défaut, les ventes ne
+            sont pas écrites.
+        taille_lot : int
+            Le nombre de lignes entre deux écritures du fichier.
+
+        """
+        # Vérification des arguments
+        if not isinstance(station, Station):
+            raise TypeError("La station doit être de type 'Station'.")
+        if not isinstance(taille_lot, int):
+            raise TypeError("La taille de lot doit être de type 'int'.")
+        if not taille_lot > 0:
+            raise ValueError("La taille de lot doit être > 0.")
+
+        # Assignation des attributs
+        self.station = station
+        self.chemin = chemin
+        self.__taille_lot = taille_lot
+
+        # Totaux en centimes et ventes en attente d'écriture
+        self.__totaux: dict[str, int] = {}
+        self.__totaux_pompes: dict[tuple[str, int], int] = {}
+        self.__total = 0
+        self.__lot: list[tuple] = []
+        self.__verrou = threading.Lock()
+
+        station.abonner(self.__enregistrer)
+        self.__abonne = True
+
+    def __enter__(self) -> 'GrandLivre':
+        """Retourne le grand livre, pour un bloc `with`."""
+        return self
+
+    def __exit__(self, *exception) -> None:
+        """Ferme le grand livre à la sortie du bloc `with`."""
+        self.fermer()
+
+    def __enregistrer(self, evenement: Evenement):
+        """Compte une vente et écrit le lot s'il est complet."""
+        if evenement.operation != 'servir':
+            return
+        nom = evenement.nom_carburant
+        prix = evenement.prix
+        centimes = montant_centimes(evenement.volume, prix)
+
+        # Part de chaque pompe : écart entre les montants cumulés arrondis
+        parts = []
+        cumul = precedent = 0
+        for indice, volume in evenement.repartition:
+            cumul += volume
+            montant = montant_centimes(cumul, prix)
+            parts.append((indice, volume, montant - precedent))
+            precedent = montant
+
+        with self.__verrou:
+            self.__totaux[nom] = self.__totaux.get(nom, 0) + centimes
+            self.__total += centimes
+            for indice, volume, part in parts:
+                cle = (nom, indice)
+                self.__totaux_pompes[cle] = \
+                    self.__totaux_pompes.get(cle, 0) + part
+            if self.chemin is not None:
+                self.__lot.extend(
+                    (evenement.horodatage, nom, indice, volume, part)
+                    for indice, volume, part in parts)
+                if len(self.__lot) >= self.__taille_lot:
+                    self.__ecrire()
+
+    @property
+    def total(self) -> int:
+        """Retourne la recette totale, en centimes."""
+        return self.__total
+
+    def total_carburant(self, nom_carburant: str) -> int:
+        """Retourne la recette d'un carburant, en centimes."""
+        return self.__totaux.get(nom_carburant, 0)
+
+    def totaux(self) -> dict[str, int]:
+        """Retourne une copie des recettes par carburant, en centimes."""
+        return dict(self.__totaux)
+
+    def total_pompe(self, nom_carburant: str, indice: int = 0) -> int:
+        """Retourne la recette d'une pompe, en centimes.
+
+        Parameters
+        ----------
+        nom_carburant : str
+            Le nom du carburant de la pompe.
+        indice : int
+            L'indice de la pompe dans son groupe, 0 pour une pompe simple.
+
+        Returns
+        -------
+        int
+            La recette de la pompe.
+
+        """
+        return self.__totaux_pompes.get((nom_carburant, indice), 0)
+
+    def totaux_pompes(self) -> dict[tuple[str, int], int]:
+        """Retourne une copie des recettes par pompe, en centimes."""
+        return dict(self.__totaux_pompes)
+
+    def ecrire(self) -> None:
+        """Écrit les ventes en attente dans le fichier."""
+        with self.__verrou:
+            self.__ecrire()
+
+    def __ecrire(self):
+        """Écrit les ventes en attente, le verrou étant pris."""
+        if self.__lot:
+            with open(
+                    self.chemin, 'a', newline='', encoding='utf-8'
+                    ) as fichier:
+                csv.writer(fichier).writerows(self.__lot)
+            self.__lot.clear()
+
+    def fermer(self) -> None:
+        """Écrit les ventes en attente et se désabonne de la station."""
+        if self.chemin is not None:
+            self.ecrire()
+        if self.__abonne:
+            self.station.desabonner(self.__enregistrer)
+            self.__abonne = False
+
+    @staticmethod
+    def relire(chemin: str) -> dict[str, int]:
+        """Retourne les recettes par carburant d'un fichier de ventes.
+
+        Parameters
+        ----------
+        chemin : str
+            Le fichier CSV écrit par un grand livre.
+
+        Returns
+        -------
+        dict[str, int]
+            La recette de chaque carburant, en centimes.
+
+        """
+        totaux = {}
+        with open(chemin, newline='', encoding='utf-8') as fichier:
+            for _, nom, _, _, centimes in csv.reader(fichier):
+                totaux[nom] = totaux.get(nom, 0) + int(centimes)
+        return totaux
@@ -0,0 +1,331 @@
+import heapq
+
+from carburant import Carburant
+from pompe import Pompe
+
+
+class StrategiePlusDisponible:
+    """Choisit la pompe qui a le plus de volume disponible.
+
+    Les pompes sont rangées dans un tas par volume décroissant. Après un
+    service ou un remplissage, la pompe est réinsérée avec son nouveau
+    volume ; les entrées périmées sont écartées à la lecture.
+
+    """
+
+    def __init__(self, pompes: list[Pompe]) -> None:
+        """Initialise la stratégie.
+
+        Parameters
+        ----------
+        pompes : list[Pompe]
+            Les pompes du groupe.
+
+        """
+        self.__pompes = pompes
+        self.__reconstruire()
+
+    def __reconstruire(self):
+        """Reconstruit le tas à partir des volumes courants."""
+        self.__tas = [
+            (-pompe.volume_disponible, i)
+            for i, pompe in enumerate(self.__pompes)]
+        heapq.heapify(self.__tas)
+
+    def choisir(self) -> int:
+        """Retourne l'indice de la pompe à utiliser.
+
+        Returns
+        -------
+        int
+            L'indice de la pompe la plus pleine, None si toutes sont vides.
+
+        """
+        while True:
+            oppose, indice = self.__tas[0]
+            volume = self.__pompes[indice].volume_disponible
+            if -oppose == volume:
+                return indice if volume > 0 else None
+
+            # Entrée périmée : remplacement par le volume courant
+            heapq.heapreplace(self.__tas, (-volume, indice))
+
+    def signaler(self, indice: int) -> None:
+        """Signale que le volume d'une pompe a changé.
+
+        Parameters
+        ----------
+        indice : int
+            L'indice de la pompe.
+
+        """
+        volume = self.__pompes[indice].volume_disponible
+        heapq.heappush(self.__tas, (-volume, indice))
+
+        # Les entrées périmées sont purgées quand elles s'accumulent
+        if len(self.__tas) > 4 * len(self.__pompes):
+            self.__reconstruire()
+
+
+class StrategieTourniquet:
+    """Utilise les pompes non vides à tour de rôle."""
+
+    def __init__(self, pompes: list[Pompe]) -> None:
+        """Initialise la stratégie.
+
+        Parameters
+        ----------
+        pompes : list[Pompe]
+            Les pompes du groupe.
+
+        """
+        self.__pompes = pompes
+        self.__prochaine = 0
+
+    def choisir(self) -> int:
+        """Retourne l'indice de la pompe à utiliser.
+
+        Returns
+        -------
+        int
+            L'indice de la prochaine pompe non vide, None si toutes sont
+            vides.
+
+        """
+        nombre = len(self.__pompes)
+        for decalage in range(nombre):
+            indice = (self.__prochaine + decalage) % nombre
+            if not self.__pompes[indice]._vide():
+                self.__prochaine = (indice + 1) % nombre
+                return indice
+        return None
+
+    def signaler(self, indice: int) -> None:
+        """Signale que le volume d'une pompe a changé.
+
+        Parameters
+        ----------
+        indice : int
+            L'indice de la pompe.
+
+        """
+
+
+class GroupePompes:
+    """Représente un ensemble de pompes distribuant le même carburant.
+
+    Un groupe s'utilise comme une pompe (`_vide`, `_remplir`, `_servir`) et
+    peut donc remplacer une pompe dans une `Station`. Chaque service est
+    confié à une pompe choisie par la stratégie ; si elle ne suffit pas,
+    le reste est servi par les pompes suivantes.
+
+    Le volume disponible et le nombre de pompes non vides sont tenus à
+    jour à chaque opération du groupe, et se lisent en temps constant :
+    les pompes ne doivent donc être modifiées qu'à travers le groupe.
+
+    Attributes
+    ----------
+    pompes : tuple[Pompe, ...]
+        Les pompes du groupe.
+
+    Examples
+    --------
+    >>> from substance_chimique import SubstanceChimique
+    >>> butane = SubstanceChimique(
+    ...     nom='butane', numero_cas='106-97-8', numero_ce='203-448-7')
+    >>> gpl = Carburant(nom='GPL', composition_chimique={butane: 1.0})
+    >>> groupe = GroupePompes([
+    ...     Pompe(carburant=gpl, volume_maximal=10, volume_disponible=4),
+    ...     Pompe(carburant=gpl, volume_maximal=10, volume_disponible=6)])
+    >>> groupe._servir(3)
+    3
+    >>> [pompe.volume_disponible for pompe in groupe.pompes]
+    [4, 3]
+    >>> groupe._servir(6)
+    6
+    >>> groupe.volume_disponible
+    1
+
+    """
+
+    def __init__(
+            self, pompes: list[Pompe],
+            strategie: type = StrategiePlusDisponible) -> None:
+        """Initialise un groupe de pompes.
+
+        Parameters
+        ----------
+        pompes : list[Pompe]
+            Les pompes du groupe, d'un même carburant.
+        strategie : type
+            La classe de stratégie de choix des pompes, par exemple
+            `StrategiePlusDisponible` ou `StrategieTourniquet`.
+
+        """
+        # Vérification des arguments
+        if not isinstance(pompes, (list, tuple)):
+            raise TypeError("Les pompes doivent être une 'list'.")
+        if not pompes:
+            raise ValueError("Le groupe doit contenir au moins une pompe.")
+        if len({pompe.carburant.nom for pompe in pompes}) != 1:
+            raise ValueError("Les pompes doivent avoir le même carburant.")
+
+        # Assignation des attributs
+        self.pompes = tuple(pompes)
+        self.__classe_strategie = strategie
+        self.__strategie = strategie(self.pompes)
+
+        # Volume disponible cumulé et nombre de pompes non vides
+        self.__volume_disponible = sum(
+            pompe.volume_disponible for pompe in self.pompes)
+        self.__non_vides = sum(not pompe._vide() for pompe in self.pompes)
+
+    @property
+    def strategie(self) -> type:
+        """La classe de stratégie de choix des pompes."""
+        return self.__classe_strategie
+
+    @property
+    def carburant(self) -> Carburant:
+        """Le carburant du groupe, celui de sa première pompe."""
+        return self.pompes[0].carburant
+
+    @property
+    def volume_maximal(self) -> int:
+        """Le volume maximal cumulé des pompes."""
+        return sum(pompe.volume_maximal for pompe in self.pompes)
+
+    @property
+    def volume_disponible(self) -> int:
+        """Le volume disponible cumulé des pompes."""
+        return self.__volume_disponible
+
+    def _volumes(self) -> tuple[int, ...]:
+        """Retourne les volumes disponibles des pompes, dans l'ordre.
+
+        Returns
+        -------
+        tuple[int, ...]
+            Le volume disponible de chaque pompe.
+
+        """
+        return tuple(pompe.volume_disponible for pompe in self.pompes)
+
+    def _fixer_volumes(self, volumes: tuple[int, ...]) -> None:
+        """Remplace les volumes disponibles des pompes.
+
+        Parameters
+        ----------
+        volumes : tuple[int, ...]
+            Le volume disponible de chaque pompe, tel que retourné par
+            `_volumes`.
+
+        """
+        if len(volumes) != len(self.pompes):
+            raise ValueError("Il faut un volume par pompe.")
+        for indice, (pompe, volume) in enumerate(zip(self.pompes, volumes)):
+            avant = pompe.volume_disponible
+            pompe._fixer_volumes((volume,))
+            self.__signaler(indice, avant)
+
+    def __signaler(self, indice: int, avant: int):
+        """Tient compte du nouveau volume d'une pompe."""
+        apres = self.pompes[indice].volume_disponible
+        self.__volume_disponible += apres - avant
+        self.__non_vides += (apres > 0) - (avant > 0)
+        self.__strategie.signaler(indice)
+
+    def _vide(self) -> bool:
+        """Indique si toutes les pompes du groupe sont vides.
+
+        Returns
+        -------
+        bool
+            True si le groupe est vide, False sinon.
+
+        """
+        return self.__non_vides == 0
+
+    def _remplir(self, volume: int) -> int:
+        """Remplit les pompes du groupe, dans l'ordre, jusqu'au volume donné.
+
+        Parameters
+        ----------
+        volume : int
+            Le volume à ajouter au groupe.
+
+        Returns
+        -------
+        int
+            Le volume ajouté au groupe.
+
+        """
+        # Vérification du volume
+        if not volume > 0:
+            raise ValueError("Le volume doit être > 0.")
+
+        # Remplissage des pompes tant qu'il reste du volume
+        restant = volume
+        for indice, pompe in enumerate(self.pompes):
+            avant = pompe.volume_disponible
+            place = pompe.volume_maximal - avant
+            if place > 0:
+                ajoute = min(restant, place)
+                pompe._remplir(ajoute)
+                self.__signaler(indice, avant)
+                restant -= ajoute
+                if restant == 0:
+                    break
+        return volume - restant
+
+    def _servir(self, volume: int) -> int:
+        """Sert du carburant, en passant d'une pompe à l'autre si besoin.
+
+        Parameters
+        ----------
+        volume : int
+            Le volume à servir.
+
+        Returns
+        -------
+        int
+            Le volume servi.
+
+        """
+        return self._servir_reparti(volume)[0]
+
+    def _servir_reparti(
+            self, volume: int
+            ) -> tuple[int, tuple[tuple[int, int], ...]]:
+        """Sert du carburant et indique le volume servi par chaque pompe.
+
+        Parameters
+        ----------
+        volume : int
+            Le volume à servir.
+
+        Returns
+        -------
+        tuple[int, tuple[tuple[int, int], ...]]
+            Le volume servi, et l'indice et le volume de chaque pompe qui
+            a servi, dans l'ordre.
+
+        """
+        # Vérification du volume
+        if not volume > 0:
+            raise ValueError("Le volume doit être > 0.")
+
+        # Service par les pompes choisies tant qu'il reste du volume
+        restant = volume
+        repartition = []
+        while restant > 0:
+            indice = self.__strategie.choisir()
+            if indice is None:
+                break
+            pompe = self.pompes[indice]
+            avant = pompe.volume_disponible
+            servi = pompe._servir(restant)
+            self.__signaler(indice, avant)
+            repartition.append((indice, servi))
+            restant -= servi
+        return volume - restant, tuple(repartition)
@@ -0,0 +1,283 @@
+import math
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+
+from evenement import Evenement
+
+
+class SeriePrix:
+    """Prix successifs et ventes d'un carburant, stockés en colonnes.
+
+    Les colonnes ne font que croître. À chaque ajout sont mises à jour des
+    sommes cumulées (aire sous la courbe des prix, durée de disponibilité,
+    montants et volumes vendus) et une table creuse des minimums et
+    maximums, si bien que chaque agrégat sur une fenêtre se calcule en
+    temps constant après une recherche par dichotomie.
+
+    Un prix None (pompe vide) est enregistré comme NaN et ignoré par les
+    agrégats.
+
+    """
+
+    def __init__(self) -> None:
+        """Initialise une série vide."""
+        # Changements de prix et sommes cumulées jusqu'à chacun
+        self.horodatages = array('d')
+        self.prix = array('d')
+        self.__aires = array('d')
+        self.__durees = array('d')
+
+        # Tables creuses : le niveau k contient les extrêmes de 2 ** k prix
+        self.__minimums: list[array] = []
+        self.__maximums: list[array] = []
+
+        # Ventes et sommes cumulées des montants et volumes
+        self.horodatages_ventes = array('d')
+        self.__montants = array('d', [0.0])
+        self.__volumes = array('q', [0])
+
+    def __len__(self) -> int:
+        """Retourne le nombre de prix enregistrés."""
+        return len(self.prix)
+
+    def dernier_prix(self) -> float:
+        """Retourne le dernier prix enregistré, None s'il n'y en a pas."""
+        if not self.prix or math.isnan(self.prix[-1]):
+            return None
+        return self.prix[-1]
+
+    def ajouter_prix(self, horodatage: float, prix: float) -> None:
+        """Enregistre un changement de prix.
+
+        Parameters
+        ----------
+        horodatage : float
+            La date du changement, postérieure aux précédentes.
+        prix : float
+            Le nouveau prix, None si le carburant est indisponible.
+
+        """
+        # Aire et durée de l'intervalle qui se termine
+        n = len(self.prix)
+        if n:
+            duree = horodatage - self.horodatages[-1]
+            precedent = self.prix[-1]
+            if math.isnan(precedent):
+                self.__aires.append(self.__aires[-1])
+                self.__durees.append(self.__durees[-1])
+            else:
+                self.__aires.append(self.__aires[-1] + precedent * duree)
+                self.__durees.append(self.__durees[-1] + duree)
+        else:
+            self.__aires.append(0.0)
+            self.__durees.append(0.0)
+
+        valeur = math.nan if prix is None else prix
+        self.horodatages.append(horodatage)
+        self.prix.append(valeur)
+
+        # Nouvelle colonne de chaque niveau des tables creuses
+        for tables, neutre, extreme in (
+                (self.__minimums, math.inf, min),
+                (self.__maximums, -math.inf, max)):
+            if not tables:
+                tables.append(array('d'))
+            tables[0].append(neutre if prix is None else valeur)
+            niveau = 1
+            while (1 << niveau) <= n + 1:
+                if len(tables) == niveau:
+                    tables.append(array('d'))
+                debut = n + 1 - (1 << niveau)
+                inferieur = tables[niveau - 1]
+                tables[niveau].append(extreme(
+                    inferieur[debut], inferieur[debut + (1 << niveau - 1)]))
+                niveau += 1
+
+    def ajouter_vente(
+            self, horodatage: float, volume: int, prix: float) -> None:
+        """Enregistre une vente.
+
+        Parameters
+        ----------
+        horodatage : float
+            La date de la vente, postérieure aux précédentes.
+        volume : int
+            Le volume vendu.
+        prix : float
+            Le prix facturé.
+
+        """
+        self.horodatages_ventes.append(horodatage)
+        self.__montants.append(self.__montants[-1] + volume * prix)
+        self.__volumes.append(self.__volumes[-1] + volume)
+
+    def __fenetre(self, debut: float, fin: float) -> tuple[int, int]:
+        """Retourne les indices des prix en vigueur entre deux dates.
+
+        Le premier est le dernier prix fixé au plus tard à `debut`, ou le
+        premier prix s'il est postérieur ; le second le dernier fixé au
+        plus tard à `fin`. Retourne (0, -1) si aucun prix n'est en vigueur.
+
+        """
+        if debut > fin:
+            raise ValueError("Le début doit précéder la fin.")
+        premier = max(bisect_right(self.horodatages, debut) - 1, 0)
+        dernier = bisect_right(self.horodatages, fin) - 1
+        return premier, dernier
+
+    def __extreme(self, debut: float, fin: float, tables, extreme):
+        """Retourne l'extrême des prix en vigueur, par la table creuse."""
+        premier, dernier = self.__fenetre(debut, fin)
+        if dernier < premier:
+            return None
+        niveau = (dernier - premier + 1).bit_length() - 1
+        table = tables[niveau]
+        valeur = extreme(table[premier], table[dernier - (1 << niveau) + 1])
+        return None if math.isinf(valeur) else valeur
+
+    def minimum(self, debut: float, fin: float) -> float:
+        """Retourne le prix minimal en vigueur entre deux dates, ou None."""
+        return self.__extreme(debut, fin, self.__minimums, min)
+
+    def maximum(self, debut: float, fin: float) -> float:
+        """Retourne le prix maximal en vigueur entre deux dates, ou None."""
+        return self.__extreme(debut, fin, self.__maximums, max)
+
+    def moyenne(self, debut: float, fin: float) -> float:
+        """Retourne le prix moyen entre deux dates, pondéré par la durée.
+
+        Les périodes où le carburant est indisponible sont ignorées.
+        Retourne None si le carburant n'a jamais été disponible.
+
+        """
+        premier, dernier = self.__fenetre(debut, fin)
+        if dernier < premier:
+            return None
+        debut = max(debut, self.horodatages[premier])
+
+        # Aire et durée entre le premier et le dernier changement, puis
+        # corrections aux deux extrémités de la fenêtre
+        aire = self.__aires[dernier] - self.__aires[premier]
+        duree = self.__durees[dernier] - self.__durees[premier]
+        for indice, ecart in (
+                (premier, self.horodatages[premier] - debut),
+                (dernier, fin - self.horodatages[dernier])):
+            if not math.isnan(self.prix[indice]):
+                aire += self.prix[indice] * ecart
+                duree += ecart
+        if duree > 0:
+            return aire / duree
+        prix = self.prix[dernier]
+        return None if math.isnan(prix) else prix
+
+    def prix_moyen_pondere(self, debut: float, fin: float) -> float:
+        """Retourne le prix moyen des ventes, pondéré par leur volume."""
+        if debut > fin:
+            raise ValueError("Le début doit précéder la fin.")
+        premier = bisect_left(self.horodatages_ventes, debut)
+        dernier = bisect_right(self.horodatages_ventes, fin)
+        volume = self.__volumes[dernier] - self.__volumes[premier]
+        if not volume:
+            return None
+        return (self.__montants[dernier] - self.__montants[premier]) / volume
+
+
+class HistoriquePrix:
+    """Historique des prix et des ventes d'une station-service.
+
+    L'historique s'abonne à la station : chaque vente est enregistrée, et
+    chaque changement de prix, y compris le passage à None d'une pompe
+    vidée, est ajouté à la série du carburant.
+
+    Examples
+    --------
+    >>> from unittest import mock
+    >>> from carburant import Carburant
+    >>> from pompe import Pompe
+    >>> from station import Station
+    >>> from substance_chimique import SubstanceChimique
+    >>> octane = SubstanceChimique(
+    ...     nom='octane', numero_cas='111-65-9', numero_ce='203-892-1')
+    >>> sp98 = Carburant(nom='SP98', composition_chimique={octane: 1.0})
+    >>> station = Station(
+    ...     pompes={'SP98': Pompe(sp98, 100, 80)}, prix={'SP98': 2.0})
+    >>> with mock.patch('time.time', side_effect=[0.0, 10.0, 20.0, 30.0]):
+    ...     historique = HistoriquePrix(station)
+    ...     station.servir('SP98', 10)
+    ...     station._mettre_a_jour_prix('SP98', 1.0)
+    ...     station.servir('SP98', 30)
+    >>> historique.moyenne('SP98', 0.0, 40.0)
+    1.5
+    >>> historique.minimum('SP98', 0.0, 40.0)
+    1.0
+    >>> historique.prix_moyen_pondere('SP98', 0.0, 40.0)
+    1.25
+
+    """
+
+    def __init__(self, station) -> None:
+        """Initialise l'historique avec les prix courants de la station.
+
+        Parameters
+        ----------
+        station : Station
+            La station dont les prix sont conservés.
+
+        """
+        self.station = station
+        self.series: dict[str, SeriePrix] = {}
+        maintenant = time.time()
+        for nom, prix in station.prix.items():
+            self.__serie(nom).ajouter_prix(maintenant, prix)
+        station.abonner(self.enregistrer)
+
+    def __serie(self, nom_carburant: str) -> SeriePrix:
+        """Retourne la série d'un carburant, créée au besoin."""
+        serie = self.series.get(nom_carburant)
+        if serie is None:
+            serie = self.series[nom_carburant] = SeriePrix()
+        return serie
+
+    def enregistrer(self, evenement: Evenement) -> None:
+        """Enregistre une opération de la station.
+
+        Parameters
+        ----------
+        evenement : Evenement
+            L'opération, qui vient d'avoir lieu.
+
+        """
+        serie = self.__serie(evenement.nom_carburant)
+
+        # Les dates ne reculent jamais, pour la recherche par dichotomie
+        horodatage = evenement.horodatage
+        if serie.horodatages:
+            horodatage = max(horodatage, serie.horodatages[-1])
+        if serie.horodatages_ventes:
+            horodatage = max(horodatage, serie.horodatages_ventes[-1])
+
+        if evenement.operation == 'servir':
+            serie.ajouter_vente(horodatage, evenement.volume, evenement.prix)
+
+        # Nouveau prix, ou passage à None après une vente
+        prix = self.station.prix.get(evenement.nom_carburant)
+        if not len(serie) or prix != serie.dernier_prix():
+            serie.ajouter_prix(horodatage, prix)
+
+    def minimum(self, nom_carburant: str, debut: float, fin: float) -> float:
+        """Retourne le prix minimal d'un carburant entre deux dates."""
+        return self.series[nom_carburant].minimum(debut, fin)
+
+    def maximum(self, nom_carburant: str, debut: float, fin: float) -> float:
+        """Retourne le prix maximal d'un carburant entre deux dates."""
+        return self.series[nom_carburant].maximum(debut, fin)
+
+    def moyenne(self, nom_carburant: str, debut: float, fin: float) -> float:
+        """Retourne le prix moyen d'un carburant entre deux dates."""
+        return self.series[nom_carburant].moyenne(debut, fin)
+
+    def prix_moyen_pondere(
+            self, nom_carburant: str, debut: float, fin: float) -> float:
+        """Retourne le prix moyen des ventes, pondéré par leur volume."""
+        return self.series[nom_carburant].prix_moyen_pondere(debut, fin)
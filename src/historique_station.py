@@ -0,0 +1,166 @@
+import math
+import threading
+import time
+from array import array
+from bisect import bisect_right
+
+from evenement import Evenement
+
+
+class HistoriqueStation:
+    """Historique des états d'une station-service, interrogeable par date.
+
+    Chaque opération de la station ajoute l'état de la clé concernée
+    (volumes de la pompe et prix) à des colonnes : horodatages, clés,
+    prix et volumes. Tous les `intervalle` événements, l'état complet de
+    la station est conservé. L'état à une date donnée part du dernier état
+    complet antérieur et n'applique que les événements suivants, au plus
+    `intervalle`.
+
+    L'historique est créé par `Station.activer_historique`, qui l'abonne à
+    la station. Ses colonnes sont protégées par un verrou : les événements
+    de clés différentes d'une station concurrente peuvent arriver en même
+    temps.
+
+    """
+
+    def __init__(self, station, intervalle: int = 1024) -> None:
+        """Initialise l'historique avec l'état courant de la station.
+
+        Parameters
+        ----------
+        station : Station
+            La station dont l'historique est conservé.
+        intervalle : int
+            Le nombre d'événements entre deux états complets.
+
+        """
+        # Vérification des arguments
+        if not isinstance(intervalle, int):
+            raise TypeError("L'intervalle doit être de type 'int'.")
+        if not intervalle > 0:
+            raise ValueError("L'intervalle doit être > 0.")
+
+        # Assignation des attributs
+        self.station = station
+        self.__intervalle = intervalle
+
+        # Colonnes des événements, les clés étant numérotées
+        self.__horodatages = array('d')
+        self.__cles = array('I')
+        self.__prix = array('d')
+        self.__volumes = array('q')
+        self.__bornes = array('Q', [0])
+        self.__numeros: dict[str, int] = {}
+        self.__noms: list[str] = []
+
+        # Dernier état enregistré de chaque clé, avec la pompe concernée
+        self.__derniers: dict[str, tuple] = {}
+        self.__verrou = threading.Lock()
+
+        # États complets : position dans les événements, date et état
+        self.__positions: list[int] = []
+        self.__dates: list[float] = []
+        self.__etats: list[dict] = []
+        self.__conserver_etat(time.time())
+
+    def __len__(self) -> int:
+        """Retourne le nombre d'événements enregistrés."""
+        with self.__verrou:
+            return len(self.__horodatages)
+
+    def __conserver_etat(self, horodatage: float):
+        """Conserve l'état complet courant, le verrou étant pris.
+
+        Une clé déjà enregistrée, dont la pompe n'a pas été remplacée,
+        reprend son dernier état enregistré, lu sous le verrou de la clé :
+        lire la station pourrait saisir une pompe au milieu d'un service
+        sur un autre thread.
+
+        """
+        # Copie des clés, qu'un ajout ou un retrait de pompe peut changer
+        etat = {}
+        for nom, pompe in list(self.station.pompes.items()):
+            pompe_enregistree, dernier = self.__derniers.get(nom, (None, None))
+            if pompe_enregistree is pompe:
+                etat[nom] = dernier
+            else:
+                try:
+                    etat[nom] = self.station._etat(nom)
+                except KeyError:
+                    # Pompe retirée entre-temps
+                    pass
+        self.__positions.append(len(self.__horodatages))
+        self.__dates.append(horodatage)
+        self.__etats.append(etat)
+
+    def enregistrer(self, evenement: Evenement) -> None:
+        """Ajoute l'état de la clé d'un événement à l'historique.
+
+        Parameters
+        ----------
+        evenement : Evenement
+            L'opération de la station, qui vient d'avoir lieu.
+
+        """
+        # État de la clé, lu sous son verrou par la station qui notifie
+        nom = evenement.nom_carburant
+        pompe = self.station.pompes.get(nom)
+        volumes, prix = etat = self.station._etat(nom)
+
+        with self.__verrou:
+            # Les dates ne reculent jamais, pour la recherche par dichotomie
+            horodatage = max(evenement.horodatage, self.__dates[-1])
+            if self.__horodatages:
+                horodatage = max(horodatage, self.__horodatages[-1])
+
+            # Numéro de la clé
+            numero = self.__numeros.get(nom)
+            if numero is None:
+                numero = self.__numeros[nom] = len(self.__noms)
+                self.__noms.append(nom)
+
+            # Ajout aux colonnes
+            self.__horodatages.append(horodatage)
+            self.__cles.append(numero)
+            self.__prix.append(math.nan if prix is None else prix)
+            self.__volumes.extend(volumes)
+            self.__bornes.append(len(self.__volumes))
+            self.__derniers[nom] = (pompe, etat)
+
+            # État complet périodique
+            if len(self.__horodatages) % self.__intervalle == 0:
+                self.__conserver_etat(horodatage)
+
+    def etat_a(
+            self, horodatage: float
+            ) -> dict[str, tuple[tuple[int, ...], float]]:
+        """Retourne l'état de la station à une date.
+
+        Parameters
+        ----------
+        horodatage : float
+            La date, en secondes depuis l'epoch.
+
+        Returns
+        -------
+        dict[str, tuple[tuple[int, ...], float]]
+            Pour chaque clé, les volumes de la pompe et le prix à cette
+            date, comme `Station._etat`.
+
+        """
+        if horodatage < self.__dates[0]:
+            raise ValueError("L'historique ne remonte pas à cette date.")
+
+        with self.__verrou:
+            # Dernier état complet antérieur, puis événements suivants
+            fin = bisect_right(self.__horodatages, horodatage)
+            indice = bisect_right(self.__positions, fin) - 1
+            etat = dict(self.__etats[indice])
+            for i in range(self.__positions[indice], fin):
+                prix = self.__prix[i]
+                debut, suivant = self.__bornes[i], self.__bornes[i + 1]
+                etat[self.__noms[self.__cles[i]]] = (
+                    tuple(self.__volumes[debut:suivant]),
+                    None if math.isnan(prix) else prix)
+        return etat
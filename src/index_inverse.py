@@ -0,0 +1,160 @@
+from bisect import bisect_left, bisect_right
+
+from carburant import Carburant
+from substance_chimique import SubstanceChimique
+
+
+class IndexInverse:
+    """Index des carburants par substance, trié par proportion.
+
+    Pour chaque substance, l'index conserve la liste des carburants qui la
+    contiennent, rangée par proportion croissante. Les requêtes de seuil
+    et de classement trouvent leur point de départ par dichotomie, au lieu
+    de parcourir la composition de chaque carburant.
+
+    Examples
+    --------
+    >>> ethanol = SubstanceChimique(
+    ...     nom='éthanol', numero_cas='64-17-5', numero_ce='200-578-6')
+    >>> essence = SubstanceChimique(
+    ...     nom='essence', numero_cas='86290-81-5', numero_ce='289-220-8')
+    >>> index = IndexInverse()
+    >>> index.ajouter(Carburant('E85', {ethanol: 0.85, essence: 0.15}))
+    >>> index.ajouter(Carburant('E10', {ethanol: 0.1, essence: 0.9}))
+    >>> index.ajouter(Carburant('SP', {essence: 1.0}))
+    >>> [(c.nom, p) for c, p in index.au_dessus(ethanol, 0.05)]
+    [('E85', 0.85), ('E10', 0.1)]
+    >>> [c.nom for c, _ in index.plus_riches(essence, 2)]
+    ['SP', 'E10']
+
+    """
+
+    def __init__(self, carburants: list[Carburant] = ()) -> None:
+        """Initialise l'index.
+
+        Parameters
+        ----------
+        carburants : list[Carburant]
+            Les carburants à indexer d'emblée.
+
+        """
+        self.__carburants: set[Carburant] = set()
+        self.__proportions: dict[SubstanceChimique, list[float]] = {}
+        self.__listes: dict[SubstanceChimique, list[Carburant]] = {}
+        for carburant in carburants:
+            self.ajouter(carburant)
+
+    def __len__(self) -> int:
+        """Retourne le nombre de carburants indexés."""
+        return len(self.__carburants)
+
+    def __contains__(self, carburant: Carburant) -> bool:
+        """Indique si un carburant est indexé."""
+        return carburant in self.__carburants
+
+    def ajouter(self, carburant: Carburant) -> None:
+        """Indexe un carburant. Un carburant déjà indexé est ignoré.
+
+        Parameters
+        ----------
+        carburant : Carburant
+            Le carburant à indexer.
+
+        """
+        # Vérification du type de l'argument
+        if not isinstance(carburant, Carburant):
+            raise TypeError("Le carburant doit être de type 'Carburant'.")
+        if carburant in self.__carburants:
+            return
+        self.__carburants.add(carburant)
+
+        # Insertion à sa place dans la liste de chaque substance
+        for substance, proportion in carburant.composition_chimique.items():
+            proportions = self.__proportions.setdefault(substance, [])
+            liste = self.__listes.setdefault(substance, [])
+            position = bisect_right(proportions, proportion)
+            proportions.insert(position, proportion)
+            liste.insert(position, carburant)
+
+    def retirer(self, carburant: Carburant) -> None:
+        """Retire un carburant de l'index.
+
+        Parameters
+        ----------
+        carburant : Carburant
+            Le carburant à retirer.
+
+        """
+        if carburant not in self.__carburants:
+            raise KeyError("Le carburant n'est pas indexé.")
+        self.__carburants.remove(carburant)
+
+        for substance, proportion in carburant.composition_chimique.items():
+            proportions = self.__proportions[substance]
+            liste = self.__listes[substance]
+
+            # Recherche parmi les carburants de même proportion
+            debut = bisect_left(proportions, proportion)
+            fin = bisect_right(proportions, proportion)
+            position = next(
+                i for i in range(debut, fin) if liste[i] == carburant)
+            del proportions[position]
+            del liste[position]
+
+    def au_dessus(
+            self, substance: SubstanceChimique, seuil: float,
+            inclus: bool = False) -> list[tuple[Carburant, float]]:
+        """Retourne les carburants dépassant une proportion de substance.
+
+        Parameters
+        ----------
+        substance : SubstanceChimique
+            La substance recherchée.
+        seuil : float
+            La proportion minimale.
+        inclus : bool
+            Inclure les carburants dont la proportion vaut exactement le
+            seuil.
+
+        Returns
+        -------
+        list[tuple[Carburant, float]]
+            Les carburants et leur proportion, par proportion décroissante.
+
+        """
+        proportions = self.__proportions.get(substance, [])
+        liste = self.__listes.get(substance, [])
+        if inclus:
+            debut = bisect_left(proportions, seuil)
+        else:
+            debut = bisect_right(proportions, seuil)
+        return list(zip(reversed(liste[debut:]),
+                        reversed(proportions[debut:])))
+
+    def plus_riches(
+            self, substance: SubstanceChimique,
+            k: int) -> list[tuple[Carburant, float]]:
+        """Retourne les k carburants les plus riches en une substance.
+
+        Parameters
+        ----------
+        substance : SubstanceChimique
+            La substance recherchée.
+        k : int
+            Le nombre de carburants.
+
+        Returns
+        -------
+        list[tuple[Carburant, float]]
+            Les carburants et leur proportion, par proportion décroissante.
+
+        """
+        if not isinstance(k, int):
+            raise TypeError("Le nombre de carburants doit être de type 'int'.")
+        if not k >= 0:
+            raise ValueError("Le nombre de carburants doit être >= 0.")
+        proportions = self.__proportions.get(substance, [])
+        liste = self.__listes.get(substance, [])
+        debut = max(len(liste) - k, 0)
+        return list(zip(reversed(liste[debut:]),
+                        reversed(proportions[debut:])))
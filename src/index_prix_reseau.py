@@ -0,0 +1,194 @@
+import heapq
+import threading
+
+from evenement import Evenement
+from station import Station
+
+
+class IndexPrixReseau:
+    """Index des prix d'un réseau de stations-service, par carburant.
+
+    Chaque carburant a un tas de (prix, station), mis à jour par les
+    événements des stations : un changement de prix, un remplissage ou une
+    pompe vidée par un service ajoutent une entrée pour le nouveau prix,
+    sans retirer l'ancienne. Les entrées périmées sont reconnues, et
+    écartées, quand elles arrivent au sommet du tas ; le tas est
+    reconstruit quand elles deviennent majoritaires.
+
+    Les k stations les moins chères s'obtiennent ainsi en O(k log n), sans
+    parcourir les prix de toutes les stations.
+
+    Examples
+    --------
+    >>> from carburant import Carburant
+    >>> from pompe import Pompe
+    >>> from substance_chimique import SubstanceChimique
+    >>> octane = SubstanceChimique(
+    ...     nom='octane', numero_cas='111-65-9', numero_ce='203-892-1')
+    >>> sp95 = Carburant(nom='SP95', composition_chimique={octane: 1.0})
+    >>> stations = [
+    ...     Station(pompes={'SP95': Pompe(sp95, 10, 5)}, prix={'SP95': p})
+    ...     for p in (1.9, 1.8, 2.0)]
+    >>> index = IndexPrixReseau(stations)
+    >>> [prix for prix, _ in index.moins_chers('SP95', 2)]
+    [1.8, 1.9]
+    >>> stations[1].servir('SP95', 5)
+    >>> stations[2]._mettre_a_jour_prix('SP95', 1.7)
+    >>> [prix for prix, _ in index.moins_chers('SP95', 2)]
+    [1.7, 1.9]
+
+    """
+
+    def __init__(self, stations: list[Station] = ()) -> None:
+        """Initialise l'index et y ajoute des stations.
+
+        Parameters
+        ----------
+        stations : list[Station]
+            Les stations du réseau.
+
+        """
+        self.stations: list[Station] = []
+        self.__observateurs = []
+
+        # Par carburant : tas de (prix, indice de station, version), et
+        # prix et version courants de chaque station
+        self.__tas: dict[str, list[tuple[float, int, int]]] = {}
+        self.__courants: dict[str, dict[int, tuple[float, int]]] = {}
+        self.__version = 0
+        self.__verrou = threading.Lock()
+
+        for station in stations:
+            self.ajouter_station(station)
+
+    def ajouter_station(self, station: Station) -> int:
+        """Ajoute une station au réseau et s'abonne à ses opérations.
+
+        Parameters
+        ----------
+        station : Station
+            La station à ajouter.
+
+        Returns
+        -------
+        int
+            L'indice de la station dans `stations`.
+
+        """
+        if not isinstance(station, Station):
+            raise TypeError("La station doit être de type 'Station'.")
+        indice = len(self.stations)
+        self.stations.append(station)
+        observateur = self.__observateur(indice)
+        self.__observateurs.append(observateur)
+        self.actualiser(indice)
+        station.abonner(observateur)
+        return indice
+
+    def __observateur(self, indice: int):
+        """Retourne la fonction qui met à jour les prix d'une station."""
+        def mettre_a_jour(evenement: Evenement):
+            nom = evenement.nom_carburant
+            # Prix lu sous le verrou, pour ne pas remplacer celui qu'un
+            # `actualiser` concurrent aurait enregistré depuis
+            with self.__verrou:
+                prix = self.stations[indice].prix.get(nom)
+                self.__mettre_a_jour(indice, nom, prix)
+        return mettre_a_jour
+
+    def actualiser(self, indice: int) -> None:
+        """Relit tous les prix d'une station.
+
+        Nécessaire après une modification qui ne produit pas d'événement,
+        comme l'ajout ou le retrait d'une pompe.
+
+        Parameters
+        ----------
+        indice : int
+            L'indice de la station dans `stations`.
+
+        """
+        station = self.stations[indice]
+        with self.__verrou:
+            prix = dict(station.prix)
+            for nom, courants in self.__courants.items():
+                if indice in courants and nom not in prix:
+                    self.__mettre_a_jour(indice, nom, None)
+            for nom, valeur in prix.items():
+                self.__mettre_a_jour(indice, nom, valeur)
+
+    def __mettre_a_jour(self, indice: int, nom: str, prix: float):
+        """Enregistre le prix d'une station, le verrou étant pris."""
+        courants = self.__courants.setdefault(nom, {})
+        courant = courants.get(indice)
+
+        # Un service qui ne vide pas la pompe ne change pas le prix
+        if courant is not None and courant[0] == prix:
+            return
+        if prix is None:
+            courants.pop(indice, None)
+            return
+
+        self.__version += 1
+        courants[indice] = (prix, self.__version)
+        tas = self.__tas.setdefault(nom, [])
+        heapq.heappush(tas, (prix, indice, self.__version))
+
+        # Reconstruction quand les entrées périmées sont majoritaires
+        if len(tas) > 2 * len(courants) + 64:
+            tas[:] = [
+                (p, i, version) for i, (p, version) in courants.items()]
+            heapq.heapify(tas)
+
+    def moins_chers(
+            self, nom_carburant: str, k: int = 1
+            ) -> list[tuple[float, Station]]:
+        """Retourne les stations les moins chères pour un carburant.
+
+        Parameters
+        ----------
+        nom_carburant : str
+            Le nom du carburant.
+        k : int
+            Le nombre maximal de stations.
+
+        Returns
+        -------
+        list[tuple[float, Station]]
+            Le prix et la station, par prix croissant puis ordre d'ajout.
+            Les stations dont la pompe est vide n'y figurent pas.
+
+        """
+        if not isinstance(k, int):
+            raise TypeError("Le nombre de stations doit être de type 'int'.")
+        if not k >= 0:
+            raise ValueError("Le nombre de stations doit être >= 0.")
+
+        resultats = []
+        with self.__verrou:
+            tas = self.__tas.get(nom_carburant, [])
+            courants = self.__courants.get(nom_carburant, {})
+
+            # Les entrées valides sont retirées puis remises, les
+            # périmées sont abandonnées
+            valides = []
+            while tas and len(valides) < k:
+                entree = heapq.heappop(tas)
+                prix, indice, version = entree
+                if courants.get(indice) == (prix, version):
+                    valides.append(entree)
+            for entree in valides:
+                heapq.heappush(tas, entree)
+                resultats.append((entree[0], self.stations[entree[1]]))
+        return resultats
+
+    def moins_cher(self, nom_carburant: str) -> tuple[float, Station]:
+        """Retourne la station la moins chère pour un carburant, ou None."""
+        resultats = self.moins_chers(nom_carburant)
+        return resultats[0] if resultats else None
+
+    def fermer(self) -> None:
+        """Se désabonne des stations."""
+        for station, observateur in zip(self.stations, self.__observateurs):
+            station.desabonner(observateur)
+        self.__observateurs = []
@@ -0,0 +1,329 @@
+import mmap
+import os
+import struct
+import traceback
+import zlib
+
+import numpy as np
+
+from banque_pompes import BanquePompes
+from carburant import Carburant
+from groupe_pompes import GroupePompes, StrategiePlusDisponible, \
+    StrategieTourniquet
+from pompe import Pompe
+from station import Station
+from substance_chimique import SubstanceChimique
+
+# Signature et version du format
+_SIGNATURE = b'DMIPOO\x00\x01'
+
+# En-tête : signature, somme de contrôle et taille des données
+_ENTETE = struct.Struct('<8sIxxxxQ')
+
+# En-tête d'un tableau : type NumPy et nombre d'éléments
+_TABLEAU = struct.Struct('<2sxxxxxxQ')
+
+# Nature de la pompe d'une clé
+_POMPE, _GROUPE_PLUS_DISPONIBLE, _GROUPE_TOURNIQUET = 0, 1, 2
+
+# Tableaux de l'instantané, dans l'ordre du fichier
+_TABLEAUX = (
+    'substances_noms', 'substances_bornes', 'substances_cas',
+    'substances_ce',
+    'carburants_noms', 'carburants_bornes', 'compositions_bornes',
+    'compositions_substances', 'compositions_proportions',
+    'pompes_carburants', 'pompes_maximaux', 'pompes_disponibles',
+    'cles_noms', 'cles_bornes', 'cles_prix', 'cles_pompes', 'cles_natures',
+    'stations_cles', 'stations_concurrentes',
+)
+
+
+def ecrire_instantane(chemin: str, stations: list[Station]) -> None:
+    """Écrit l'état d'un parc de stations dans un instantané binaire.
+
+    Les substances et les carburants sont écrits une seule fois, quel que
+    soit le nombre de pompes qui les utilisent ; les numéros CAS et CE sont
+    stockés sous forme de clés entières, les volumes des pompes et les prix
+    dans des tableaux contigus. Les abonnés des stations ne sont pas
+    sauvegardés.
+
+    L'instantané est écrit à côté, dans `chemin` + '.tmp', puis renommé :
+    un instantané existant n'est jamais à moitié remplacé.
+
+    Parameters
+    ----------
+    chemin : str
+        Le chemin de l'instantané.
+    stations : list[Station]
+        Les stations à sauvegarder.
+
+    """
+    substances: dict[SubstanceChimique, int] = {}
+    carburants: dict[Carburant, int] = {}
+    colonnes = {nom: [] for nom in _TABLEAUX}
+
+    def indice_carburant(carburant: Carburant) -> int:
+        """Retourne l'indice d'un carburant, ajouté au besoin."""
+        indice = carburants.get(carburant)
+        if indice is None:
+            indice = carburants[carburant] = len(carburants)
+            colonnes['carburants_noms'].append(carburant.nom)
+            colonnes['compositions_bornes'].append(
+                len(carburant.composition_chimique))
+            for substance, proportion in \
+                    carburant.composition_chimique.items():
+                if substance not in substances:
+                    substances[substance] = len(substances)
+                colonnes['compositions_substances'].append(
+                    substances[substance])
+                colonnes['compositions_proportions'].append(proportion)
+        return indice
+
+    # Parcours des stations, de leurs clés et de leurs pompes. Les clés
+    # sont copiées, et l'état de chacune est lu sous son verrou, pour une
+    # station utilisée depuis d'autres threads
+    for station in stations:
+        nombre = 0
+        for nom, pompe in list(station.pompes.items()):
+            try:
+                volumes, prix = station._etat_verrouille(nom)
+            except KeyError:
+                # Pompe retirée entre-temps
+                continue
+            if isinstance(pompe, GroupePompes):
+                pompes = pompe.pompes
+                nature = _GROUPE_TOURNIQUET \
+                    if pompe.strategie is StrategieTourniquet \
+                    else _GROUPE_PLUS_DISPONIBLE
+            else:
+                pompes, nature = (pompe,), _POMPE
+            nombre += 1
+            colonnes['cles_noms'].append(nom)
+            colonnes['cles_prix'].append(np.nan if prix is None else prix)
+            colonnes['cles_pompes'].append(len(pompes))
+            colonnes['cles_natures'].append(nature)
+            for element, volume in zip(pompes, volumes):
+                colonnes['pompes_carburants'].append(
+                    indice_carburant(element.carburant))
+                colonnes['pompes_maximaux'].append(element.volume_maximal)
+                colonnes['pompes_disponibles'].append(volume)
+        colonnes['stations_cles'].append(nombre)
+        colonnes['stations_concurrentes'].append(station.concurrente)
+
+    # Substances, dans l'ordre de leurs indices
+    for substance in substances:
+        colonnes['substances_noms'].append(substance.nom)
+        colonnes['substances_cas'].append(
+            SubstanceChimique.cas_en_cle(substance.numero_cas))
+        colonnes['substances_ce'].append(
+            SubstanceChimique.ce_en_cle(substance.numero_ce))
+
+    # Conversion en tableaux : noms concaténés et bornes cumulées
+    tableaux = {}
+    for prefixe in ('substances', 'carburants', 'cles'):
+        tableaux[f'{prefixe}_noms'], tableaux[f'{prefixe}_bornes'] = \
+            _concatener(colonnes[f'{prefixe}_noms'])
+    for nom, type_ in (
+            ('substances_cas', np.int64), ('substances_ce', np.int64),
+            ('compositions_substances', np.int32),
+            ('compositions_proportions', np.float64),
+            ('pompes_carburants', np.int32), ('pompes_maximaux', np.int64),
+            ('pompes_disponibles', np.int64), ('cles_prix', np.float64),
+            ('cles_natures', np.int8), ('stations_concurrentes', np.int8)):
+        tableaux[nom] = np.array(colonnes[nom], dtype=type_)
+    for nom in ('compositions_bornes', 'cles_pompes', 'stations_cles'):
+        tableaux[nom] = np.concatenate(
+            [[0], np.cumsum(colonnes[nom], dtype=np.int64)]).astype(np.int64)
+
+    # Écriture : en-tête, puis tableaux alignés sur 8 octets
+    donnees = bytearray()
+    for nom in _TABLEAUX:
+        tableau = np.ascontiguousarray(tableaux[nom])
+        donnees += _TABLEAU.pack(
+            tableau.dtype.str[1:].encode('ascii'), len(tableau))
+        donnees += tableau.tobytes()
+        donnees += bytes(-len(donnees) % 8)
+    # Écriture dans un fichier temporaire synchronisé, puis renommage :
+    # une panne laisse l'ancien instantané ou le nouveau, jamais un mélange
+    with open(chemin + '.tmp', 'wb') as fichier:
+        fichier.write(_ENTETE.pack(
+            _SIGNATURE, zlib.crc32(donnees), len(donnees)))
+        fichier.write(donnees)
+        fichier.flush()
+        os.fsync(fichier.fileno())
+    os.replace(chemin + '.tmp', chemin)
+
+    # Le répertoire est synchronisé, pour que le renommage survive à une
+    # panne
+    repertoire = os.open(os.path.dirname(chemin) or '.', os.O_RDONLY)
+    try:
+        os.fsync(repertoire)
+    finally:
+        os.close(repertoire)
+
+
+def lire_instantane(
+        chemin: str, valider: bool = True,
+        banque: bool = False) -> list[Station]:
+    """Reconstruit un parc de stations depuis un instantané binaire.
+
+    Le fichier est projeté en mémoire et ses tableaux lus sans copie.
+    Avec `valider=False`, pour un instantané de confiance, la somme de
+    contrôle n'est pas vérifiée et les objets sont créés sans passer par
+    les constructeurs qui vérifient leurs arguments.
+
+    Parameters
+    ----------
+    chemin : str
+        Le chemin de l'instantané.
+    valider : bool
+        Vérifier la somme de contrôle et les données.
+    banque : bool
+        Ranger les volumes de toutes les pompes dans un `BanquePompes`, les
+        stations utilisant des vues sur cette banque au lieu de `Pompe`.
+
+    Returns
+    -------
+    list[Station]
+        Les stations, dans l'ordre de l'instantané.
+
+    Examples
+    --------
+    >>> import os
+    >>> import tempfile
+    >>> octane = SubstanceChimique(
+    ...     nom='octane', numero_cas='111-65-9', numero_ce='203-892-1')
+    >>> sp98 = Carburant(nom='SP98', composition_chimique={octane: 1.0})
+    >>> station = Station(
+    ...     pompes={'SP98': [Pompe(sp98, 10, 8), Pompe(sp98, 10, 0)]},
+    ...     prix={'SP98': 1.9})
+    >>> chemin = os.path.join(tempfile.mkdtemp(), 'parc.instantane')
+    >>> ecrire_instantane(chemin, [station])
+    >>> copie, = lire_instantane(chemin, valider=False)
+    >>> copie._etat('SP98')
+    ((8, 0), 1.9)
+
+    """
+    with open(chemin, 'rb') as fichier:
+        projection = mmap.mmap(fichier.fileno(), 0, access=mmap.ACCESS_READ)
+    tableaux = {}
+    tableau = None
+    try:
+        # En-tête
+        signature, somme, taille = _ENTETE.unpack_from(projection, 0)
+        if signature != _SIGNATURE:
+            raise ValueError("Le fichier n'est pas un instantané valide.")
+        if valider and zlib.crc32(
+                projection[_ENTETE.size:_ENTETE.size + taille]) != somme:
+            raise ValueError("L'instantané est corrompu.")
+
+        # Tableaux, lus sans copie dans la projection
+        position = _ENTETE.size
+        for nom in _TABLEAUX:
+            type_, nombre = _TABLEAU.unpack_from(projection, position)
+            position += _TABLEAU.size
+            tableau = np.frombuffer(
+                projection, dtype='<' + type_.decode('ascii'), count=nombre,
+                offset=position)
+            tableaux[nom] = tableau
+            position += tableau.nbytes + (-tableau.nbytes % 8)
+
+        return _construire(tableaux, valider, banque)
+    except Exception as erreur:
+        # Les fonctions appelées ont pu retenir des vues sur la projection
+        traceback.clear_frames(erreur.__traceback__.tb_next)
+        raise
+    finally:
+        # Les vues sur la projection doivent disparaître avant sa fermeture
+        tableaux.clear()
+        del tableau
+        projection.close()
+
+
+def _concatener(noms: list[str]) -> tuple[np.ndarray, np.ndarray]:
+    """Concatène des noms en UTF-8 et retourne les octets et les bornes."""
+    codes = [nom.encode('utf-8') for nom in noms]
+    bornes = np.zeros(len(codes) + 1, dtype=np.int64)
+    np.cumsum([len(code) for code in codes], out=bornes[1:])
+    return np.frombuffer(b''.join(codes), dtype=np.uint8), bornes
+
+
+def _separer(octets: np.ndarray, bornes: np.ndarray) -> list[str]:
+    """Découpe des noms concaténés par `_concatener`."""
+    texte = octets.tobytes()
+    bornes = bornes.tolist()
+    return [texte[debut:fin].decode('utf-8')
+            for debut, fin in zip(bornes, bornes[1:])]
+
+
+def _construire(
+        tableaux: dict[str, np.ndarray], valider: bool,
+        banque: bool) -> list[Station]:
+    """Construit les objets d'un instantané à partir de ses tableaux."""
+    # Substances
+    noms = _separer(tableaux['substances_noms'], tableaux['substances_bornes'])
+    numeros = zip(
+        map(SubstanceChimique.cle_en_cas, tableaux['substances_cas'].tolist()),
+        map(SubstanceChimique.cle_en_ce, tableaux['substances_ce'].tolist()))
+    creer = SubstanceChimique if valider else SubstanceChimique._creer
+    substances = [creer(nom, cas, ce) for nom, (cas, ce) in zip(noms, numeros)]
+
+    # Carburants
+    noms = _separer(tableaux['carburants_noms'], tableaux['carburants_bornes'])
+    bornes = tableaux['compositions_bornes'].tolist()
+    indices = tableaux['compositions_substances'].tolist()
+    proportions = tableaux['compositions_proportions'].tolist()
+    creer = Carburant if valider else Carburant._creer
+    carburants = [
+        creer(nom, {substances[i]: p for i, p in zip(
+            indices[debut:fin], proportions[debut:fin])})
+        for nom, debut, fin in zip(noms, bornes, bornes[1:])]
+
+    # Pompes, éventuellement rangées dans une banque
+    indices = tableaux['pompes_carburants'].tolist()
+    if banque:
+        parc = BanquePompes(
+            [carburants[i] for i in indices], tableaux['pompes_maximaux'],
+            tableaux['pompes_disponibles'])
+        pompes = [parc.pompe(i) for i in range(len(parc))]
+    else:
+        creer = Pompe if valider else Pompe._creer
+        pompes = [
+            creer(carburants[i], maximal, disponible)
+            for i, maximal, disponible in zip(
+                indices, tableaux['pompes_maximaux'].tolist(),
+                tableaux['pompes_disponibles'].tolist())]
+
+    # Un prix manquant n'est admis que pour une pompe vide
+    prix = tableaux['cles_prix']
+    bornes_pompes = tableaux['cles_pompes']
+    if valider:
+        disponibles = np.add.reduceat(
+            tableaux['pompes_disponibles'], bornes_pompes[:-1]) \
+            if len(prix) else prix
+        if not np.all(np.where(np.isnan(prix), disponibles == 0, prix > 0)):
+            raise ValueError("Les prix doivent être > 0.")
+
+    # Clés des stations
+    noms = _separer(tableaux['cles_noms'], tableaux['cles_bornes'])
+    prix = [None if p != p else p for p in prix.tolist()]
+    bornes_pompes = bornes_pompes.tolist()
+    natures = tableaux['cles_natures'].tolist()
+    elements = []
+    for debut, fin, nature in zip(bornes_pompes, bornes_pompes[1:], natures):
+        if nature == _POMPE:
+            elements.append(pompes[debut])
+        else:
+            elements.append(GroupePompes(
+                pompes[debut:fin], StrategieTourniquet
+                if nature == _GROUPE_TOURNIQUET else StrategiePlusDisponible))
+
+    # Stations
+    bornes = tableaux['stations_cles'].tolist()
+    creer = Station if valider else Station._creer
+    return [
+        creer(
+            dict(zip(noms[debut:fin], elements[debut:fin])),
+            dict(zip(noms[debut:fin], prix[debut:fin])), bool(concurrente))
+        for debut, fin, concurrente in zip(
+            bornes, bornes[1:], tableaux['stations_concurrentes'].tolist())]
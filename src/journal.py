@@ -0,0 +1,306 @@
+import math
+import os
+import struct
+import threading
+import time
+import zlib
+
+from evenement import Evenement
+from station import Station
+
+# En-tête d'un enregistrement : somme de contrôle, longueurs de la clé et
+# du nombre de volumes
+_ENTETE = struct.Struct('<IHH')
+
+
+class Journal:
+    """Journal des opérations d'une station-service, pour la reprise.
+
+    Le journal s'abonne à la station. Après chaque opération, il retient
+    l'état de la clé concernée (volumes de la pompe et prix) ; les états
+    retenus sont écrits et synchronisés sur disque par groupes de
+    `taille_groupe` opérations, ou quand `delai_maximal` est dépassé. Une
+    panne peut donc perdre au plus les opérations du groupe en cours.
+
+    Comme chaque enregistrement contient l'état complet d'une clé, les
+    opérations d'un même groupe sur une clé n'en écrivent qu'un, et la
+    reprise n'a qu'à appliquer les enregistrements dans l'ordre, après le
+    dernier point de contrôle. L'état est encodé à l'arrivée de l'événement,
+    sous le verrou de sa clé : il ne peut pas être saisi au milieu d'une
+    opération d'un autre thread. Un enregistrement incomplet ou corrompu, en
+    fin de fichier après une panne, termine la reprise.
+
+    Les pompes de la station (clés, carburants, volumes maximaux) ne sont
+    pas journalisées : la reprise s'applique à une station de même
+    structure.
+
+    Examples
+    --------
+    >>> import tempfile
+    >>> from carburant import Carburant
+    >>> from pompe import Pompe
+    >>> from substance_chimique import SubstanceChimique
+    >>> octane = SubstanceChimique(
+    ...     nom='octane', numero_cas='111-65-9', numero_ce='203-892-1')
+    >>> sp98 = Carburant(nom='SP98', composition_chimique={octane: 1.0})
+    >>> def creer_station():
+    ...     return Station(
+    ...         pompes={'SP98': Pompe(sp98, 10, 8)}, prix={'SP98': 1.9})
+    >>> chemin = os.path.join(tempfile.mkdtemp(), 'station.journal')
+    >>> station = creer_station()
+    >>> with Journal(chemin, station, taille_groupe=16) as journal:
+    ...     station.servir('SP98', 3)
+    ...     station._mettre_a_jour_prix('SP98', 2.1)
+    >>> reprise = creer_station()
+    >>> Journal.recuperer(chemin, reprise)
+    1
+    >>> reprise.pompes['SP98'].volume_disponible, reprise.prix['SP98']
+    (5, 2.1)
+
+    """
+
+    def __init__(
+            self, chemin: str, station: Station, taille_groupe: int = 64,
+            delai_maximal: float = None) -> None:
+        """Ouvre le journal d'une station et s'abonne à ses opérations.
+
+        Parameters
+        ----------
+        chemin : str
+            Le chemin du journal. Le point de contrôle est écrit à côté,
+            avec le suffixe '.controle'.
+        station : Station
+            La station à journaliser.
+        taille_groupe : int
+            Le nombre d'opérations entre deux synchronisations sur disque.
+        delai_maximal : float
+            La durée maximale, en secondes, entre une opération et sa
+            synchronisation, vérifiée à chaque opération. Par défaut, seule
+            la taille du groupe compte.
+
+        """
+        # Vérification des arguments
+        if not isinstance(station, Station):
+            raise TypeError("La station doit être de type 'Station'.")
+        if not isinstance(taille_groupe, int):
+            raise TypeError("La taille de groupe doit être de type 'int'.")
+        if not taille_groupe > 0:
+            raise ValueError("La taille de groupe doit être > 0.")
+
+        # Assignation des attributs
+        self.chemin = chemin
+        self.station = station
+        self.__taille_groupe = taille_groupe
+        self.__delai_maximal = delai_maximal
+        self.__fichier = open(chemin, 'ab')
+
+        # Dernier enregistrement de chaque clé modifiée depuis la dernière
+        # synchronisation, et depuis le début d'un point de contrôle
+        self.__en_attente: dict[str, bytes] = {}
+        self.__suivis: dict[str, bytes] = None
+        self.__operations = 0
+        self.__derniere_synchronisation = time.monotonic()
+        self.__verrou = threading.Lock()
+
+        station.abonner(self.__enregistrer)
+
+    def __enter__(self) -> 'Journal':
+        """Retourne le journal, pour un bloc `with`."""
+        return self
+
+    def __exit__(self, *exception) -> None:
+        """Ferme le journal à la sortie du bloc `with`."""
+        self.fermer()
+
+    @staticmethod
+    def chemin_controle(chemin: str) -> str:
+        """Retourne le chemin du point de contrôle d'un journal."""
+        return chemin + '.controle'
+
+    def __enregistrer(self, evenement: Evenement):
+        """Retient l'état de la clé d'une opération et synchronise si besoin.
+
+        La station qui notifie détient le verrou de la clé : son état est
+        lu sans risque.
+
+        """
+        nom = evenement.nom_carburant
+        enregistrement = self.encoder(nom, *self.station._etat(nom))
+        with self.__verrou:
+            self.__en_attente[nom] = enregistrement
+            if self.__suivis is not None:
+                self.__suivis[nom] = enregistrement
+            self.__operations += 1
+            if self.__operations >= self.__taille_groupe or (
+                    self.__delai_maximal is not None and
+                    time.monotonic() - self.__derniere_synchronisation >=
+                    self.__delai_maximal):
+                self.__synchroniser()
+
+    def synchroniser(self) -> None:
+        """Écrit les opérations en attente et les synchronise sur disque."""
+        with self.__verrou:
+            self.__synchroniser()
+
+    def __synchroniser(self):
+        """Écrit les opérations en attente, le verrou étant pris."""
+        if self.__en_attente:
+            self.__fichier.write(b''.join(self.__en_attente.values()))
+            self.__fichier.flush()
+            os.fsync(self.__fichier.fileno())
+            self.__en_attente.clear()
+        self.__operations = 0
+        self.__derniere_synchronisation = time.monotonic()
+
+    def point_de_controle(self) -> None:
+        """Écrit l'état complet de la station, puis vide le journal.
+
+        Le point de contrôle est écrit dans un fichier temporaire, puis
+        renommé, et le répertoire synchronisé : une panne laisse l'ancien
+        ou le nouveau point de contrôle intact. Si elle survient avant que
+        le journal soit vidé, la reprise rejoue des enregistrements déjà
+        inclus, sans changer le résultat.
+
+        L'état de chaque clé est lu sous son verrou, avant de prendre celui
+        du journal, qu'un abonné attend en détenant le verrou de sa clé.
+        Les opérations survenues pendant cette lecture sont réécrites dans
+        le journal vidé.
+
+        """
+        with self.__verrou:
+            self.__synchroniser()
+            self.__suivis = {}
+
+        # États lus sous le verrou de chaque clé
+        etats = []
+        for nom in list(self.station.pompes):
+            try:
+                etats.append(
+                    self.encoder(nom, *self.station._etat_verrouille(nom)))
+            except KeyError:
+                # Pompe retirée entre-temps
+                pass
+
+        with self.__verrou:
+            self.__synchroniser()
+            suivis, self.__suivis = self.__suivis, None
+
+            # Écriture atomique du point de contrôle
+            controle = self.chemin_controle(self.chemin)
+            with open(controle + '.tmp', 'wb') as fichier:
+                fichier.write(b''.join(etats))
+                fichier.flush()
+                os.fsync(fichier.fileno())
+            os.replace(controle + '.tmp', controle)
+            repertoire = os.open(
+                os.path.dirname(os.path.abspath(controle)), os.O_RDONLY)
+            try:
+                os.fsync(repertoire)
+            finally:
+                os.close(repertoire)
+
+            # Le journal repart des opérations survenues pendant la lecture
+            self.__fichier.truncate(0)
+            self.__fichier.write(b''.join(suivis.values()))
+            self.__fichier.flush()
+            os.fsync(self.__fichier.fileno())
+
+    def fermer(self) -> None:
+        """Synchronise le journal, se désabonne et ferme le fichier."""
+        if self.__fichier.closed:
+            return
+        self.synchroniser()
+        self.station.desabonner(self.__enregistrer)
+        self.__fichier.close()
+
+    @staticmethod
+    def encoder(
+            nom_carburant: str, volumes: tuple[int, ...],
+            prix: float) -> bytes:
+        """Encode l'état d'une clé en un enregistrement.
+
+        Parameters
+        ----------
+        nom_carburant : str
+            Le nom du carburant.
+        volumes : tuple[int, ...]
+            Les volumes disponibles de la pompe.
+        prix : float
+            Le prix du carburant, None si la pompe est vide.
+
+        Returns
+        -------
+        bytes
+            L'enregistrement, précédé de sa somme de contrôle.
+
+        """
+        cle = nom_carburant.encode('utf-8')
+        corps = struct.pack(
+            f'<HH{len(cle)}s{len(volumes)}qd', len(cle), len(volumes), cle,
+            *volumes, math.nan if prix is None else prix)
+        return struct.pack('<I', zlib.crc32(corps)) + corps
+
+    @staticmethod
+    def decoder(donnees: bytes):
+        """Décode les enregistrements d'un journal ou point de contrôle.
+
+        Parameters
+        ----------
+        donnees : bytes
+            Le contenu du fichier.
+
+        Yields
+        ------
+        tuple[str, tuple[int, ...], float]
+            Le nom du carburant, les volumes et le prix de chaque
+            enregistrement complet et intact, dans l'ordre.
+
+        """
+        position = 0
+        while position + _ENTETE.size <= len(donnees):
+            somme, taille_cle, nombre = _ENTETE.unpack_from(donnees, position)
+            taille = 4 + taille_cle + 8 * nombre + 8
+            fin = position + _ENTETE.size + taille - 4
+            if fin > len(donnees) or \
+                    zlib.crc32(donnees[position + 4:fin]) != somme:
+                return
+            debut = position + _ENTETE.size
+            cle = donnees[debut:debut + taille_cle].decode('utf-8')
+            *volumes, prix = struct.unpack_from(
+                f'<{nombre}qd', donnees, debut + taille_cle)
+            yield cle, tuple(volumes), None if math.isnan(prix) else prix
+            position = fin
+
+    @classmethod
+    def recuperer(cls, chemin: str, station: Station) -> int:
+        """Restaure une station depuis un point de contrôle et un journal.
+
+        Parameters
+        ----------
+        chemin : str
+            Le chemin du journal.
+        station : Station
+            La station à restaurer, de même structure que celle journalisée.
+
+        Returns
+        -------
+        int
+            Le nombre d'enregistrements du journal appliqués après le point
+            de contrôle.
+
+        """
+        # État du dernier point de contrôle
+        controle = cls.chemin_controle(chemin)
+        if os.path.exists(controle):
+            with open(controle, 'rb') as fichier:
+                for etat in cls.decoder(fichier.read()):
+                    station._restaurer_etat(*etat)
+
+        # Opérations ultérieures, dans l'ordre
+        appliques = 0
+        if os.path.exists(chemin):
+            with open(chemin, 'rb') as fichier:
+                for etat in cls.decoder(fichier.read()):
+                    station._restaurer_etat(*etat)
+                    appliques += 1
+        return appliques
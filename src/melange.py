@@ -0,0 +1,183 @@
+import numpy as np
+
+from carburant import Carburant
+from composition import CompositionCompacte
+from pompe import Pompe
+
+
+def melanger(
+        carburant: Carburant, volume: int, carburant_ajoute: Carburant,
+        volume_ajoute: int, nom: str = None) -> Carburant:
+    """Calcule le carburant obtenu en mélangeant deux carburants.
+
+    Parameters
+    ----------
+    carburant : Carburant
+        Le carburant déjà présent dans la cuve.
+    volume : int
+        Le volume présent dans la cuve, éventuellement nul.
+    carburant_ajoute : Carburant
+        Le carburant ajouté.
+    volume_ajoute : int
+        Le volume ajouté.
+    nom : str
+        Le nom du mélange. Par défaut, celui du carburant de la cuve.
+
+    Returns
+    -------
+    Carburant
+        Le mélange, dont chaque proportion est la moyenne des proportions
+        des deux carburants pondérée par les volumes.
+
+    Examples
+    --------
+    >>> from substance_chimique import SubstanceChimique
+    >>> ethanol = SubstanceChimique(
+    ...     nom='éthanol', numero_cas='64-17-5', numero_ce='200-578-6')
+    >>> essence = SubstanceChimique(
+    ...     nom='essence', numero_cas='86290-81-5', numero_ce='289-220-8')
+    >>> e85 = Carburant('E85', {ethanol: 0.85, essence: 0.15})
+    >>> sp = Carburant('SP', {essence: 1.0})
+    >>> melange = melanger(e85, 100, sp, 100)
+    >>> melange.nom, round(melange.composition_compacte.proportion(ethanol), 3)
+    ('E85', 0.425)
+
+    """
+    return melanger_lot(
+        [carburant], [volume], [carburant_ajoute], [volume_ajoute],
+        None if nom is None else [nom])[0]
+
+
+def melanger_lot(
+        carburants: list[Carburant], volumes,
+        carburants_ajoutes: list[Carburant], volumes_ajoutes,
+        noms: list[str] = None) -> list[Carburant]:
+    """Calcule plusieurs mélanges en un seul calcul vectorisé.
+
+    Parameters
+    ----------
+    carburants : list[Carburant]
+        Les carburants déjà présents dans les cuves.
+    volumes : Sequence[int] ou np.ndarray
+        Les volumes présents dans les cuves, éventuellement nuls.
+    carburants_ajoutes : list[Carburant]
+        Les carburants ajoutés.
+    volumes_ajoutes : Sequence[int] ou np.ndarray
+        Les volumes ajoutés, éventuellement nuls.
+    noms : list[str]
+        Les noms des mélanges. Par défaut, ceux des carburants des cuves.
+
+    Returns
+    -------
+    list[Carburant]
+        Les mélanges, dans l'ordre des arguments.
+
+    """
+    # Vérification des arguments
+    volumes = np.asarray(volumes, dtype=np.float64).reshape(-1)
+    volumes_ajoutes = np.asarray(volumes_ajoutes, dtype=np.float64).reshape(-1)
+    n = len(carburants)
+    if noms is None:
+        noms = [carburant.nom for carburant in carburants]
+    if not len(carburants_ajoutes) == len(volumes) == \
+            len(volumes_ajoutes) == len(noms) == n:
+        raise ValueError("Les arguments doivent avoir la même longueur.")
+    if not all(isinstance(c, Carburant)
+               for c in (*carburants, *carburants_ajoutes)):
+        raise TypeError("Les carburants doivent être de type 'Carburant'.")
+    if np.any(volumes < 0) or np.any(volumes_ajoutes < 0):
+        raise ValueError("Les volumes doivent être >= 0.")
+    totaux = volumes + volumes_ajoutes
+    if np.any(totaux == 0):
+        raise ValueError("Le volume du mélange doit être > 0.")
+    if n == 0:
+        return []
+
+    # Vecteurs creux des deux carburants de chaque mélange, à la suite
+    compositions = [c.composition_compacte for c in carburants] + \
+        [c.composition_compacte for c in carburants_ajoutes]
+    poids = np.concatenate([volumes, volumes_ajoutes]) / np.tile(totaux, 2)
+    tailles = np.fromiter(
+        (len(c) for c in compositions), dtype=np.intp,
+        count=len(compositions))
+    cles = np.concatenate([c.cles for c in compositions])
+    valeurs = np.concatenate([c.proportions for c in compositions]) * \
+        np.repeat(poids, tailles)
+    melanges = np.repeat(np.tile(np.arange(n), 2), tailles)
+
+    # Somme des contributions de chaque substance à chaque mélange
+    ordre = np.lexsort((cles, melanges))
+    cles, valeurs, melanges = cles[ordre], valeurs[ordre], melanges[ordre]
+    debuts = np.flatnonzero(np.concatenate([
+        [True], (cles[1:] != cles[:-1]) | (melanges[1:] != melanges[:-1])]))
+    cles, melanges = cles[debuts], melanges[debuts]
+    valeurs = np.add.reduceat(valeurs, debuts)
+
+    # Les substances absentes (volume nul) sont retirées, puis chaque
+    # mélange est renormalisé pour absorber les erreurs d'arrondi
+    presentes = valeurs > 0
+    cles, valeurs, melanges = \
+        cles[presentes], valeurs[presentes], melanges[presentes]
+    bornes = np.searchsorted(melanges, np.arange(n + 1))
+    sommes = np.add.reduceat(valeurs, bornes[:-1])
+    valeurs = valeurs / np.repeat(sommes, np.diff(bornes))
+
+    # Construction des carburants
+    substances = {}
+    for composition in compositions:
+        substances.update(zip(composition.cles.tolist(),
+                              composition.substances))
+    resultat = []
+    for i, nom in enumerate(noms):
+        debut, fin = bornes[i], bornes[i + 1]
+        composition = CompositionCompacte._depuis_tableaux(
+            cles[debut:fin], valeurs[debut:fin],
+            tuple(substances[cle] for cle in cles[debut:fin].tolist()))
+        resultat.append(Carburant._depuis_compacte(nom, composition))
+    return resultat
+
+
+def remplir_avec_melange(
+        pompes: list[Pompe], carburants: list[Carburant],
+        volumes) -> list[int]:
+    """Livre plusieurs pompes avec des carburants éventuellement différents.
+
+    Chaque pompe est remplie comme par `Pompe._remplir` (le volume est
+    limité par la place disponible) et son carburant est remplacé par le
+    mélange du contenu de la cuve et du volume réellement ajouté. Tous les
+    mélanges sont calculés en un seul appel à `melanger_lot`.
+
+    Parameters
+    ----------
+    pompes : list[Pompe]
+        Les pompes à remplir.
+    carburants : list[Carburant]
+        Les carburants livrés.
+    volumes : Sequence[int]
+        Les volumes livrés, > 0.
+
+    Returns
+    -------
+    list[int]
+        Les volumes réellement ajoutés.
+
+    """
+    # Vérification des volumes, comme Pompe._remplir
+    volumes = [int(volume) for volume in volumes]
+    if not all(volume > 0 for volume in volumes):
+        raise ValueError("Le volume doit être > 0.")
+
+    # Volumes réellement ajoutés
+    presents = [pompe.volume_disponible for pompe in pompes]
+    ajoutes = [
+        min(volume, pompe.volume_maximal - present)
+        for pompe, volume, present in zip(pompes, volumes, presents)]
+
+    # Calcul des mélanges, puis remplissage
+    melanges = melanger_lot(
+        [pompe.carburant for pompe in pompes], presents, carburants, ajoutes)
+    for pompe, melange, volume in zip(pompes, melanges, ajoutes):
+        if volume > 0:
+            pompe._remplir(volume)
+            pompe.carburant = melange
+    return ajoutes
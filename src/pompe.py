@@ -1,4 +1,5 @@
 from carburant import Carburant
+from statut import Statut
 
 
 class Pompe:
@@ -26,6 +27,7 @@ class Pompe:
     >>> pompe._vide()
     False
     >>> pompe._remplir(5)
+    5
     >>> pompe._servir(3)
     3
     >>> pompe._servir(9)
@@ -72,6 +74,74 @@ class Pompe:
         self.__volume_maximal = volume_maximal
         self.__volume_disponible = volume_disponible
 
+    @classmethod
+    def _creer(
+            cls, carburant: Carburant, volume_maximal: int,
+            volume_disponible: int) -> 'Pompe':
+        """Crée une pompe sans vérifier les arguments.
+
+        Réservé aux données déjà validées, par exemple un instantané de
+        confiance.
+
+        Parameters
+        ----------
+        carburant : Carburant
+            Le carburant de la pompe.
+        volume_maximal : int
+            Le volume maximal de la pompe.
+        volume_disponible : int
+            Le volume disponible de la pompe.
+
+        Returns
+        -------
+        Pompe
+            La pompe.
+
+        """
+        pompe = cls.__new__(cls)
+        pompe.carburant = carburant
+        pompe.__volume_maximal = volume_maximal
+        pompe.__volume_disponible = volume_disponible
+        return pompe
+
+    @property
+    def volume_maximal(self) -> int:
+        """Le volume maximal de la pompe."""
+        return self.__volume_maximal
+
+    @property
+    def volume_disponible(self) -> int:
+        """Le volume disponible de la pompe."""
+        return self.__volume_disponible
+
+    def _volumes(self) -> tuple[int]:
+        """Retourne le volume disponible, sous la forme de `_fixer_volumes`.
+
+        Returns
+        -------
+        tuple[int]
+            Le volume disponible de la pompe.
+
+        """
+        return (self.__volume_disponible,)
+
+    def _fixer_volumes(self, volumes: tuple[int]) -> None:
+        """Remplace le volume disponible, pour restaurer un état sauvegardé.
+
+        Parameters
+        ----------
+        volumes : tuple[int]
+            Le volume disponible de la pompe, tel que retourné par
+            `_volumes`.
+
+        """
+        volume, = volumes
+        if not 0 <= volume <= self.__volume_maximal:
+            raise ValueError(
+                "Le volume disponible doit être entre 0 et le volume maximal."
+            )
+        self.__volume_disponible = int(volume)
+
     def _vide(self) -> bool:
         """Indique si la pompe est vide.
 
@@ -106,6 +176,7 @@ class Pompe:
 
         # Remplissage de la pompe
         self.__volume_disponible += volume
+        return volume
 
     def _servir(self, volume: int) -> int:
         """Sert du carburant.
@@ -120,14 +191,35 @@ class Pompe:
         int
             Le volume servi.
 
+        """
+        statut, volume_servi = self._essayer_servir(volume)
+        if statut is Statut.VOLUME_INVALIDE:
+            raise ValueError("Le volume doit être > 0.")
+        return volume_servi
+
+    def _essayer_servir(self, volume: int) -> tuple[Statut, int]:
+        """Sert du carburant, sans lever d'exception en cas de refus.
+
+        Parameters
+        ----------
+        volume : int
+            Le volume à servir.
+
+        Returns
+        -------
+        tuple[Statut, int]
+            Le statut de la demande et le volume servi, nul en cas de refus.
+
         """
         # Vérification du volume
         if not volume > 0:
-            raise ValueError("Le volume doit être > 0.")
+            return Statut.VOLUME_INVALIDE, 0
+        if self.__volume_disponible == 0:
+            return Statut.POMPE_VIDE, 0
 
         # Calcul du volume servi
         volume_servi = min(volume, self.__volume_disponible)
 
         # Service du carburant
         self.__volume_disponible -= volume_servi
-        return volume_servi
+        return Statut.SERVI, volume_servi
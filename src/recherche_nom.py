@@ -0,0 +1,178 @@
+import unicodedata
+from array import array
+
+import numpy as np
+
+from substance_chimique import SubstanceChimique
+
+
+def normaliser_nom(nom: str) -> str:
+    """Normalise un nom pour la recherche.
+
+    Les accents sont retirés, la casse est ignorée et les espaces
+    consécutifs sont réduits à un seul.
+
+    Parameters
+    ----------
+    nom : str
+        Le nom à normaliser.
+
+    Returns
+    -------
+    str
+        Le nom normalisé.
+
+    Examples
+    --------
+    >>> normaliser_nom('  Éthanol  Absolu')
+    'ethanol absolu'
+
+    """
+    decompose = unicodedata.normalize('NFKD', nom)
+    sans_accents = ''.join(
+        caractere for caractere in decompose
+        if not unicodedata.combining(caractere))
+    return ' '.join(sans_accents.casefold().split())
+
+
+def trigrammes(nom: str) -> set[str]:
+    """Retourne les trigrammes d'un nom normalisé.
+
+    Le nom est encadré d'espaces pour que les débuts et fins de mots
+    produisent leurs propres trigrammes.
+
+    Parameters
+    ----------
+    nom : str
+        Le nom, tel que renvoyé par `normaliser_nom`.
+
+    Returns
+    -------
+    set[str]
+        Les trigrammes distincts du nom.
+
+    Examples
+    --------
+    >>> sorted(trigrammes('gpl'))
+    ['  g', ' gp', 'gpl', 'pl ']
+
+    """
+    encadre = f"  {nom} "
+    return {encadre[i:i + 3] for i in range(len(encadre) - 2)}
+
+
+class IndexTrigrammes:
+    """Index de recherche approchée des substances par leur nom.
+
+    Chaque trigramme du nom normalisé pointe vers la liste des substances
+    qui le contiennent. Une recherche compte les trigrammes communs avec
+    chaque candidat et classe les candidats selon le coefficient de Dice,
+    2 * communs / (trigrammes de la requête + trigrammes du candidat).
+
+    Examples
+    --------
+    >>> index = IndexTrigrammes()
+    >>> index.ajouter(SubstanceChimique(
+    ...     nom='éthanol', numero_cas='64-17-5', numero_ce='200-578-6'))
+    >>> index.ajouter(SubstanceChimique(
+    ...     nom='méthanol', numero_cas='67-56-1', numero_ce='200-659-6'))
+    >>> [s.nom for s, _ in index.rechercher('etanol')]
+    ['éthanol', 'méthanol']
+
+    """
+
+    def __init__(self) -> None:
+        """Initialise un index vide."""
+        self.__substances: list[SubstanceChimique] = []
+        self.__identifiants: dict[SubstanceChimique, int] = {}
+        self.__tailles = array('I')
+        self.__listes: dict[str, array] = {}
+
+    def __len__(self) -> int:
+        """Retourne le nombre de substances indexées."""
+        return len(self.__substances)
+
+    def ajouter(self, substance: SubstanceChimique) -> None:
+        """Ajoute une substance à l'index.
+
+        Une substance déjà indexée est ignorée.
+
+        Parameters
+        ----------
+        substance : SubstanceChimique
+            La substance à indexer.
+
+        """
+        # Vérification du type de l'argument
+        if not isinstance(substance, SubstanceChimique):
+            raise TypeError(
+                "La substance doit être de type 'SubstanceChimique'.")
+        if substance in self.__identifiants:
+            return
+
+        # Enregistrement de la substance
+        identifiant = len(self.__substances)
+        self.__substances.append(substance)
+        self.__identifiants[substance] = identifiant
+
+        # Ajout de la substance aux listes de ses trigrammes
+        grammes = trigrammes(normaliser_nom(substance.nom))
+        self.__tailles.append(len(grammes))
+        for gramme in grammes:
+            liste = self.__listes.get(gramme)
+            if liste is None:
+                liste = self.__listes[gramme] = array('I')
+            liste.append(identifiant)
+
+    def rechercher(
+            self, requete: str,
+            k: int = 10) -> list[tuple[SubstanceChimique, float]]:
+        """Recherche les substances dont le nom ressemble à la requête.
+
+        Parameters
+        ----------
+        requete : str
+            Le nom, éventuellement partiel, accentué ou mal orthographié.
+        k : int
+            Le nombre maximal de résultats.
+
+        Returns
+        -------
+        list[tuple[SubstanceChimique, float]]
+            Les k meilleures substances et leur score entre 0 et 1, par
+            score décroissant.
+
+        """
+        # Vérification des arguments
+        if not isinstance(requete, str):
+            raise TypeError("La requête doit être de type 'str'.")
+        if not isinstance(k, int):
+            raise TypeError("Le nombre de résultats doit être de type 'int'.")
+        if not k > 0:
+            raise ValueError("Le nombre de résultats doit être > 0.")
+
+        # Identifiants des substances partageant au moins un trigramme
+        grammes = trigrammes(normaliser_nom(requete))
+        listes = [
+            np.frombuffer(self.__listes[gramme], dtype=np.uint32)
+            for gramme in grammes if gramme in self.__listes]
+        if not listes:
+            return []
+        identifiants, communs = np.unique(
+            np.concatenate(listes), return_counts=True)
+
+        # Coefficient de Dice de chaque candidat
+        tailles = np.frombuffer(self.__tailles, dtype=np.uint32)
+        scores = 2 * communs / (len(grammes) + tailles[identifiants])
+
+        # Sélection des k meilleurs, puis tri par score décroissant
+        if len(scores) > k:
+            meilleurs = np.argpartition(-scores, k - 1)[:k]
+        else:
+            meilleurs = np.arange(len(scores))
+        meilleurs = meilleurs[np.lexsort(
+            (identifiants[meilleurs], -scores[meilleurs]))]
+        return [
+            (self.__substances[identifiant], score)
+            for identifiant, score in zip(
+                identifiants[meilleurs].tolist(), scores[meilleurs].tolist())]
@@ -0,0 +1,207 @@
+from substance_chimique import SubstanceChimique
+
+
+class RegistreSubstances:
+    """Registre des substances chimiques, une instance par substance.
+
+    Le registre interne les substances : deux demandes pour la même
+    substance renvoient le même objet. Il les indexe par numéro CAS,
+    numéro CE et nom, et refuse les substances en conflit avec une entrée
+    existante (un attribut commun sans que les trois le soient).
+
+    Examples
+    --------
+    >>> registre = RegistreSubstances()
+    >>> octane = registre.obtenir(
+    ...     nom='octane', numero_cas='111-65-9', numero_ce='203-892-1')
+    >>> octane is registre.obtenir(
+    ...     nom='octane', numero_cas='111-65-9', numero_ce='203-892-1')
+    True
+    >>> registre.par_ce('203-892-1') is octane
+    True
+    >>> len(registre)
+    1
+
+    """
+
+    def __init__(self) -> None:
+        """Initialise un registre vide."""
+        self.__par_cas: dict[str, SubstanceChimique] = {}
+        self.__par_ce: dict[str, SubstanceChimique] = {}
+        self.__par_nom: dict[str, SubstanceChimique] = {}
+
+    def __len__(self) -> int:
+        """Retourne le nombre de substances du registre."""
+        return len(self.__par_cas)
+
+    def __iter__(self):
+        """Itère sur les substances du registre."""
+        return iter(self.__par_cas.values())
+
+    def __contains__(self, substance: SubstanceChimique) -> bool:
+        """Indique si une substance est présente dans le registre.
+
+        Parameters
+        ----------
+        substance : SubstanceChimique
+            La substance à rechercher.
+
+        Returns
+        -------
+        bool
+            True si une substance identique est enregistrée, False sinon.
+
+        """
+        if not isinstance(substance, SubstanceChimique):
+            return False
+        existante = self.__par_cas.get(substance.numero_cas)
+        return existante is not None and \
+            existante.nom == substance.nom and \
+            existante.numero_ce == substance.numero_ce
+
+    def __rechercher(
+            self, nom: str, numero_cas: str,
+            numero_ce: str) -> SubstanceChimique:
+        """Recherche une substance et vérifie l'absence de conflit.
+
+        Parameters
+        ----------
+        nom : str
+            Le nom de la substance chimique.
+        numero_cas : str
+            Le numéro CAS de la substance chimique.
+        numero_ce : str
+            Le numéro CE de la substance chimique.
+
+        Returns
+        -------
+        SubstanceChimique
+            La substance enregistrée, ou None si elle est inconnue.
+
+        """
+        par_cas = self.__par_cas.get(numero_cas)
+        par_ce = self.__par_ce.get(numero_ce)
+        par_nom = self.__par_nom.get(nom)
+
+        # Les trois index désignent la même substance : elle est connue
+        if par_cas is not None and par_cas is par_ce and par_ce is par_nom:
+            return par_cas
+
+        # Aucun index ne la connaît : elle est nouvelle
+        if par_cas is None and par_ce is None and par_nom is None:
+            return None
+
+        # Sinon, au moins un attribut est partagé avec une autre substance
+        existante = par_cas or par_ce or par_nom
+        raise ValueError(
+            f"La substance {nom!r} est en conflit avec {existante!r}.")
+
+    def ajouter(self, substance: SubstanceChimique) -> SubstanceChimique:
+        """Ajoute une substance au registre.
+
+        Parameters
+        ----------
+        substance : SubstanceChimique
+            La substance à ajouter.
+
+        Returns
+        -------
+        SubstanceChimique
+            L'instance enregistrée, qui est celle à utiliser.
+
+        """
+        # Vérification du type de l'argument
+        if not isinstance(substance, SubstanceChimique):
+            raise TypeError(
+                "La substance doit être de type 'SubstanceChimique'.")
+
+        # La substance est-elle déjà connue ?
+        existante = self.__rechercher(
+            substance.nom, substance.numero_cas, substance.numero_ce)
+        if existante is not None:
+            return existante
+
+        # Indexation de la nouvelle substance
+        self.__par_cas[substance.numero_cas] = substance
+        self.__par_ce[substance.numero_ce] = substance
+        self.__par_nom[substance.nom] = substance
+        return substance
+
+    def obtenir(
+            self, nom: str, numero_cas: str,
+            numero_ce: str) -> SubstanceChimique:
+        """Retourne la substance enregistrée, en la créant si besoin.
+
+        Parameters
+        ----------
+        nom : str
+            Le nom de la substance chimique.
+        numero_cas : str
+            Le numéro CAS de la substance chimique.
+        numero_ce : str
+            Le numéro CE de la substance chimique.
+
+        Returns
+        -------
+        SubstanceChimique
+            L'unique instance de cette substance dans le registre.
+
+        """
+        existante = self.__rechercher(nom, numero_cas, numero_ce)
+        if existante is not None:
+            return existante
+        return self.ajouter(SubstanceChimique(nom, numero_cas, numero_ce))
+
+    def par_cas(self, numero_cas: str) -> SubstanceChimique:
+        """Retourne la substance d'un numéro CAS donné.
+
+        Parameters
+        ----------
+        numero_cas : str
+            Le numéro CAS recherché.
+
+        Returns
+        -------
+        SubstanceChimique
+            La substance correspondante.
+
+        """
+        if numero_cas not in self.__par_cas:
+            raise KeyError(f"Aucune substance de numéro CAS {numero_cas}.")
+        return self.__par_cas[numero_cas]
+
+    def par_ce(self, numero_ce: str) -> SubstanceChimique:
+        """Retourne la substance d'un numéro CE donné.
+
+        Parameters
+        ----------
+        numero_ce : str
+            Le numéro CE recherché.
+
+        Returns
+        -------
+        SubstanceChimique
+            La substance correspondante.
+
+        """
+        if numero_ce not in self.__par_ce:
+            raise KeyError(f"Aucune substance de numéro CE {numero_ce}.")
+        return self.__par_ce[numero_ce]
+
+    def par_nom(self, nom: str) -> SubstanceChimique:
+        """Retourne la substance d'un nom donné.
+
+        Parameters
+        ----------
+        nom : str
+            Le nom recherché.
+
+        Returns
+        -------
+        SubstanceChimique
+            La substance correspondante.
+
+        """
+        if nom not in self.__par_nom:
+            raise KeyError(f"Aucune substance nommée {nom!r}.")
+        return self.__par_nom[nom]
@@ -0,0 +1,248 @@
+import os
+import re
+import struct
+import threading
+
+from evenement import Evenement
+from instantane import ecrire_instantane, lire_instantane
+from journal import Journal
+from station import Station
+
+# En-tête d'un bloc de différences : indice de la station et taille du bloc
+_BLOC = struct.Struct('<IQ')
+
+# Noms des fichiers : instantané de base et différences, par génération
+_FICHIER = re.compile(r'base-(\d{6})\.bin|delta-(\d{6})-(\d{6})\.bin')
+
+
+class SauvegardeIncrementale:
+    """Sauvegarde d'un parc de stations par différences successives.
+
+    Le parc est d'abord écrit dans un instantané de base complet. Ensuite,
+    chaque point de contrôle n'écrit que les clés modifiées depuis le
+    précédent : la sauvegarde s'abonne aux stations et retient les clés
+    servies, remplies ou dont le prix a changé. Après `compacter_apres`
+    points de contrôle, un nouvel instantané de base remplace la base et
+    ses différences, si bien que la restauration applique au plus
+    `compacter_apres` fichiers de différences.
+
+    Chaque base ouvre une nouvelle génération : les fichiers d'une
+    génération ne sont supprimés qu'une fois la suivante écrite, et la
+    restauration utilise la génération la plus récente.
+
+    Examples
+    --------
+    >>> import tempfile
+    >>> from carburant import Carburant
+    >>> from pompe import Pompe
+    >>> from substance_chimique import SubstanceChimique
+    >>> octane = SubstanceChimique(
+    ...     nom='octane', numero_cas='111-65-9', numero_ce='203-892-1')
+    >>> sp98 = Carburant(nom='SP98', composition_chimique={octane: 1.0})
+    >>> station = Station(
+    ...     pompes={'SP98': Pompe(sp98, 10, 8)}, prix={'SP98': 1.9})
+    >>> repertoire = tempfile.mkdtemp()
+    >>> sauvegarde = SauvegardeIncrementale(repertoire, [station])
+    >>> station.servir('SP98', 3)
+    >>> sauvegarde.point_de_controle()
+    1
+    >>> copie, = SauvegardeIncrementale.restaurer(repertoire)
+    >>> copie._etat('SP98')
+    ((5,), 1.9)
+
+    """
+
+    def __init__(
+            self, repertoire: str, stations: list[Station],
+            compacter_apres: int = 16) -> None:
+        """Écrit l'instantané de base et s'abonne aux stations.
+
+        Parameters
+        ----------
+        repertoire : str
+            Le répertoire des fichiers de sauvegarde, créé au besoin.
+        stations : list[Station]
+            Les stations à sauvegarder.
+        compacter_apres : int
+            Le nombre de points de contrôle avant un nouvel instantané de
+            base.
+
+        """
+        # Vérification des arguments
+        if not isinstance(compacter_apres, int):
+            raise TypeError(
+                "Le nombre de points de contrôle doit être de type 'int'.")
+        if not compacter_apres > 0:
+            raise ValueError("Le nombre de points de contrôle doit être > 0.")
+
+        # Assignation des attributs
+        self.repertoire = repertoire
+        self.stations = list(stations)
+        self.__compacter_apres = compacter_apres
+        self.__sales: dict[tuple[int, str], None] = {}
+        self.__verrou = threading.Lock()
+        os.makedirs(repertoire, exist_ok=True)
+
+        # Génération suivant la plus récente du répertoire
+        generations = [g for g, _ in self.__fichiers(repertoire)]
+        self.__generation = max(generations, default=-1)
+        self.compacter()
+
+        # Une fonction par station, qui connaît son indice
+        self.__observateurs = [
+            self.__observateur(indice) for indice in range(len(stations))]
+        for station, observateur in zip(self.stations, self.__observateurs):
+            station.abonner(observateur)
+
+    def __observateur(self, indice: int):
+        """Retourne la fonction qui marque les clés modifiées."""
+        def marquer(evenement: Evenement):
+            with self.__verrou:
+                self.__sales[indice, evenement.nom_carburant] = None
+        return marquer
+
+    @staticmethod
+    def __fichiers(repertoire: str) -> list[tuple[int, int]]:
+        """Retourne (génération, numéro) des fichiers, -1 pour une base."""
+        fichiers = []
+        for nom in os.listdir(repertoire):
+            correspondance = _FICHIER.fullmatch(nom)
+            if correspondance:
+                base, generation, numero = correspondance.groups()
+                if base is not None:
+                    fichiers.append((int(base), -1))
+                else:
+                    fichiers.append((int(generation), int(numero)))
+        return sorted(fichiers)
+
+    def __chemin(self, generation: int, numero: int) -> str:
+        """Retourne le chemin d'une base (numéro -1) ou de différences."""
+        if numero < 0:
+            nom = f'base-{generation:06d}.bin'
+        else:
+            nom = f'delta-{generation:06d}-{numero:06d}.bin'
+        return os.path.join(self.repertoire, nom)
+
+    @staticmethod
+    def __publier(chemin: str):
+        """Synchronise `chemin` + '.tmp', puis le renomme en `chemin`.
+
+        Le répertoire est synchronisé à son tour, pour que le renommage
+        survive à une panne.
+
+        """
+        with open(chemin + '.tmp', 'rb') as fichier:
+            os.fsync(fichier.fileno())
+        os.replace(chemin + '.tmp', chemin)
+        repertoire = os.open(os.path.dirname(chemin) or '.', os.O_RDONLY)
+        try:
+            os.fsync(repertoire)
+        finally:
+            os.close(repertoire)
+
+    def point_de_controle(self) -> int:
+        """Écrit les clés modifiées depuis le dernier point de contrôle.
+
+        Le point de contrôle qui atteint `compacter_apres` écrit
+        directement un nouvel instantané de base, qui inclut les clés
+        modifiées, plutôt que des différences aussitôt supprimées.
+
+        Returns
+        -------
+        int
+            Le nombre de clés modifiées écrites.
+
+        """
+        if self.__numero + 2 >= self.__compacter_apres:
+            with self.__verrou:
+                nombre = len(self.__sales)
+            self.compacter()
+            return nombre
+
+        with self.__verrou:
+            sales, self.__sales = self.__sales, {}
+
+        # Un bloc d'enregistrements par station, lus sous le verrou des clés
+        blocs = {}
+        for indice, nom in sales:
+            station = self.stations[indice]
+            try:
+                etat = station._etat_verrouille(nom)
+            except KeyError:
+                # Pompe retirée depuis la modification
+                continue
+            blocs.setdefault(indice, []).append(Journal.encoder(nom, *etat))
+        donnees = b''.join(
+            _BLOC.pack(indice, sum(map(len, enregistrements))) +
+            b''.join(enregistrements)
+            for indice, enregistrements in blocs.items())
+
+        self.__numero += 1
+        chemin = self.__chemin(self.__generation, self.__numero)
+        with open(chemin + '.tmp', 'wb') as fichier:
+            fichier.write(donnees)
+        self.__publier(chemin)
+        return sum(map(len, blocs.values()))
+
+    def compacter(self) -> None:
+        """Écrit un nouvel instantané de base et supprime les précédents."""
+        with self.__verrou:
+            self.__sales.clear()
+        self.__generation += 1
+        self.__numero = -1
+        chemin = self.__chemin(self.__generation, -1)
+        ecrire_instantane(chemin, self.stations)
+
+        # Les générations précédentes ne servent plus
+        for generation, numero in self.__fichiers(self.repertoire):
+            if generation < self.__generation:
+                os.remove(self.__chemin(generation, numero))
+
+    def fermer(self) -> None:
+        """Se désabonne des stations."""
+        for station, observateur in zip(self.stations, self.__observateurs):
+            station.desabonner(observateur)
+        self.__observateurs = []
+
+    @classmethod
+    def restaurer(
+            cls, repertoire: str, valider: bool = True) -> list[Station]:
+        """Restaure un parc depuis sa base et ses différences.
+
+        Parameters
+        ----------
+        repertoire : str
+            Le répertoire des fichiers de sauvegarde.
+        valider : bool
+            Vérifier l'instantané de base, voir `lire_instantane`.
+
+        Returns
+        -------
+        list[Station]
+            Les stations, dans l'ordre de la sauvegarde.
+
+        """
+        fichiers = cls.__fichiers(repertoire)
+        if not fichiers:
+            raise FileNotFoundError("Aucune sauvegarde dans ce répertoire.")
+        generation = fichiers[-1][0]
+        chemins = [
+            os.path.join(repertoire, f'delta-{generation:06d}-{n:06d}.bin')
+            for g, n in fichiers if g == generation and n >= 0]
+        stations = lire_instantane(
+            os.path.join(repertoire, f'base-{generation:06d}.bin'),
+            valider=valider)
+
+        # Application des différences, dans l'ordre
+        for chemin in chemins:
+            with open(chemin, 'rb') as fichier:
+                donnees = fichier.read()
+            position = 0
+            while position < len(donnees):
+                indice, taille = _BLOC.unpack_from(donnees, position)
+                position += _BLOC.size
+                for etat in Journal.decoder(
+                        donnees[position:position + taille]):
+                    stations[indice]._restaurer_etat(*etat)
+                position += taille
+        return stations
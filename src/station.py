@@ -1,4 +1,24 @@
+import contextlib
+import functools
+import threading
+import time
+from typing import Callable
+
+import numpy as np
+
+from evenement import Evenement
+from groupe_pompes import GroupePompes
+from historique_station import HistoriqueStation
 from pompe import Pompe
+from statut import Statut
+
+# Messages des exceptions levées par `Station.servir` pour chaque refus
+_MESSAGES = {
+    Statut.CARBURANT_INVALIDE: "Le nom du carburant est invalide.",
+    Statut.POMPE_INVALIDE: "Le carburant ne correspond à aucune pompe.",
+    Statut.POMPE_VIDE: "La pompe est vide.",
+    Statut.VOLUME_INVALIDE: "Le volume doit être > 0.",
+}
 
 
 class Station:
@@ -6,8 +26,9 @@ class Station:
 
     Attributes
     ----------
-    pompes : dict[str, Pompe]
-        Les pompes de la station-service.
+    pompes : dict[str, Pompe | GroupePompes]
+        Les pompes de la station-service. Plusieurs pompes d'un même
+        carburant forment un `GroupePompes`.
     prix : dict[str, float]
         Les prix des carburants.
 
@@ -24,29 +45,49 @@ class Station:
     ...     nom='SP95', composition_chimique={butane: 0.95, propane: 0.05})
     >>> pompe = Pompe(carburant=sp95, volume_maximal=10, volume_disponible=5)
     >>> station = Station(
-    ...     pompes={'sp95': pompe}, prix={'sp95': 2.0})
-    >>> station.servir('sp95', 3)
-    >>> station.prix['sp95']
+    ...     pompes={'SP95': pompe}, prix={'SP95': 2.0})
+    >>> station.servir('SP95', 3)
+    >>> station.prix['SP95']
     2.0
-    >>> station.servir('sp95', 3)
-    >>> station.prix['sp95']
-    >>> station._remplir_pompe('sp95', 5, 3.0)
-    >>> station.prix['sp95']
+    >>> station.servir('SP95', 3)
+    >>> station.prix['SP95']
+    >>> station._remplir_pompe('SP95', 5, 3.0)
+    >>> station.prix['SP95']
     3.0
+    >>> station = Station(
+    ...     pompes={'SP95': [
+    ...         Pompe(carburant=sp95, volume_maximal=10, volume_disponible=5),
+    ...         Pompe(carburant=sp95, volume_maximal=10, volume_disponible=2),
+    ...     ]},
+    ...     prix={'SP95': 2.0})
+    >>> station.servir('SP95', 6)
+    >>> station.pompes['SP95'].volume_disponible
+    1
 
     """
 
+    # Nombre de verrous d'une station concurrente
+    NOMBRE_VERROUS = 64
+
     def __init__(
-            self, pompes: dict[str, Pompe],
-            prix: dict[str, float]) -> None:
+            self, pompes: dict[str, Pompe | list[Pompe]],
+            prix: dict[str, float], concurrente: bool = False) -> None:
         """Initialise une station-service.
 
         Parameters
         ----------
-        pompes : dict[str, Pompe]
-            Les pompes de la station-service.
+        pompes : dict[str, Pompe | list[Pompe]]
+            Les pompes de la station-service. Une liste de pompes d'un même
+            carburant devient un `GroupePompes`, servi par la pompe la plus
+            pleine.
         prix : dict[str, float]
-            Les prix des carburants.
+            Les prix des carburants, None pour une pompe vide.
+        concurrente : bool
+            Protéger la station pour un usage depuis plusieurs threads.
+            Chaque clé est associée à l'un des `NOMBRE_VERROUS` verrous :
+            les opérations sur une même clé (pompe et prix) sont
+            exclusives, celles sur des clés de verrous différents restent
+            parallèles.
 
         """
 
@@ -56,19 +97,407 @@ class Station:
         if not isinstance(prix, dict):
             raise TypeError("Les prix doivent être un 'dict'.")
 
-        # Les prix doivent être supérieurs à 0
-        if not all(prix[pompe] > 0 for pompe in prix):
-            raise ValueError("Les prix doivent être > 0.")
-
         # Vérifier que les noms des pompes correspondent aux clés des prix
         if not set(pompes) == set(prix):
             raise ValueError(
                 "Les clés des pompes et des prix doivent être identiques.")
 
+        # Les prix doivent être supérieurs à 0. Un prix manquant n'est admis
+        # que pour une pompe vide, comme après le service qui l'a vidée
+        if not all(self.__grouper(pompes[nom])._vide() if valeur is None
+                   else valeur > 0 for nom, valeur in prix.items()):
+            raise ValueError("Les prix doivent être > 0.")
+
+        self.__initialiser(pompes, prix, concurrente)
+
+    @classmethod
+    def _creer(
+            cls, pompes: dict[str, Pompe | GroupePompes],
+            prix: dict[str, float], concurrente: bool = False) -> 'Station':
+        """Crée une station sans vérifier les arguments.
+
+        Réservé aux données déjà validées, par exemple un instantané de
+        confiance : les prix peuvent y être None pour les pompes vides.
+
+        Parameters
+        ----------
+        pompes : dict[str, Pompe | GroupePompes]
+            Les pompes de la station-service.
+        prix : dict[str, float]
+            Les prix des carburants.
+        concurrente : bool
+            Protéger la station pour un usage depuis plusieurs threads.
+
+        Returns
+        -------
+        Station
+            La station.
+
+        """
+        station = cls.__new__(cls)
+        station.__initialiser(pompes, prix, concurrente)
+        return station
+
+    def __initialiser(
+            self, pompes: dict[str, Pompe | list[Pompe]],
+            prix: dict[str, float], concurrente: bool):
+        """Assigne les attributs, puis crée l'index, les verrous et la
+        liste des abonnés.
+
+        Parameters
+        ----------
+        pompes : dict[str, Pompe | list[Pompe]]
+            Les pompes de la station-service, vérifiées.
+        prix : dict[str, float]
+            Les prix des carburants, vérifiés.
+        concurrente : bool
+            Protéger la station pour un usage depuis plusieurs threads.
+
+        """
         # Assignation des attributs
-        self.pompes = pompes
+        self.pompes = {
+            nom: self.__grouper(pompe) for nom, pompe in pompes.items()}
         self.prix = prix
 
+        # Verrous par groupe de clés, et verrou de l'index des carburants
+        self.__creer_verrous(concurrente)
+
+        # Nombre de pompes par nom de carburant, pour __verifier_pompe
+        self.__pompes_par_carburant: dict[str, int] = {}
+        for pompe in self.pompes.values():
+            self.__indexer_pompe(pompe, 1)
+
+        # Fonctions appelées après chaque opération réussie, dans un tuple
+        # remplacé à chaque abonnement : une notification en cours parcourt
+        # l'ancien tuple, qui ne change pas
+        self.__observateurs: tuple[Callable[[Evenement], None], ...] = ()
+        self.__historique = None
+
+    def __creer_verrous(self, concurrente: bool):
+        """Crée les verrous d'une station concurrente.
+
+        Parameters
+        ----------
+        concurrente : bool
+            True pour créer les verrous, False pour une station sans
+            verrous.
+
+        """
+        if concurrente:
+            self.__verrous = tuple(
+                threading.RLock() for _ in range(self.NOMBRE_VERROUS))
+            self.__verrou_index = threading.Lock()
+            self.__verrou_observateurs = threading.Lock()
+        else:
+            self.__verrous = None
+            self.__verrou_index = contextlib.nullcontext()
+            self.__verrou_observateurs = contextlib.nullcontext()
+
+    @property
+    def concurrente(self) -> bool:
+        """Indique si la station est protégée pour plusieurs threads."""
+        return self.__verrous is not None
+
+    def __getstate__(self) -> dict:
+        """Retourne l'état de la station, sans ses verrous ni abonnés."""
+        etat = self.__dict__.copy()
+        etat['_Station__verrous'] = self.__verrous is not None
+        etat['_Station__observateurs'] = ()
+        etat['_Station__historique'] = None
+        del etat['_Station__verrou_index']
+        del etat['_Station__verrou_observateurs']
+        return etat
+
+    def __setstate__(self, etat: dict):
+        """Restaure l'état de la station et recrée ses verrous."""
+        concurrente = etat.pop('_Station__verrous')
+        self.__dict__.update(etat)
+        self.__creer_verrous(concurrente)
+
+    def __sous_verrou(methode):
+        """Exécute une méthode sous le verrou de sa clé, si besoin.
+
+        Le premier argument de la méthode doit être la clé (le nom du
+        carburant). Sans verrous, la méthode est appelée directement.
+
+        """
+        @functools.wraps(methode)
+        def methode_verrouillee(self, nom_carburant, *args, **kwargs):
+            if self.__verrous is None:
+                return methode(self, nom_carburant, *args, **kwargs)
+            with self.__verrou(nom_carburant):
+                return methode(self, nom_carburant, *args, **kwargs)
+        return methode_verrouillee
+
+    def __verrou(self, nom_carburant: str) -> threading.RLock:
+        """Retourne le verrou d'une clé.
+
+        Parameters
+        ----------
+        nom_carburant : str
+            Le nom du carburant.
+
+        Returns
+        -------
+        threading.RLock
+            Le verrou partagé par les clés de même hachage.
+
+        """
+        return self.__verrous[hash(nom_carburant) % len(self.__verrous)]
+
+    @staticmethod
+    def __grouper(
+            pompe: Pompe | list[Pompe]) -> Pompe | GroupePompes:
+        """Regroupe une liste de pompes en un `GroupePompes`.
+
+        Parameters
+        ----------
+        pompe : Pompe | list[Pompe]
+            Une pompe, ou une liste de pompes d'un même carburant.
+
+        Returns
+        -------
+        Pompe | GroupePompes
+            La pompe, ou le groupe formé par la liste.
+
+        """
+        if isinstance(pompe, (list, tuple)):
+            return GroupePompes(pompe)
+        return pompe
+
+    def __indexer_pompe(self, pompe: Pompe, increment: int):
+        """Met à jour le nombre de pompes d'un carburant.
+
+        Parameters
+        ----------
+        pompe : Pompe
+            La pompe ajoutée ou retirée.
+        increment : int
+            1 pour un ajout, -1 pour un retrait.
+
+        """
+        nom = pompe.carburant.nom
+        with self.__verrou_index:
+            nombre = self.__pompes_par_carburant.get(nom, 0) + increment
+            if nombre:
+                self.__pompes_par_carburant[nom] = nombre
+            else:
+                del self.__pompes_par_carburant[nom]
+
+    def abonner(self, observateur: Callable[[Evenement], None]):
+        """Abonne une fonction aux opérations de la station.
+
+        L'observateur est appelé avec un `Evenement` après chaque service,
+        remplissage ou changement de prix réussi, sous le verrou de la clé
+        pour une station concurrente.
+
+        Parameters
+        ----------
+        observateur : Callable[[Evenement], None]
+            La fonction à appeler.
+
+        """
+        with self.__verrou_observateurs:
+            self.__observateurs = self.__observateurs + (observateur,)
+
+    def desabonner(self, observateur: Callable[[Evenement], None]):
+        """Désabonne une fonction des opérations de la station.
+
+        Parameters
+        ----------
+        observateur : Callable[[Evenement], None]
+            La fonction abonnée.
+
+        """
+        with self.__verrou_observateurs:
+            observateurs = list(self.__observateurs)
+            observateurs.remove(observateur)
+            self.__observateurs = tuple(observateurs)
+
+    def __notifier(
+            self, operation: str, nom_carburant: str, volume: int,
+            prix: float, repartition: tuple[tuple[int, int], ...] = ()):
+        """Transmet une opération réussie aux abonnés."""
+        evenement = Evenement(
+            operation, nom_carburant, volume, prix, time.time(), repartition)
+        for observateur in self.__observateurs:
+            observateur(evenement)
+
+    def _etat(self, nom_carburant: str) -> tuple[tuple[int, ...], float]:
+        """Retourne l'état d'une clé : volumes de sa pompe et prix.
+
+        Parameters
+        ----------
+        nom_carburant : str
+            Le nom du carburant.
+
+        Returns
+        -------
+        tuple[tuple[int, ...], float]
+            Les volumes disponibles de la pompe (un par pompe pour un
+            groupe) et le prix du carburant.
+
+        """
+        return self.pompes[nom_carburant]._volumes(), self.prix[nom_carburant]
+
+    @__sous_verrou
+    def _etat_verrouille(
+            self, nom_carburant: str) -> tuple[tuple[int, ...], float]:
+        """Retourne l'état d'une clé, lu sous le verrou de la clé.
+
+        Sur une station concurrente, l'état ne peut pas être saisi au
+        milieu d'une opération d'un autre thread. À ne pas appeler depuis
+        un abonné pour une autre clé que celle de l'événement : l'abonné
+        détient déjà le verrou de sa clé.
+
+        Parameters
+        ----------
+        nom_carburant : str
+            Le nom du carburant.
+
+        Returns
+        -------
+        tuple[tuple[int, ...], float]
+            Les volumes et le prix, comme `_etat`.
+
+        """
+        return self._etat(nom_carburant)
+
+    def activer_historique(self, intervalle: int = 1024) -> HistoriqueStation:
+        """Conserve l'historique des états de la station, pour `etat_a`.
+
+        Parameters
+        ----------
+        intervalle : int
+            Le nombre d'opérations entre deux états complets conservés :
+            `etat_a` rejoue au plus ce nombre d'opérations.
+
+        Returns
+        -------
+        HistoriqueStation
+            L'historique, déjà actif s'il a été créé auparavant.
+
+        """
+        if self.__historique is None:
+            self.__historique = HistoriqueStation(self, intervalle)
+            self.abonner(self.__historique.enregistrer)
+        return self.__historique
+
+    def etat_a(
+            self, horodatage: float
+            ) -> dict[str, tuple[tuple[int, ...], float]]:
+        """Retourne l'état de la station à une date passée.
+
+        Parameters
+        ----------
+        horodatage : float
+            La date, en secondes depuis l'epoch, postérieure à l'appel de
+            `activer_historique`.
+
+        Returns
+        -------
+        dict[str, tuple[tuple[int, ...], float]]
+            Pour chaque clé, les volumes de la pompe et le prix à cette
+            date, comme `_etat`.
+
+        Examples
+        --------
+        >>> import time
+        >>> from carburant import Carburant
+        >>> from substance_chimique import SubstanceChimique
+        >>> octane = SubstanceChimique(
+        ...     nom='octane', numero_cas='111-65-9', numero_ce='203-892-1')
+        >>> sp98 = Carburant(nom='SP98', composition_chimique={octane: 1.0})
+        >>> station = Station(
+        ...     pompes={'SP98': Pompe(sp98, 10, 8)}, prix={'SP98': 1.9})
+        >>> _ = station.activer_historique()
+        >>> station.servir('SP98', 3)
+        >>> station.etat_a(time.time())
+        {'SP98': ((5,), 1.9)}
+
+        """
+        if self.__historique is None:
+            raise ValueError("L'historique de la station n'est pas activé.")
+        return self.__historique.etat_a(horodatage)
+
+    @__sous_verrou
+    def _restaurer_etat(
+            self, nom_carburant: str, volumes: tuple[int, ...],
+            prix: float):
+        """Restaure l'état d'une clé, tel que retourné par `_etat`.
+
+        Parameters
+        ----------
+        nom_carburant : str
+            Le nom du carburant.
+        volumes : tuple[int, ...]
+            Les volumes disponibles de la pompe.
+        prix : float
+            Le prix du carburant, None si la pompe est vide.
+
+        """
+        self.__verifier_nom_carburant(nom_carburant)
+        self.pompes[nom_carburant]._fixer_volumes(volumes)
+        self.prix[nom_carburant] = prix
+
+    @__sous_verrou
+    def ajouter_pompe(
+            self, nom_carburant: str, pompe: Pompe | list[Pompe],
+            prix: float):
+        """Ajoute une pompe à la station.
+
+        Les pompes doivent être ajoutées et retirées par `ajouter_pompe` et
+        `retirer_pompe`, qui tiennent à jour l'index des carburants.
+
+        Parameters
+        ----------
+        nom_carburant : str
+            Le nom du carburant, clé de la pompe et de son prix.
+        pompe : Pompe | list[Pompe]
+            La pompe, ou la liste de pompes, à ajouter.
+        prix : float
+            Le prix du carburant.
+
+        """
+        # La clé ne doit pas être déjà utilisée
+        if nom_carburant in self.pompes:
+            raise ValueError("Une pompe existe déjà pour ce carburant.")
+
+        # Le prix doit être supérieur à 0
+        if not prix > 0:
+            raise ValueError("Les prix doivent être > 0.")
+
+        # Ajout de la pompe
+        pompe = self.__grouper(pompe)
+        self.pompes[nom_carburant] = pompe
+        self.prix[nom_carburant] = prix
+        self.__indexer_pompe(pompe, 1)
+
+    @__sous_verrou
+    def retirer_pompe(
+            self, nom_carburant: str) -> Pompe | GroupePompes:
+        """Retire une pompe de la station.
+
+        Parameters
+        ----------
+        nom_carburant : str
+            Le nom du carburant de la pompe.
+
+        Returns
+        -------
+        Pompe | GroupePompes
+            La pompe retirée.
+
+        """
+        # Vérification du nom du carburant
+        self.__verifier_nom_carburant(nom_carburant)
+
+        # Retrait de la pompe et de son prix
+        pompe = self.pompes.pop(nom_carburant)
+        del self.prix[nom_carburant]
+        self.__indexer_pompe(pompe, -1)
+        return pompe
+
     def __verifier_nom_carburant(self, nom_carburant: str):
         """Vérifie si un nom de carburant est valide.
 
@@ -90,10 +519,10 @@ class Station:
             Le nom du carburant.
 
         """
-        carburants_station = [p.carburant.nom for p in self.pompes.values()]
-        if nom_carburant not in carburants_station:
+        if nom_carburant not in self.__pompes_par_carburant:
             raise ValueError("Le carburant ne correspond à aucune pompe.")
 
+    @__sous_verrou
     def _mettre_a_jour_prix(
             self, nom_carburant: str, nouveau_prix: float):
         """Met à jour le prix d'un carburant.
@@ -120,7 +549,10 @@ class Station:
 
         # Mise à jour du prix
         self.prix[nom_carburant] = nouveau_prix
+        if self.__observateurs:
+            self.__notifier('prix', nom_carburant, 0, nouveau_prix)
 
+    @__sous_verrou
     def _remplir_pompe(
             self, nom_carburant: str, volume: int,
             nouveau_prix: int = None):
@@ -161,7 +593,11 @@ class Station:
             self.prix[nom_carburant] = nouveau_prix
 
         # Remplissage de la pompe
-        self.pompes[nom_carburant]._remplir(volume)
+        volume_ajoute = self.pompes[nom_carburant]._remplir(volume)
+        if self.__observateurs:
+            self.__notifier(
+                'remplir', nom_carburant, volume_ajoute,
+                self.prix[nom_carburant])
 
     def servir(self, nom_carburant: str, volume: int):
         """Sert un volume de carburant.
@@ -173,24 +609,239 @@ class Station:
         volume : int
             Le volume à servir.
 
+        """
+        statut, _ = self.essayer_servir(nom_carburant, volume)
+        if statut:
+            raise ValueError(_MESSAGES[statut])
+
+    @__sous_verrou
+    def essayer_servir(
+            self, nom_carburant: str, volume: int) -> tuple[Statut, int]:
+        """Sert un volume de carburant, sans lever d'exception en cas de refus.
+
+        Parameters
+        ----------
+        nom_carburant : str
+            Le nom du carburant.
+        volume : int
+            Le volume à servir.
+
+        Returns
+        -------
+        tuple[Statut, int]
+            Le statut de la demande et le volume servi, nul en cas de refus.
+
+        Examples
+        --------
+        >>> from carburant import Carburant
+        >>> from substance_chimique import SubstanceChimique
+        >>> octane = SubstanceChimique(
+        ...     nom='octane', numero_cas='111-65-9', numero_ce='203-892-1')
+        >>> sp98 = Carburant(nom='SP98', composition_chimique={octane: 1.0})
+        >>> station = Station(
+        ...     pompes={'SP98': Pompe(sp98, 10, 4)}, prix={'SP98': 1.9})
+        >>> station.essayer_servir('SP98', 6)
+        (<Statut.SERVI: 0>, 4)
+        >>> station.essayer_servir('SP98', 1)
+        (<Statut.POMPE_VIDE: 3>, 0)
+
         """
         # Vérification du nom du carburant
-        self.__verifier_nom_carburant(nom_carburant)
+        if nom_carburant not in self.prix:
+            return Statut.CARBURANT_INVALIDE, 0
 
         # Vérification de la pompe
-        self.__verifier_pompe(nom_carburant)
+        if nom_carburant not in self.__pompes_par_carburant:
+            return Statut.POMPE_INVALIDE, 0
 
         # La pompe est-elle vide ?
-        if self.pompes[nom_carburant]._vide():
-            raise ValueError("La pompe est vide.")
+        pompe = self.pompes[nom_carburant]
+        if pompe._vide():
+            return Statut.POMPE_VIDE, 0
 
         # Le volume doit être positif
         if volume <= 0:
-            raise ValueError("Le volume doit être > 0.")
+            return Statut.VOLUME_INVALIDE, 0
 
-        # Servir le volume
-        self.pompes[nom_carburant]._servir(volume)
+        # Servir le volume, en notant les pompes d'un groupe qui servent
+        if isinstance(pompe, GroupePompes):
+            volume_servi, repartition = pompe._servir_reparti(volume)
+        else:
+            volume_servi = pompe._servir(volume)
+            repartition = ((0, volume_servi),)
+        prix = self.prix[nom_carburant]
 
         # Si la pompe est maintenant vide, le prix doit être None
-        if self.pompes[nom_carburant]._vide():
+        if pompe._vide():
             self.prix[nom_carburant] = None
+        if self.__observateurs:
+            self.__notifier(
+                'servir', nom_carburant, volume_servi, prix, repartition)
+        return Statut.SERVI, volume_servi
+
+    def servir_lot(
+            self, transactions, volumes=None) -> tuple[np.ndarray, np.ndarray]:
+        """Sert un lot de transactions, dans l'ordre.
+
+        Le résultat est celui d'appels successifs à `servir`, y compris la
+        mise à None du prix quand une pompe se vide, mais les vérifications
+        sont faites une fois par carburant et les volumes d'une pompe sont
+        servis en une seule fois. Une transaction refusée ne lève pas
+        d'exception : son statut en donne la raison.
+
+        Parameters
+        ----------
+        transactions : Iterable[tuple[str, int]] ou Sequence[str]
+            Les couples (nom du carburant, volume) ou, si `volumes` est
+            renseigné, les noms des carburants.
+        volumes : Sequence[int] ou np.ndarray
+            Les volumes demandés, si `transactions` ne contient que les noms.
+
+        Returns
+        -------
+        tuple[np.ndarray, np.ndarray]
+            Les volumes servis (int64) et les statuts (int8, voir `Statut`)
+            de chaque transaction.
+
+        Examples
+        --------
+        >>> from carburant import Carburant
+        >>> from substance_chimique import SubstanceChimique
+        >>> octane = SubstanceChimique(
+        ...     nom='octane', numero_cas='111-65-9', numero_ce='203-892-1')
+        >>> sp98 = Carburant(nom='SP98', composition_chimique={octane: 1.0})
+        >>> station = Station(
+        ...     pompes={'SP98': Pompe(sp98, 10, 8)}, prix={'SP98': 1.9})
+        >>> servis, statuts = station.servir_lot(
+        ...     [('SP98', 5), ('E85', 1), ('SP98', 0), ('SP98', 5),
+        ...      ('SP98', 1)])
+        >>> servis
+        array([5, 0, 0, 3, 0])
+        >>> [Statut(statut).name for statut in statuts]
+        ['SERVI', 'CARBURANT_INVALIDE', 'VOLUME_INVALIDE', 'SERVI', \
+'POMPE_VIDE']
+        >>> station.prix['SP98']
+
+        """
+        # Mise en colonnes des transactions
+        if volumes is None:
+            transactions = list(transactions)
+            noms = [nom for nom, _ in transactions]
+            volumes = [volume for _, volume in transactions]
+        else:
+            noms = list(transactions)
+        volumes = np.asarray(volumes).reshape(-1)
+        if len(volumes) == 0:
+            volumes = volumes.astype(np.int64)
+        if not np.issubdtype(volumes.dtype, np.integer):
+            raise TypeError("Les volumes doivent être des entiers.")
+        volumes = volumes.astype(np.int64)
+        if len(noms) != len(volumes):
+            raise ValueError("Il faut un volume par transaction.")
+
+        servis = np.zeros(len(volumes), dtype=np.int64)
+        statuts = np.zeros(len(volumes), dtype=np.int8)
+        if not len(volumes):
+            return servis, statuts
+
+        # Regroupement des transactions par carburant, dans l'ordre
+        codes = {}
+        groupes = np.fromiter(
+            (codes.setdefault(nom, len(codes)) for nom in noms),
+            dtype=np.intp, count=len(noms))
+        ordre = np.argsort(groupes, kind='stable')
+        bornes = np.concatenate(
+            [[0], np.cumsum(np.bincount(groupes, minlength=len(codes)))])
+
+        for g, nom_carburant in enumerate(codes):
+            self.__servir_groupe(
+                nom_carburant, ordre[bornes[g]:bornes[g + 1]], volumes,
+                servis, statuts)
+        return servis, statuts
+
+    @__sous_verrou
+    def __servir_groupe(
+            self, nom_carburant: str, indices: np.ndarray,
+            volumes: np.ndarray, servis: np.ndarray, statuts: np.ndarray):
+        """Sert les transactions d'un même carburant d'un lot.
+
+        Parameters
+        ----------
+        nom_carburant : str
+            Le nom du carburant.
+        indices : np.ndarray
+            Les positions des transactions dans le lot, dans l'ordre.
+        volumes : np.ndarray
+            Les volumes demandés du lot.
+        servis : np.ndarray
+            Les volumes servis du lot, complétés aux positions `indices`.
+        statuts : np.ndarray
+            Les statuts du lot, complétés aux positions `indices`.
+
+        """
+
+        # Vérifications, une fois pour tout le groupe
+        if nom_carburant not in self.prix:
+            statuts[indices] = Statut.CARBURANT_INVALIDE
+            return
+        if nom_carburant not in self.__pompes_par_carburant:
+            statuts[indices] = Statut.POMPE_INVALIDE
+            return
+
+        pompe = self.pompes[nom_carburant]
+        if isinstance(pompe, Pompe):
+            servis[indices], statuts[indices] = \
+                self.__servir_pompe_lot(nom_carburant, volumes[indices])
+        else:
+            for i in indices.tolist():
+                statuts[i], servis[i] = self.essayer_servir(
+                    nom_carburant, int(volumes[i]))
+
+    def __servir_pompe_lot(
+            self, nom_carburant: str,
+            volumes: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Sert en une fois les transactions d'une pompe simple.
+
+        Parameters
+        ----------
+        nom_carburant : str
+            Le nom du carburant, déjà vérifié.
+        volumes : np.ndarray
+            Les volumes demandés, dans l'ordre.
+
+        Returns
+        -------
+        tuple[np.ndarray, np.ndarray]
+            Les volumes servis et les statuts des transactions.
+
+        """
+        pompe = self.pompes[nom_carburant]
+        disponible = pompe.volume_disponible
+
+        # Volumes cumulés des demandes valides, avant et après chacune
+        demandes = np.where(volumes > 0, volumes, 0)
+        apres = np.cumsum(demandes)
+        avant = apres - demandes
+
+        # Chaque transaction est servie dans la limite du volume restant ;
+        # la pompe est vide pour toutes celles qui suivent son épuisement
+        servis = np.minimum(apres, disponible) - np.minimum(avant, disponible)
+        statuts = np.where(
+            avant >= disponible, Statut.POMPE_VIDE,
+            np.where(volumes > 0, Statut.SERVI, Statut.VOLUME_INVALIDE))
+
+        # Service du volume total et mise à jour du prix
+        total = int(min(apres[-1], disponible))
+        if total > 0:
+            pompe._servir(total)
+            prix = self.prix[nom_carburant]
+            if pompe._vide():
+                self.prix[nom_carburant] = None
+
+            # Un événement par transaction servie, s'il y a des abonnés
+            if self.__observateurs:
+                for volume_servi in servis[servis > 0].tolist():
+                    self.__notifier(
+                        'servir', nom_carburant, volume_servi, prix,
+                        ((0, volume_servi),))
+        return servis, statuts.astype(np.int8)
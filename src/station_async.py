@@ -0,0 +1,295 @@
+import asyncio
+import itertools
+from typing import NamedTuple
+
+from station import Station
+from statut import Statut
+
+
+class MetriquesFile(NamedTuple):
+    """Métriques de la file d'attente d'une pompe.
+
+    Attributes
+    ----------
+    profondeur : int
+        Le nombre de demandes en attente.
+    profondeur_maximale : int
+        Le plus grand nombre de demandes en attente observé.
+    traitees : int
+        Le nombre de demandes traitées.
+    attente_moyenne : float
+        L'attente moyenne d'une demande avant son traitement, en secondes.
+    attente_maximale : float
+        L'attente la plus longue, en secondes.
+
+    """
+
+    profondeur: int
+    profondeur_maximale: int
+    traitees: int
+    attente_moyenne: float
+    attente_maximale: float
+
+
+class StationAsync:
+    """Interface asyncio d'une station-service.
+
+    Chaque clé de la station a sa propre file de demandes, de taille
+    bornée : quand la file est pleine, l'appelant attend qu'une place se
+    libère. Une tâche par clé traite les demandes une à une, ce qui
+    sérialise les opérations d'une pompe sans bloquer les autres. Les
+    remplissages peuvent passer devant les ventes en attente, ou être
+    traités dans l'ordre d'arrivée avec elles.
+
+    Examples
+    --------
+    >>> from carburant import Carburant
+    >>> from pompe import Pompe
+    >>> from substance_chimique import SubstanceChimique
+    >>> octane = SubstanceChimique(
+    ...     nom='octane', numero_cas='111-65-9', numero_ce='203-892-1')
+    >>> sp98 = Carburant(nom='SP98', composition_chimique={octane: 1.0})
+    >>> station = Station(
+    ...     pompes={'SP98': Pompe(sp98, 10, 4)}, prix={'SP98': 1.9})
+    >>> async def exemple():
+    ...     async with StationAsync(station, taille_file=8) as guichet:
+    ...         await guichet.servir('SP98', 4)
+    ...         await guichet._remplir_pompe('SP98', 10, 2.0)
+    ...         return await guichet.essayer_servir('SP98', 3)
+    >>> asyncio.run(exemple())
+    (<Statut.SERVI: 0>, 3)
+    >>> station.pompes['SP98'].volume_disponible, station.prix['SP98']
+    (7, 2.0)
+
+    """
+
+    # Priorités des demandes, la plus petite est traitée en premier
+    PRIORITE_REMPLISSAGE = 0
+    PRIORITE_VENTE = 1
+
+    def __init__(
+            self, station: Station, taille_file: int = 100,
+            remplissage_prioritaire: bool = True) -> None:
+        """Initialise l'interface.
+
+        Parameters
+        ----------
+        station : Station
+            La station-service.
+        taille_file : int
+            Le nombre maximal de demandes en attente par pompe.
+        remplissage_prioritaire : bool
+            True pour qu'un remplissage passe devant les ventes en attente,
+            False pour traiter toutes les demandes dans l'ordre d'arrivée.
+
+        """
+        # Vérification des arguments
+        if not isinstance(station, Station):
+            raise TypeError("La station doit être de type 'Station'.")
+        if not isinstance(taille_file, int):
+            raise TypeError("La taille de file doit être de type 'int'.")
+        if not taille_file > 0:
+            raise ValueError("La taille de file doit être > 0.")
+
+        # Assignation des attributs
+        self.station = station
+        self.__taille_file = taille_file
+        self.__remplissage_prioritaire = remplissage_prioritaire
+        self.__files: dict[str, asyncio.PriorityQueue] = {}
+        self.__taches: dict[str, asyncio.Task] = {}
+        self.__metriques: dict[str, list] = {}
+
+        # Numéro d'arrivée, qui départage les demandes de même priorité
+        self.__compteur = itertools.count()
+
+    async def __aenter__(self) -> 'StationAsync':
+        return self
+
+    async def __aexit__(self, *exception) -> None:
+        await self.fermer()
+
+    async def servir(self, nom_carburant: str, volume: int):
+        """Sert un volume de carburant, comme `Station.servir`.
+
+        Parameters
+        ----------
+        nom_carburant : str
+            Le nom du carburant.
+        volume : int
+            Le volume à servir.
+
+        """
+        return await self.__demander(
+            nom_carburant, self.PRIORITE_VENTE, self.station.servir, volume)
+
+    async def essayer_servir(
+            self, nom_carburant: str, volume: int) -> tuple[Statut, int]:
+        """Sert un volume de carburant, comme `Station.essayer_servir`.
+
+        Parameters
+        ----------
+        nom_carburant : str
+            Le nom du carburant.
+        volume : int
+            Le volume à servir.
+
+        Returns
+        -------
+        tuple[Statut, int]
+            Le statut de la demande et le volume servi.
+
+        """
+        return await self.__demander(
+            nom_carburant, self.PRIORITE_VENTE,
+            self.station.essayer_servir, volume)
+
+    async def _remplir_pompe(
+            self, nom_carburant: str, volume: int,
+            nouveau_prix: float = None):
+        """Remplit une pompe, comme `Station._remplir_pompe`.
+
+        Parameters
+        ----------
+        nom_carburant : str
+            Le nom du carburant.
+        volume : int
+            Le volume à ajouter à la pompe.
+        nouveau_prix : float
+            Le nouveau prix du carburant.
+
+        """
+        return await self.__demander(
+            nom_carburant, self.PRIORITE_REMPLISSAGE,
+            self.station._remplir_pompe, volume, nouveau_prix)
+
+    async def _mettre_a_jour_prix(
+            self, nom_carburant: str, nouveau_prix: float):
+        """Met à jour le prix d'un carburant, comme la méthode de `Station`.
+
+        Parameters
+        ----------
+        nom_carburant : str
+            Le nom du carburant.
+        nouveau_prix : float
+            Le nouveau prix du carburant.
+
+        """
+        return await self.__demander(
+            nom_carburant, self.PRIORITE_VENTE,
+            self.station._mettre_a_jour_prix, nouveau_prix)
+
+    def metriques(self, nom_carburant: str) -> MetriquesFile:
+        """Retourne les métriques de la file d'une pompe.
+
+        Parameters
+        ----------
+        nom_carburant : str
+            Le nom du carburant.
+
+        Returns
+        -------
+        MetriquesFile
+            Les métriques de la file, nulles si elle n'a jamais servi.
+
+        """
+        file = self.__files.get(nom_carburant)
+        if file is None:
+            return MetriquesFile(0, 0, 0, 0.0, 0.0)
+        profondeur_maximale, traitees, attente_totale, attente_maximale = \
+            self.__metriques[nom_carburant]
+        return MetriquesFile(
+            file.qsize(), profondeur_maximale, traitees,
+            attente_totale / traitees if traitees else 0.0, attente_maximale)
+
+    async def fermer(self) -> None:
+        """Traite les demandes en attente, puis arrête les tâches."""
+        for file in self.__files.values():
+            await file.join()
+        for tache in self.__taches.values():
+            tache.cancel()
+        await asyncio.gather(*self.__taches.values(), return_exceptions=True)
+        self.__files.clear()
+        self.__taches.clear()
+
+    async def __demander(
+            self, nom_carburant: str, priorite: int, operation, *arguments):
+        """Place une demande dans la file de sa pompe et attend son résultat.
+
+        Parameters
+        ----------
+        nom_carburant : str
+            Le nom du carburant.
+        priorite : int
+            La priorité de la demande.
+        operation : Callable
+            La méthode de la station à appeler.
+        *arguments
+            Les arguments de la méthode, après le nom du carburant.
+
+        Returns
+        -------
+        Any
+            Le résultat de la méthode, dont les exceptions sont propagées.
+
+        """
+        # Une clé inconnue n'a pas de file : la station signale l'erreur
+        if nom_carburant not in self.station.prix:
+            return operation(nom_carburant, *arguments)
+
+        # Sans priorité, les demandes sont traitées dans l'ordre d'arrivée
+        if not self.__remplissage_prioritaire:
+            priorite = self.PRIORITE_VENTE
+
+        # L'appelant attend si la file est pleine
+        file = self.__file(nom_carburant)
+        boucle = asyncio.get_running_loop()
+        resultat = boucle.create_future()
+        await file.put((
+            priorite, next(self.__compteur), boucle.time(),
+            operation, arguments, resultat))
+        metriques = self.__metriques[nom_carburant]
+        metriques[0] = max(metriques[0], file.qsize())
+        return await resultat
+
+    def __file(self, nom_carburant: str) -> asyncio.PriorityQueue:
+        """Retourne la file d'une pompe, créée avec sa tâche au besoin."""
+        file = self.__files.get(nom_carburant)
+        if file is None:
+            file = asyncio.PriorityQueue(self.__taille_file)
+            self.__files[nom_carburant] = file
+            self.__metriques[nom_carburant] = [0, 0, 0.0, 0.0]
+            self.__taches[nom_carburant] = asyncio.create_task(
+                self.__traiter(nom_carburant, file))
+        return file
+
+    async def __traiter(
+            self, nom_carburant: str, file: asyncio.PriorityQueue) -> None:
+        """Traite les demandes d'une pompe, une à une.
+
+        Parameters
+        ----------
+        nom_carburant : str
+            Le nom du carburant.
+        file : asyncio.PriorityQueue
+            La file des demandes de la pompe.
+
+        """
+        boucle = asyncio.get_running_loop()
+        metriques = self.__metriques[nom_carburant]
+        while True:
+            _, _, arrivee, operation, arguments, resultat = await file.get()
+
+            # Mise à jour des métriques d'attente
+            attente = boucle.time() - arrivee
+            metriques[1] += 1
+            metriques[2] += attente
+            metriques[3] = max(metriques[3], attente)
+
+            # Exécution de la demande, sauf si l'appelant a abandonné
+            try:
+                if not resultat.cancelled():
+                    resultat.set_result(operation(nom_carburant, *arguments))
+            except Exception as erreur:
+                resultat.set_exception(erreur)
+            finally:
+                file.task_done()
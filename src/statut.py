@@ -0,0 +1,32 @@
+from enum import IntEnum
+
+
+class Statut(IntEnum):
+    """Résultat d'une demande de service de carburant.
+
+    Les valeurs tiennent sur un octet, pour les tableaux de statuts
+    renvoyés par `Station.servir_lot`.
+
+    Examples
+    --------
+    >>> Statut.POMPE_VIDE
+    <Statut.POMPE_VIDE: 3>
+    >>> bool(Statut.SERVI)
+    False
+
+    """
+
+    # Le volume a été servi, éventuellement en partie
+    SERVI = 0
+
+    # Le nom du carburant ne correspond à aucun prix de la station
+    CARBURANT_INVALIDE = 1
+
+    # Le carburant ne correspond à aucune pompe
+    POMPE_INVALIDE = 2
+
+    # La pompe est vide
+    POMPE_VIDE = 3
+
+    # Le volume demandé n'est pas > 0
+    VOLUME_INVALIDE = 4
@@ -1,3 +1,10 @@
+import numpy as np
+
+# Bornes (exclues) des clés entières des numéros CAS et CE
+CLE_CAS_MAXIMALE = 10 ** 10
+CLE_CE_MAXIMALE = 10 ** 7
+
+
 class SubstanceChimique:
     """Représente une substance chimique.
 
@@ -25,8 +32,16 @@ class SubstanceChimique:
     >>> repr(butane) == repr_butane
     True
 
+    Notes
+    -----
+    Une substance est immuable : son hash est calculé une seule fois à
+    l'initialisation, ce qui rend peu coûteuses les recherches dans les
+    dictionnaires indexés par substance (`Carburant.composition_chimique`).
+
     """
 
+    __slots__ = ('nom', '__numero_cas', '__numero_ce', '__hash', '__cle')
+
     def __init__(self, nom: str, numero_cas: str, numero_ce: str) -> None:
         """Initialise une substance chimique.
 
@@ -57,9 +72,110 @@ class SubstanceChimique:
             raise ValueError(f"Le numéro CE {numero_ce} est invalide.")
 
         # Assignation des attributs
-        self.nom = nom
-        self.__numero_cas = numero_cas
-        self.__numero_ce = numero_ce
+        self.__initialiser(nom, numero_cas, numero_ce)
+
+    @classmethod
+    def _creer(
+            cls, nom: str, numero_cas: str,
+            numero_ce: str) -> 'SubstanceChimique':
+        """Crée une substance sans vérifier ses numéros.
+
+        Réservé aux chemins qui ont déjà validé les numéros, par exemple en
+        lot avec `valide_cas_lot` et `valide_ce_lot`.
+
+        Parameters
+        ----------
+        nom : str
+            Le nom de la substance chimique.
+        numero_cas : str
+            Le numéro CAS, déjà vérifié.
+        numero_ce : str
+            Le numéro CE, déjà vérifié.
+
+        Returns
+        -------
+        SubstanceChimique
+            La substance créée.
+
+        """
+        substance = cls.__new__(cls)
+        substance.__initialiser(nom, numero_cas, numero_ce)
+        return substance
+
+    def __initialiser(
+            self, nom: str, numero_cas: str, numero_ce: str) -> None:
+        """Assigne les attributs, en contournant `__setattr__`.
+
+        Parameters
+        ----------
+        nom : str
+            Le nom de la substance chimique.
+        numero_cas : str
+            Le numéro CAS de la substance chimique.
+        numero_ce : str
+            Le numéro CE de la substance chimique.
+
+        """
+        assigner = object.__setattr__
+        assigner(self, 'nom', nom)
+        assigner(self, '_SubstanceChimique__numero_cas', numero_cas)
+        assigner(self, '_SubstanceChimique__numero_ce', numero_ce)
+
+        # Le hash est calculé une fois pour toutes
+        assigner(self, '_SubstanceChimique__hash',
+                 hash((nom, numero_cas, numero_ce)))
+
+        # La clé aussi, à partir des numéros déjà vérifiés
+        parties = numero_cas.split('-')
+        cle_cas = int(parties[0]) * 1000 + int(parties[1]) * 10 + \
+            int(parties[2])
+        assigner(self, '_SubstanceChimique__cle',
+                 cle_cas * CLE_CE_MAXIMALE + int(numero_ce.replace('-', '')))
+
+    def __setattr__(self, nom: str, valeur) -> None:
+        """Interdit la modification d'une substance.
+
+        Parameters
+        ----------
+        nom : str
+            Le nom de l'attribut.
+        valeur : Any
+            La valeur de l'attribut.
+
+        """
+        raise AttributeError("Une substance chimique est immuable.")
+
+    def __delattr__(self, nom: str) -> None:
+        """Interdit la suppression d'un attribut.
+
+        Parameters
+        ----------
+        nom : str
+            Le nom de l'attribut.
+
+        """
+        raise AttributeError("Une substance chimique est immuable.")
+
+    def __reduce__(self) -> tuple:
+        """Permet la copie et la sérialisation d'une substance immuable.
+
+        Returns
+        -------
+        tuple
+            La classe et les arguments permettant de recréer l'instance.
+
+        """
+        return self.__class__, (self.nom, self.__numero_cas, self.__numero_ce)
+
+    @property
+    def numero_cas(self) -> str:
+        """Le numéro CAS de la substance chimique."""
+        return self.__numero_cas
+
+    @property
+    def numero_ce(self) -> str:
+        """Le numéro CE de la substance chimique."""
+        return self.__numero_ce
 
     def __eq__(self, other: 'SubstanceChimique') -> bool:
         """Vérifie si deux substances chimiques sont égales.
@@ -75,8 +191,14 @@ class SubstanceChimique:
             True si les substances sont égales, False sinon.
 
         """
+        # Une instance est toujours égale à elle-même
+        if self is other:
+            return True
+        if not isinstance(other, SubstanceChimique):
+            return NotImplemented
+
         # Si les deux instances ont les mêmes attributs, elles sont égales
-        if self.nom == other.nom and \
+        if self.__hash == other.__hash and self.nom == other.nom and \
             self.__numero_cas == other.__numero_cas and \
                 self.__numero_ce == other.__numero_ce:
             return True
@@ -112,7 +234,7 @@ class SubstanceChimique:
             Le hash de l'instance.
 
         """
-        return hash(self.__repr__())
+        return self.__hash
 
     @staticmethod
     def valide_cas(numero_cas: str) -> bool:
@@ -144,6 +266,11 @@ class SubstanceChimique:
         if len(parties[1]) != 2:
             return False
 
+        # Chaque partie ne contient que des chiffres
+        if not all(partie.isascii() and partie.isdecimal()
+                   for partie in parties):
+            return False
+
         # Calcul de la somme de contrôle
         concat = parties[0] + parties[1]
         checksum = 0
@@ -182,6 +309,11 @@ class SubstanceChimique:
             if len(partie) != longueurs[i]:
                 return False
 
+        # Chaque partie ne contient que des chiffres
+        if not all(partie.isascii() and partie.isdecimal()
+                   for partie in parties):
+            return False
+
         # Calcul de la somme de contrôle
         concat = parties[0] + parties[1]
         checksum = 0
@@ -191,3 +323,335 @@ class SubstanceChimique:
 
         # Vérification du checksum
         return checksum == int(parties[2])
+
+    @staticmethod
+    def valide_cas_lot(numeros_cas) -> np.ndarray:
+        """Vérifie un lot de numéros CAS en une seule passe vectorisée.
+
+        Les règles sont celles de `valide_cas`, qui reste la référence :
+        le résultat est identique à un appel de `valide_cas` par élément.
+
+        Parameters
+        ----------
+        numeros_cas : Sequence[str] ou np.ndarray
+            Les numéros CAS à vérifier.
+
+        Returns
+        -------
+        np.ndarray
+            Un masque booléen, True pour chaque numéro CAS valide.
+
+        Examples
+        --------
+        >>> SubstanceChimique.valide_cas_lot(['50-00-0', '123-45-67'])
+        array([ True, False])
+
+        """
+        return _analyser_cas(numeros_cas)[0]
+
+    @staticmethod
+    def valide_ce_lot(numeros_ce) -> np.ndarray:
+        """Vérifie un lot de numéros CE en une seule passe vectorisée.
+
+        Les règles sont celles de `valide_ce`, qui reste la référence :
+        le résultat est identique à un appel de `valide_ce` par élément.
+
+        Parameters
+        ----------
+        numeros_ce : Sequence[str] ou np.ndarray
+            Les numéros CE à vérifier.
+
+        Returns
+        -------
+        np.ndarray
+            Un masque booléen, True pour chaque numéro CE valide.
+
+        Examples
+        --------
+        >>> SubstanceChimique.valide_ce_lot(['200-578-6', '123-456-8'])
+        array([ True, False])
+
+        """
+        return _analyser_ce(numeros_ce)[0]
+
+    @staticmethod
+    def cas_en_cle(numero_cas: str) -> int:
+        """Convertit un numéro CAS en clé entière canonique.
+
+        La clé est la valeur des chiffres du numéro, tirets ôtés : elle
+        tient sur 34 bits et l'ordre des clés est celui des numéros.
+
+        Parameters
+        ----------
+        numero_cas : str
+            Le numéro CAS à convertir.
+
+        Returns
+        -------
+        int
+            La clé du numéro CAS.
+
+        Examples
+        --------
+        >>> SubstanceChimique.cas_en_cle('64-17-5')
+        64175
+
+        """
+        if not SubstanceChimique.valide_cas(numero_cas):
+            raise ValueError(f"Le numéro CAS {numero_cas} est invalide.")
+        parties = numero_cas.split('-')
+        return int(parties[0]) * 1000 + int(parties[1]) * 10 + \
+            int(parties[2])
+
+    @staticmethod
+    def cle_en_cas(cle: int) -> str:
+        """Convertit une clé entière en numéro CAS canonique.
+
+        Parameters
+        ----------
+        cle : int
+            La clé du numéro CAS.
+
+        Returns
+        -------
+        str
+            Le numéro CAS, sans zéro de tête.
+
+        Examples
+        --------
+        >>> SubstanceChimique.cle_en_cas(64175)
+        '64-17-5'
+
+        """
+        numero_cas = f"{cle // 1000}-{cle // 10 % 100:02d}-{cle % 10}"
+        if not 0 <= cle < CLE_CAS_MAXIMALE or \
+                not SubstanceChimique.valide_cas(numero_cas):
+            raise ValueError(f"La clé CAS {cle} est invalide.")
+        return numero_cas
+
+    @staticmethod
+    def ce_en_cle(numero_ce: str) -> int:
+        """Convertit un numéro CE en clé entière canonique.
+
+        Parameters
+        ----------
+        numero_ce : str
+            Le numéro CE à convertir.
+
+        Returns
+        -------
+        int
+            La clé du numéro CE, inférieure à 10**7.
+
+        Examples
+        --------
+        >>> SubstanceChimique.ce_en_cle('200-578-6')
+        2005786
+
+        """
+        if not SubstanceChimique.valide_ce(numero_ce):
+            raise ValueError(f"Le numéro CE {numero_ce} est invalide.")
+        return int(numero_ce.replace('-', ''))
+
+    @staticmethod
+    def cle_en_ce(cle: int) -> str:
+        """Convertit une clé entière en numéro CE.
+
+        Parameters
+        ----------
+        cle : int
+            La clé du numéro CE.
+
+        Returns
+        -------
+        str
+            Le numéro CE.
+
+        Examples
+        --------
+        >>> SubstanceChimique.cle_en_ce(2005786)
+        '200-578-6'
+
+        """
+        numero_ce = f"{cle // 10_000:03d}-{cle // 10 % 1000:03d}-{cle % 10}"
+        if not 0 <= cle < CLE_CE_MAXIMALE or \
+                not SubstanceChimique.valide_ce(numero_ce):
+            raise ValueError(f"La clé CE {cle} est invalide.")
+        return numero_ce
+
+    @staticmethod
+    def cas_en_cle_lot(numeros_cas) -> np.ndarray:
+        """Convertit un lot de numéros CAS en clés entières.
+
+        Parameters
+        ----------
+        numeros_cas : Sequence[str] ou np.ndarray
+            Les numéros CAS à convertir.
+
+        Returns
+        -------
+        np.ndarray
+            Les clés (int64), -1 pour chaque numéro CAS invalide.
+
+        """
+        valides, cles = _analyser_cas(numeros_cas, cles=True)
+        return np.where(valides, cles, -1)
+
+    @staticmethod
+    def ce_en_cle_lot(numeros_ce) -> np.ndarray:
+        """Convertit un lot de numéros CE en clés entières.
+
+        Parameters
+        ----------
+        numeros_ce : Sequence[str] ou np.ndarray
+            Les numéros CE à convertir.
+
+        Returns
+        -------
+        np.ndarray
+            Les clés (int64), -1 pour chaque numéro CE invalide.
+
+        """
+        valides, cles = _analyser_ce(numeros_ce, cles=True)
+        return np.where(valides, cles, -1)
+
+    @property
+    def cle(self) -> int:
+        """La clé 64 bits de la substance, combinant ses clés CAS et CE.
+
+        Deux substances de même clé ont les mêmes numéros ; l'ordre des
+        clés est celui des numéros CAS, puis CE.
+
+        """
+        return self.__cle
+
+
+def _analyser_cas(
+        numeros_cas, cles: bool = False) -> tuple[np.ndarray, np.ndarray]:
+    """Vérifie un lot de numéros CAS et calcule éventuellement leurs clés.
+
+    Parameters
+    ----------
+    numeros_cas : Sequence[str] ou np.ndarray
+        Les numéros CAS à analyser.
+    cles : bool
+        Calculer aussi les clés entières des numéros.
+
+    Returns
+    -------
+    tuple[np.ndarray, np.ndarray]
+        Le masque des numéros valides et leurs clés (int64), ou None si
+        les clés ne sont pas demandées. La clé d'un numéro invalide n'a
+        pas de sens.
+
+    """
+    codes, longueurs = _codes_caracteres(numeros_cas)
+    n, largeur = codes.shape
+    if largeur == 0:
+        return np.zeros(n, dtype=bool), np.zeros(n, dtype=np.int64)
+    positions = np.arange(largeur, dtype=np.int32)
+    dans_chaine = positions < longueurs[:, None]
+
+    # Exactement deux tirets, dont on repère les positions
+    tirets = codes == ord('-')
+    valides = np.count_nonzero(tirets, axis=1) == 2
+    tiret_1 = tirets.argmax(axis=1).astype(np.int32)
+    tiret_2 = (largeur - 1 - tirets[:, ::-1].argmax(axis=1)).astype(
+        np.int32)
+
+    # Longueurs des parties : 1 à 7 chiffres, 2 chiffres, au moins 1
+    valides &= (tiret_1 >= 1) & (tiret_1 <= 7)
+    valides &= tiret_2 - tiret_1 == 3
+    valides &= longueurs - tiret_2 >= 2
+
+    # Tous les autres caractères sont des chiffres
+    est_chiffre = (codes >= ord('0')) & (codes <= ord('9'))
+    valides &= ~np.any(dans_chaine & ~(est_chiffre | tirets), axis=1)
+    chiffres = np.where(est_chiffre, codes - ord('0'), 0).astype(np.int32)
+
+    # Poids de la somme de contrôle, lue de droite à gauche : le
+    # chiffre en position i de la première partie pèse tiret_1 - i + 2
+    # et celui de la deuxième partie pèse tiret_2 - i
+    poids = np.where(
+        positions < tiret_1[:, None],
+        (tiret_1 + 2)[:, None] - positions,
+        tiret_2[:, None] - positions)
+    poids *= positions < tiret_2[:, None]
+    checksum = np.einsum('ij,ij->i', chiffres, poids) % 10
+
+    # La troisième partie vaut le checksum (zéros de tête admis)
+    fin = np.maximum(longueurs - 1, 0)
+    troisieme = (positions > tiret_2[:, None]) & (positions < fin[:, None])
+    valides &= ~np.any(troisieme & (chiffres != 0), axis=1)
+    dernier_chiffre = chiffres[np.arange(n), fin]
+    valides &= dernier_chiffre == checksum
+    if not cles:
+        return valides, None
+
+    # Un chiffre de poids p vaut 10**p dans la clé, le checksum valant 1
+    puissances = np.where(poids > 0, 10 ** np.clip(poids, 0, 9), 0)
+    valeurs = np.einsum('ij,ij->i', chiffres.astype(np.int64), puissances)
+    return valides, valeurs + dernier_chiffre
+
+
+def _analyser_ce(
+        numeros_ce, cles: bool = False) -> tuple[np.ndarray, np.ndarray]:
+    """Vérifie un lot de numéros CE et calcule éventuellement leurs clés.
+
+    Parameters
+    ----------
+    numeros_ce : Sequence[str] ou np.ndarray
+        Les numéros CE à analyser.
+    cles : bool
+        Calculer aussi les clés entières des numéros.
+
+    Returns
+    -------
+    tuple[np.ndarray, np.ndarray]
+        Le masque des numéros valides et leurs clés (int64), ou None si
+        les clés ne sont pas demandées. La clé d'un numéro invalide n'a
+        pas de sens.
+
+    """
+    codes, longueurs = _codes_caracteres(numeros_ce)
+    n, largeur = codes.shape
+    if largeur < 9:
+        return np.zeros(n, dtype=bool), np.zeros(n, dtype=np.int64)
+    codes = codes[:, :9]
+
+    # Le format est exactement 'XXX-XXX-X'
+    valides = longueurs == 9
+    valides &= (codes[:, 3] == ord('-')) & (codes[:, 7] == ord('-'))
+    chiffres = np.delete(codes, [3, 7], axis=1)
+    valides &= np.all((chiffres >= ord('0')) & (chiffres <= ord('9')),
+                      axis=1)
+    chiffres = chiffres.astype(np.int32) - ord('0')
+
+    # Calcul de la somme de contrôle
+    checksum = (chiffres[:, :6] * np.arange(1, 7)).sum(axis=1) % 11
+    valides &= checksum == chiffres[:, 6]
+    if not cles:
+        return valides, None
+    return valides, chiffres.astype(np.int64) @ 10 ** np.arange(6, -1, -1)
+
+
+def _codes_caracteres(numeros) -> tuple[np.ndarray, np.ndarray]:
+    """Convertit un lot de chaînes en matrice de points de code.
+
+    Parameters
+    ----------
+    numeros : Sequence[str] ou np.ndarray
+        Les chaînes à convertir.
+
+    Returns
+    -------
+    tuple[np.ndarray, np.ndarray]
+        La matrice (n, largeur) des points de code, complétée par des
+        zéros, et la longueur de chaque chaîne.
+
+    """
+    tableau = np.asarray(numeros, dtype=np.str_).reshape(-1)
+    largeur = tableau.dtype.itemsize // 4
+    codes = tableau.view(np.uint32).reshape(len(tableau), largeur)
+    longueurs = np.char.str_len(tableau).astype(np.int32)
+    return codes, longueurs
@@ -0,0 +1,93 @@
+import numpy as np
+import pytest
+from banque_pompes import BanquePompes
+from carburant import Carburant
+from pompe import Pompe
+from station import Station
+from substance_chimique import SubstanceChimique
+
+
+@pytest.fixture
+def carburant_test():
+    butane = SubstanceChimique(
+        nom='butane', numero_cas='106-97-8', numero_ce='203-448-7')
+    return Carburant(nom='GPL', composition_chimique={butane: 1.0})
+
+
+@pytest.fixture
+def banque_test(carburant_test):
+    return BanquePompes([carburant_test] * 3, [10, 20, 30], [5, 0, 30])
+
+
+def test_banque_initialisation(carburant_test, banque_test):
+    assert len(banque_test) == 3
+    assert banque_test.volumes_disponibles.tolist() == [5, 0, 30]
+    with pytest.raises(ValueError):
+        banque_test.volumes_disponibles[0] = 1
+    with pytest.raises(ValueError):
+        BanquePompes([carburant_test], [10], [11])
+    with pytest.raises(ValueError):
+        BanquePompes([carburant_test], [0])
+    with pytest.raises(TypeError):
+        BanquePompes([carburant_test], [10.0])
+
+
+def test_banque_ajouter(carburant_test, banque_test):
+    for i in range(40):
+        assert banque_test.ajouter(carburant_test, 10, i % 10) == 3 + i
+    assert len(banque_test) == 43
+    assert banque_test.volumes_disponibles[-1] == 9
+    assert banque_test.pompe(-1).volume_disponible == 9
+    with pytest.raises(ValueError):
+        banque_test.ajouter(carburant_test, 10, 11)
+
+
+def test_banque_erreurs(banque_test):
+    with pytest.raises(ValueError):
+        banque_test.servir([0], [0])
+    with pytest.raises(IndexError):
+        banque_test.servir([3], [1])
+    with pytest.raises(ValueError):
+        banque_test.remplir([0, 1], [1])
+    assert banque_test.volumes_disponibles.tolist() == [5, 0, 30]
+
+
+def test_banque_comme_pompes(carburant_test):
+    # Les opérations vectorisées équivalent à des appels successifs
+    generateur = np.random.default_rng(0)
+    maximaux = generateur.integers(1, 50, 20)
+    disponibles = generateur.integers(0, maximaux + 1)
+    banque = BanquePompes([carburant_test] * 20, maximaux, disponibles)
+    pompes = [Pompe(carburant_test, int(m), int(d))
+              for m, d in zip(maximaux, disponibles)]
+    for _ in range(20):
+        indices = generateur.integers(0, 20, 100)
+        volumes = generateur.integers(1, 20, 100)
+        if generateur.random() < 0.5:
+            resultat = banque.servir(indices, volumes)
+            attendu = [pompes[i]._servir(int(v))
+                       for i, v in zip(indices, volumes)]
+        else:
+            resultat = banque.remplir(indices, volumes)
+            attendu = []
+            for i, v in zip(indices, volumes):
+                avant = pompes[i].volume_disponible
+                pompes[i]._remplir(int(v))
+                attendu.append(pompes[i].volume_disponible - avant)
+        assert resultat.tolist() == attendu
+        assert banque.volumes_disponibles.tolist() == \
+            [pompe.volume_disponible for pompe in pompes]
+    assert banque.vide().tolist() == [pompe._vide() for pompe in pompes]
+
+
+def test_vue_pompe_station(carburant_test, banque_test):
+    station = Station(
+        pompes={'GPL': banque_test.pompe(0)}, prix={'GPL': 1.0})
+    station.servir('GPL', 3)
+    assert banque_test.volumes_disponibles[0] == 2
+    station.servir('GPL', 3)
+    assert station.prix['GPL'] is None
+    station._remplir_pompe('GPL', 4, 1.1)
+    assert banque_test.pompe(0).volume_disponible == 4
+    servis, _ = station.servir_lot([('GPL', 3), ('GPL', 3)])
+    assert servis.tolist() == [3, 1]
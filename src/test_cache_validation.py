@@ -0,0 +1,72 @@
+import pytest
+from cache_validation import CacheValidation
+
+
+@pytest.fixture
+def chemin_cache(tmp_path):
+    return str(tmp_path / 'validations.sqlite')
+
+
+def test_succes_echecs(chemin_cache):
+    with CacheValidation(chemin_cache) as cache:
+        assert cache.valide_cas('64-17-5')
+        assert not cache.valide_cas('123-45-67')
+        assert cache.valide_cas('64-17-5')
+        assert cache.valide_ce('200-578-6')
+        assert (cache.succes, cache.echecs) == (1, 3)
+
+
+def test_persistance(chemin_cache):
+    with CacheValidation(chemin_cache) as cache:
+        cache.valide_cas('64-17-5')
+        cache.valide_ce('123-456-8')
+    with CacheValidation(chemin_cache) as cache:
+        assert len(cache) == 2
+        assert cache.valide_cas('64-17-5')
+        assert not cache.valide_ce('123-456-8')
+        assert (cache.succes, cache.echecs) == (2, 0)
+
+
+def test_eviction_lru(chemin_cache):
+    with CacheValidation(chemin_cache, taille_maximale=2) as cache:
+        cache.valide_cas('64-17-5')
+        cache.valide_cas('50-00-0')
+        cache.valide_cas('64-17-5')
+        cache.valide_cas('74-98-6')  # Évince 50-00-0
+        assert len(cache) == 2
+    with CacheValidation(chemin_cache, taille_maximale=2) as cache:
+        assert len(cache) == 2
+        cache.valide_cas('64-17-5')
+        cache.valide_cas('74-98-6')
+        cache.valide_cas('50-00-0')
+        assert (cache.succes, cache.echecs) == (2, 1)
+
+
+def test_partage_entre_instances(chemin_cache):
+    premier = CacheValidation(chemin_cache, taille_lot_ecriture=1)
+    second = CacheValidation(chemin_cache, taille_lot_ecriture=1)
+    premier.valide_cas('64-17-5')
+    second.valide_ce('200-578-6')
+    premier.fermer()
+    second.fermer()
+    with CacheValidation(chemin_cache) as cache:
+        assert len(cache) == 2
+
+
+def test_creer_substance(chemin_cache, ethanol_kwargs):
+    with CacheValidation(chemin_cache) as cache:
+        ethanol = cache.creer_substance(**ethanol_kwargs)
+        assert ethanol.numero_cas == ethanol_kwargs['numero_cas']
+        assert cache.creer_substance(**ethanol_kwargs) == ethanol
+        assert (cache.succes, cache.echecs) == (2, 2)
+        with pytest.raises(ValueError):
+            cache.creer_substance('x', '123-45-67', '200-578-6')
+        with pytest.raises(TypeError):
+            cache.creer_substance(123, '64-17-5', '200-578-6')
+
+
+def test_arguments_invalides(chemin_cache):
+    with pytest.raises(ValueError):
+        CacheValidation(chemin_cache, taille_maximale=0)
+    with pytest.raises(TypeError):
+        CacheValidation(chemin_cache, taille_lot_ecriture='10')
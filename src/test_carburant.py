@@ -48,3 +48,64 @@ def test_carburant_nom_incorrect_type():
 def test_carburant_composition_incorrect_type(sp95_kwargs):
     with pytest.raises(TypeError):
         Carburant(sp95_kwargs['nom'], "ceci n'est pas un dictionnaire")
+
+
+def test_carburant_egalite_et_hash(sp95_kwargs, sp98_kwargs):
+    sp95 = Carburant(**sp95_kwargs)
+    copie = Carburant(**sp95_kwargs)
+    assert sp95 == copie
+    assert len({sp95, copie, Carburant(**sp98_kwargs)}) == 2
+    assert sp95 != Carburant('SP95-bis', sp95_kwargs['composition_chimique'])
+
+
+def test_carburant_tolerance_arrondis():
+    octane = SubstanceChimique(
+        nom='octane', numero_cas='111-65-9', numero_ce='203-892-1')
+    heptane = SubstanceChimique(
+        nom='heptane', numero_cas='142-82-5', numero_ce='205-563-8')
+    ethanol = SubstanceChimique(
+        nom='éthanol', numero_cas='64-17-5', numero_ce='200-578-6')
+    composition = {octane: 0.7, heptane: 0.2, ethanol: 0.1}
+    assert sum(composition.values()) != 1
+    assert Carburant('SP95-E10', composition).composition_chimique == \
+        composition
+
+
+def test_depuis_matrice(octane_kwargs, heptane_kwargs):
+    octane = SubstanceChimique(**octane_kwargs)
+    heptane = SubstanceChimique(**heptane_kwargs)
+    carburants, erreurs = Carburant.depuis_matrice(
+        ['SP98', 'SP95', 'Octane', 'Négatif', 'Somme', 'Vide'],
+        [octane, heptane],
+        [[0.98, 0.02], [0.95, 0.05], [1.0, 0.0],
+         [1.5, -0.5], [0.5, 0.4], [0.0, 0.0]])
+    assert erreurs.tolist() == [False, False, False, True, True, True]
+    assert carburants[0] == Carburant('SP98', {octane: 0.98, heptane: 0.02})
+    assert carburants[1] == Carburant('SP95', {octane: 0.95, heptane: 0.05})
+    assert carburants[2].composition_chimique == {octane: 1.0}
+    assert carburants[3:] == [None, None, None]
+
+
+def test_depuis_matrice_renormaliser(octane_kwargs, heptane_kwargs):
+    octane = SubstanceChimique(**octane_kwargs)
+    heptane = SubstanceChimique(**heptane_kwargs)
+    carburants, erreurs = Carburant.depuis_matrice(
+        ['A', 'B'], [octane, heptane], [[3, 1], [0, 0]], renormaliser=True)
+    assert erreurs.tolist() == [False, True]
+    assert carburants[0].composition_chimique == {octane: 0.75, heptane: 0.25}
+
+
+def test_depuis_matrice_tolerance(octane_kwargs, heptane_kwargs):
+    substances = [SubstanceChimique(**octane_kwargs),
+                  SubstanceChimique(**heptane_kwargs)]
+    _, erreurs = Carburant.depuis_matrice(
+        ['A'], substances, [[0.95, 0.0501]], tolerance=1e-3)
+    assert not erreurs[0]
+    _, erreurs = Carburant.depuis_matrice(['A'], substances, [[0.95, 0.0501]])
+    assert erreurs[0]
+
+
+def test_depuis_matrice_forme_invalide(octane_kwargs):
+    with pytest.raises(ValueError):
+        Carburant.depuis_matrice(
+            ['A', 'B'], [SubstanceChimique(**octane_kwargs)], [[1.0]])
@@ -0,0 +1,111 @@
+import json
+
+import pytest
+from catalogue import charger_catalogue
+from registre_substances import RegistreSubstances
+
+
+@pytest.fixture
+def catalogue_csv(tmp_path):
+    chemin = tmp_path / 'substances.csv'
+    chemin.write_text(
+        'nom,numero_cas,numero_ce\n'
+        'octane,111-65-9,203-892-1\n'
+        'heptane,142-82-5,205-563-8\n'
+        '\n'
+        'inconnu,123-45-67,200-578-6\n'
+        '"éthanol, absolu",64-17-5,200-578-6\n'
+        'incomplet,64-17-5\n'
+        'octane,111-65-9,203-892-1\n',
+        encoding='utf-8')
+    return chemin
+
+
+@pytest.fixture
+def catalogue_jsonl(tmp_path):
+    chemin = tmp_path / 'substances.jsonl'
+    lignes = [
+        json.dumps(dict(nom='butane', cas='106-97-8', ce='203-448-7')),
+        json.dumps(dict(nom='propane', cas='74-98-6', ce='123-456-8')),
+        '{pas du json',
+        json.dumps(dict(nom='propane', cas='74-98-6', ce=2008279)),
+        json.dumps(dict(nom='propane', cas='74-98-6', ce='200-827-9')),
+    ]
+    chemin.write_text('\n'.join(lignes), encoding='utf-8')
+    return chemin
+
+
+def test_charger_csv(catalogue_csv):
+    rejets = []
+    substances = list(charger_catalogue(
+        str(catalogue_csv), taille_lot=2,
+        sur_rejet=lambda numero, ligne, raison: rejets.append(numero)))
+    assert [s.nom for s in substances] == \
+        ['octane', 'heptane', 'éthanol, absolu', 'octane']
+    assert sorted(rejets) == [5, 7]
+
+
+def test_charger_csv_registre(catalogue_csv):
+    registre = RegistreSubstances()
+    rejets = []
+    substances = list(charger_catalogue(
+        str(catalogue_csv), registre=registre,
+        sur_rejet=lambda numero, ligne, raison: rejets.append(numero)))
+    assert substances[0] is substances[-1]
+    assert len(registre) == 3
+    assert sorted(rejets) == [5, 7]
+
+
+def test_charger_jsonl(catalogue_jsonl):
+    rejets = []
+    colonnes = {'numero_cas': 'cas', 'numero_ce': 'ce'}
+    substances = list(charger_catalogue(
+        str(catalogue_jsonl), colonnes=colonnes,
+        sur_rejet=lambda numero, ligne, raison: rejets.append(
+            (numero, raison))))
+    assert [s.numero_ce for s in substances] == ['203-448-7', '200-827-9']
+    rejets.sort()
+    assert [numero for numero, _ in rejets] == [2, 3, 4]
+    assert rejets[0][1] == "Le numéro CE 123-456-8 est invalide."
+
+
+def test_charger_csv_multiligne(tmp_path):
+    # Un nom entre guillemets peut contenir des fins de ligne
+    chemin = tmp_path / 'substances.txt'
+    chemin.write_text(
+        'nom,numero_cas,numero_ce\n'
+        '"octane\n(n-octane)",111-65-9,203-892-1\n'
+        '"heptane\n\nnormal",142-82-5,205-563-8\n'
+        'inconnu,123-45-67,200-578-6\n',
+        encoding='utf-8')
+    rejets = []
+    substances = list(charger_catalogue(
+        str(chemin), format_fichier='csv',
+        sur_rejet=lambda numero, ligne, raison: rejets.append(numero)))
+    assert [s.nom for s in substances] == [
+        'octane\n(n-octane)', 'heptane\n\nnormal']
+    assert rejets == [7]
+
+
+def test_charger_fichier_vide(tmp_path):
+    chemin = tmp_path / 'vide.csv'
+    chemin.write_bytes(b'')
+    assert list(charger_catalogue(str(chemin))) == []
+
+
+def test_colonne_absente(tmp_path):
+    chemin = tmp_path / 'substances.csv'
+    chemin.write_text('nom,numero_cas\noctane,111-65-9\n')
+    with pytest.raises(ValueError):
+        list(charger_catalogue(str(chemin)))
+
+
+def test_format_invalide(tmp_path):
+    with pytest.raises(ValueError):
+        list(charger_catalogue(str(tmp_path / 'substances.xml')))
+    with pytest.raises(ValueError):
+        list(charger_catalogue(
+            str(tmp_path / 'substances.csv'), format_fichier='xml'))
+    with pytest.raises(ValueError):
+        list(charger_catalogue(
+            str(tmp_path / 'substances.csv'), taille_lot=0))
@@ -0,0 +1,53 @@
+import pytest
+from composition import CompositionCompacte
+from substance_chimique import SubstanceChimique
+
+
+@pytest.fixture
+def sp95_compacte(sp95_kwargs):
+    return CompositionCompacte(sp95_kwargs['composition_chimique'])
+
+
+def test_tri_par_cle(sp95_compacte):
+    assert list(sp95_compacte.cles) == sorted(sp95_compacte.cles)
+    assert [s.cle for s in sp95_compacte.substances] == \
+        list(sp95_compacte.cles)
+    assert len(sp95_compacte) == 2
+
+
+def test_proportion(sp95_compacte, octane_kwargs, ethanol_kwargs):
+    assert sp95_compacte.proportion(
+        SubstanceChimique(**octane_kwargs)) == 0.95
+    assert sp95_compacte.proportion(
+        SubstanceChimique(**ethanol_kwargs)) == 0.0
+
+
+def test_egalite_et_hash(sp95_kwargs, sp98_kwargs, sp95_compacte):
+    composition = sp95_kwargs['composition_chimique']
+    inverse = dict(reversed(composition.items()))
+    assert CompositionCompacte(inverse) == sp95_compacte
+    assert hash(CompositionCompacte(inverse)) == hash(sp95_compacte)
+    assert CompositionCompacte(sp98_kwargs['composition_chimique']) != \
+        sp95_compacte
+
+
+def test_produit_scalaire(sp95_compacte, sp98_kwargs, e85_kwargs):
+    sp98 = CompositionCompacte(sp98_kwargs['composition_chimique'])
+    e85 = CompositionCompacte(e85_kwargs['composition_chimique'])
+    assert sp95_compacte.produit_scalaire(sp98) == \
+        pytest.approx(0.95 * 0.98 + 0.05 * 0.02)
+    assert sp95_compacte.produit_scalaire(e85) == 0.0
+
+
+def test_vers_dict(sp95_kwargs, sp95_compacte):
+    assert sp95_compacte.vers_dict() == sp95_kwargs['composition_chimique']
+
+
+def test_tableaux_non_modifiables(sp95_compacte):
+    with pytest.raises(ValueError):
+        sp95_compacte.proportions[0] = 1.0
+
+
+def test_composition_invalide():
+    with pytest.raises(TypeError):
+        CompositionCompacte([1.0])
@@ -0,0 +1,106 @@
+import numpy as np
+import pytest
+from carburant import Carburant
+from grand_livre import GrandLivre, montant_centimes
+from pompe import Pompe
+from station import Station
+from substance_chimique import SubstanceChimique
+
+
+@pytest.fixture
+def station():
+    butane = SubstanceChimique(
+        nom='butane', numero_cas='106-97-8', numero_ce='203-448-7')
+    gpl = Carburant(nom='GPL', composition_chimique={butane: 1.0})
+    gaz = Carburant(nom='Gaz', composition_chimique={butane: 1.0})
+    return Station(
+        pompes={'GPL': Pompe(gpl, 100, 50),
+                'Gaz': [Pompe(gaz, 50, 20), Pompe(gaz, 50, 30)]},
+        prix={'GPL': 1.1, 'Gaz': 1.2})
+
+
+@pytest.mark.parametrize('volume, prix, centimes', [
+    (3, 0.1, 30), (7, 1.1, 770), (1, 1.005, 101), (1, 1.004, 100),
+    (10 ** 9, 1.999, 199900000000), (0, 2.0, 0),
+    (3, np.float64(1.1), 330), (3, np.float32(1.5), 450)])
+def test_montant_centimes(volume, prix, centimes):
+    assert montant_centimes(volume, prix) == centimes
+
+
+def test_grand_livre_totaux(station, tmp_path):
+    chemin = str(tmp_path / 'ventes.csv')
+    generateur = np.random.default_rng(0)
+    attendu: dict[str, int] = {}
+    with GrandLivre(station, chemin, taille_lot=7) as grand_livre:
+        for _ in range(500):
+            cle = ['GPL', 'Gaz'][generateur.integers(2)]
+            prix = station.prix[cle]
+            statut, servi = station.essayer_servir(
+                cle, int(generateur.integers(1, 15)))
+            if statut:
+                station._remplir_pompe(
+                    cle, 40, round(float(generateur.random() + 1), 3))
+            else:
+                attendu[cle] = attendu.get(cle, 0) + montant_centimes(
+                    servi, prix)
+
+        # Les lots sont comptés comme les services unitaires
+        prix = dict(station.prix)
+        station._remplir_pompe('GPL', 100)
+        station._remplir_pompe('Gaz', 100)
+        station.servir_lot(['GPL', 'Gaz'] * 10, [3] * 20)
+        for cle in attendu:
+            attendu[cle] += 10 * montant_centimes(3, prix[cle])
+
+    assert grand_livre.totaux() == attendu == GrandLivre.relire(chemin)
+    assert sum(attendu.values()) == grand_livre.total
+    assert sum(grand_livre.totaux_pompes().values()) == grand_livre.total
+    assert set(grand_livre.totaux_pompes()) == {
+        ('GPL', 0), ('Gaz', 0), ('Gaz', 1)}
+    assert grand_livre.total_carburant('inconnu') == 0
+
+
+def test_grand_livre_pompe_videe(station):
+    grand_livre = GrandLivre(station)
+    station.servir('GPL', 50)
+    assert station.prix['GPL'] is None
+    assert grand_livre.total_carburant('GPL') == 5500
+    grand_livre.fermer()
+    station._remplir_pompe('GPL', 10, 1.0)
+    station.servir('GPL', 10)
+    assert grand_livre.total == 5500
+    grand_livre.fermer()
+
+
+def test_grand_livre_arguments(station):
+    with pytest.raises(TypeError):
+        GrandLivre({})
+    with pytest.raises(ValueError):
+        GrandLivre(station, taille_lot=0)
+
+
+def test_grand_livre_pompes_groupe(station):
+    # Une vente servie par les deux pompes du groupe est répartie
+    grand_livre = GrandLivre(station)
+    station.servir('Gaz', 35)
+    assert station.pompes['Gaz']._volumes() == (15, 0)
+    assert grand_livre.total_pompe('Gaz', 0) == 600
+    assert grand_livre.total_pompe('Gaz', 1) == 3600
+    assert grand_livre.total_carburant('Gaz') == 4200
+    assert grand_livre.total_pompe('GPL') == 0
+
+    # Les parts arrondies ont pour somme le montant de la vente
+    station._remplir_pompe('Gaz', 100)
+    station._mettre_a_jour_prix('Gaz', 1.333)
+    for _ in range(7):
+        station.servir('Gaz', 13)
+    assert grand_livre.total_pompe('Gaz', 0) + \
+        grand_livre.total_pompe('Gaz', 1) == grand_livre.total_carburant('Gaz')
+
+
+def test_grand_livre_prix_numpy(station):
+    # Un prix NumPy, accepté par la station, est compté normalement
+    station._mettre_a_jour_prix('GPL', np.float64(1.1))
+    grand_livre = GrandLivre(station)
+    station.servir('GPL', 3)
+    assert grand_livre.total_carburant('GPL') == 330
@@ -0,0 +1,121 @@
+import pytest
+from carburant import Carburant
+from groupe_pompes import (
+    GroupePompes, StrategiePlusDisponible, StrategieTourniquet)
+from pompe import Pompe
+from station import Station
+
+
+@pytest.fixture
+def sp95(sp95_kwargs):
+    return Carburant(**sp95_kwargs)
+
+
+@pytest.fixture
+def pompes_test(sp95):
+    return [
+        Pompe(carburant=sp95, volume_maximal=100, volume_disponible=volume)
+        for volume in (10, 50, 30)]
+
+
+def volumes(groupe):
+    return [pompe.volume_disponible for pompe in groupe.pompes]
+
+
+def test_plus_disponible(pompes_test):
+    groupe = GroupePompes(pompes_test, StrategiePlusDisponible)
+    assert groupe._servir(25) == 25
+    assert volumes(groupe) == [10, 25, 30]
+    assert groupe._servir(10) == 10
+    assert volumes(groupe) == [10, 25, 20]
+
+
+def test_tourniquet(pompes_test):
+    groupe = GroupePompes(pompes_test, StrategieTourniquet)
+    for _ in range(3):
+        groupe._servir(5)
+    assert volumes(groupe) == [5, 45, 25]
+    groupe._servir(5)
+    assert volumes(groupe) == [0, 45, 25]
+    groupe._servir(5)
+    assert volumes(groupe) == [0, 40, 25]
+
+
+@pytest.mark.parametrize(
+    "strategie", [StrategiePlusDisponible, StrategieTourniquet])
+def test_debordement(pompes_test, strategie):
+    groupe = GroupePompes(pompes_test, strategie)
+    assert groupe._servir(70) == 70
+    assert groupe.volume_disponible == 20
+    assert groupe._servir(100) == 20
+    assert groupe._vide()
+    assert groupe._servir(1) == 0
+
+
+def test_remplir(pompes_test):
+    groupe = GroupePompes(pompes_test)
+    assert groupe._remplir(120) == 120
+    assert volumes(groupe) == [100, 80, 30]
+    assert groupe._remplir(1000) == 90
+    assert groupe.volume_disponible == groupe.volume_maximal == 300
+    with pytest.raises(ValueError):
+        groupe._remplir(0)
+    with pytest.raises(ValueError):
+        groupe._servir(-1)
+
+
+@pytest.mark.parametrize(
+    "strategie", [StrategiePlusDisponible, StrategieTourniquet])
+def test_totaux_tenus_a_jour(pompes_test, strategie):
+    groupe = GroupePompes(pompes_test, strategie)
+
+    def verifier():
+        assert groupe.volume_disponible == sum(volumes(groupe))
+        assert groupe._vide() == (sum(volumes(groupe)) == 0)
+
+    verifier()
+    groupe._servir(85)
+    verifier()
+    groupe._servir(10)
+    verifier()
+    groupe._remplir(5)
+    verifier()
+    groupe._fixer_volumes((0, 0, 0))
+    verifier()
+    groupe._fixer_volumes((0, 7, 100))
+    verifier()
+
+
+def test_groupe_invalide(sp95, e85_kwargs):
+    e85 = Carburant(**e85_kwargs)
+    with pytest.raises(ValueError):
+        GroupePompes([])
+    with pytest.raises(ValueError):
+        GroupePompes([
+            Pompe(carburant=sp95, volume_maximal=10),
+            Pompe(carburant=e85, volume_maximal=10)])
+    with pytest.raises(TypeError):
+        GroupePompes(Pompe(carburant=sp95, volume_maximal=10))
+
+
+def test_station_groupe(pompes_test):
+    station = Station(pompes={'SP95': pompes_test}, prix={'SP95': 1.7})
+    assert isinstance(station.pompes['SP95'], GroupePompes)
+    station.servir('SP95', 85)
+    assert station.prix['SP95'] == 1.7
+    station.servir('SP95', 10)
+    assert station.prix['SP95'] is None
+    with pytest.raises(ValueError):
+        station.servir('SP95', 1)
+    station._remplir_pompe('SP95', 150, 1.8)
+    assert station.pompes['SP95'].volume_disponible == 150
+
+
+def test_station_tourniquet(sp95):
+    groupe = GroupePompes([
+        Pompe(carburant=sp95, volume_maximal=100, volume_disponible=100)
+        for _ in range(3)], StrategieTourniquet)
+    station = Station(pompes={'SP95': groupe}, prix={'SP95': 1.7})
+    for _ in range(6):
+        station.servir('SP95', 1)
+    assert volumes(groupe) == [98, 98, 98]
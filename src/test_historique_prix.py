@@ -0,0 +1,76 @@
+import math
+import time
+
+import numpy as np
+import pytest
+from carburant import Carburant
+from historique_prix import HistoriquePrix, SeriePrix
+from pompe import Pompe
+from station import Station
+from substance_chimique import SubstanceChimique
+
+
+def test_serie_prix_comme_parcours():
+    # Les agrégats sont comparés à un parcours de tous les prix
+    generateur = np.random.default_rng(0)
+    serie = SeriePrix()
+    dates = np.cumsum(generateur.integers(1, 10, 300)).astype(float)
+    prix = [None if generateur.random() < 0.1 else
+            float(generateur.integers(100, 200)) / 100 for _ in dates]
+    for date, valeur in zip(dates, prix):
+        serie.ajouter_prix(date, valeur)
+
+    for _ in range(200):
+        debut, fin = sorted(generateur.uniform(-10, dates[-1] + 10, 2))
+        premier = max(np.searchsorted(dates, debut, 'right') - 1, 0)
+        dernier = np.searchsorted(dates, fin, 'right') - 1
+        en_vigueur = [p for p in prix[premier:dernier + 1] if p is not None]
+        assert serie.minimum(debut, fin) == min(en_vigueur, default=None)
+        assert serie.maximum(debut, fin) == max(en_vigueur, default=None)
+
+        # Moyenne pondérée par la durée, intervalle par intervalle
+        aire = duree = 0.0
+        for i in range(premier, dernier + 1):
+            gauche = max(dates[i], debut)
+            droite = min(dates[i + 1], fin) if i < dernier else fin
+            if prix[i] is not None and droite > gauche:
+                aire += prix[i] * (droite - gauche)
+                duree += droite - gauche
+        moyenne = serie.moyenne(debut, fin)
+        if duree > 0:
+            assert math.isclose(moyenne, aire / duree)
+
+
+def test_serie_prix_ventes():
+    serie = SeriePrix()
+    for date, volume, prix in ((1.0, 10, 2.0), (2.0, 30, 1.0), (3.0, 5, 4.0)):
+        serie.ajouter_vente(date, volume, prix)
+    assert serie.prix_moyen_pondere(0.0, 2.0) == 1.25
+    assert serie.prix_moyen_pondere(3.0, 3.0) == 4.0
+    assert serie.prix_moyen_pondere(4.0, 5.0) is None
+    with pytest.raises(ValueError):
+        serie.prix_moyen_pondere(2.0, 1.0)
+
+
+def test_historique_prix(monkeypatch):
+    instants = iter(range(10 ** 9))
+    monkeypatch.setattr(time, 'time', lambda: float(next(instants)))
+    butane = SubstanceChimique(
+        nom='butane', numero_cas='106-97-8', numero_ce='203-448-7')
+    gpl = Carburant(nom='GPL', composition_chimique={butane: 1.0})
+    station = Station(pompes={'GPL': Pompe(gpl, 100, 10)}, prix={'GPL': 1.0})
+
+    historique = HistoriquePrix(station)           # t = 0
+    station.servir('GPL', 10)                      # t = 1, pompe vide
+    station._remplir_pompe('GPL', 50, 3.0)         # t = 2
+    station.servir('GPL', 20)                      # t = 3
+    station._remplir_pompe('GPL', 10)              # t = 4, même prix
+
+    serie = historique.series['GPL']
+    assert len(serie) == 3 and math.isnan(serie.prix[1])
+    assert historique.maximum('GPL', 0.0, 10.0) == 3.0
+    assert historique.minimum('GPL', 1.5, 10.0) == 3.0
+    assert historique.moyenne('GPL', 0.0, 3.0) == 2.0
+    assert historique.moyenne('GPL', 1.2, 1.8) is None
+    assert historique.prix_moyen_pondere('GPL', 0.0, 10.0) == \
+        (10 * 1.0 + 20 * 3.0) / 30
@@ -0,0 +1,99 @@
+import sys
+import threading
+import time
+
+import numpy as np
+import pytest
+from carburant import Carburant
+from pompe import Pompe
+from station import Station
+from substance_chimique import SubstanceChimique
+
+
+@pytest.fixture
+def horloge(monkeypatch):
+    # Horloge simulée, avancée d'une seconde à chaque lecture
+    instants = iter(range(1_000, 10 ** 9))
+    monkeypatch.setattr(time, 'time', lambda: float(next(instants)))
+
+
+@pytest.fixture
+def station_test():
+    butane = SubstanceChimique(
+        nom='butane', numero_cas='106-97-8', numero_ce='203-448-7')
+    gpl = Carburant(nom='GPL', composition_chimique={butane: 1.0})
+    gaz = Carburant(nom='Gaz', composition_chimique={butane: 1.0})
+    return Station(
+        pompes={'GPL': Pompe(gpl, 100, 50),
+                'Gaz': [Pompe(gaz, 50, 20), Pompe(gaz, 50, 30)]},
+        prix={'GPL': 1.0, 'Gaz': 1.2})
+
+
+def etat(station):
+    return {nom: station._etat(nom) for nom in station.pompes}
+
+
+def test_etat_a(horloge, station_test):
+    historique = station_test.activer_historique(intervalle=7)
+    assert station_test.activer_historique() is historique
+
+    # État de la station relevé après chaque opération
+    generateur = np.random.default_rng(0)
+    releves = [(time.time(), etat(station_test))]
+    for _ in range(200):
+        nom = ['GPL', 'Gaz'][generateur.integers(2)]
+        if station_test.essayer_servir(
+                nom, int(generateur.integers(1, 15)))[0]:
+            station_test._remplir_pompe(
+                nom, 40, float(generateur.random() + 1))
+        releves.append((time.time(), etat(station_test)))
+
+    assert len(historique) >= 200
+    for instant, attendu in releves:
+        assert station_test.etat_a(instant) == attendu
+        assert station_test.etat_a(instant + 0.5) == attendu
+    with pytest.raises(ValueError):
+        station_test.etat_a(0.0)
+
+
+def test_etat_a_sans_historique(station_test):
+    with pytest.raises(ValueError):
+        station_test.etat_a(time.time())
+
+
+def test_etat_a_concurrent():
+    # Des threads servent des clés différentes d'une station concurrente :
+    # l'état de chaque clé, à chaque date enregistrée, doit rester cohérent
+    butane = SubstanceChimique(
+        nom='butane', numero_cas='106-97-8', numero_ce='203-448-7')
+    noms = [f'GPL-{i}' for i in range(8)]
+    station = Station(
+        pompes={nom: Pompe(Carburant(nom, {butane: 1.0}), 10 ** 6, 10_000)
+                for nom in noms},
+        prix={nom: 1.0 for nom in noms}, concurrente=True)
+    station.activer_historique(intervalle=5)
+    dates = []
+    station.abonner(lambda evenement: dates.append(evenement.horodatage))
+
+    def travailler(nom):
+        for _ in range(3_000):
+            station.servir(nom, 1)
+
+    intervalle = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        threads = [threading.Thread(target=travailler, args=(nom,))
+                   for nom in noms]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        sys.setswitchinterval(intervalle)
+
+    precedents = {nom: 10_000 for nom in noms}
+    for date in sorted(set(dates)):
+        for nom, (volumes, _) in station.etat_a(date).items():
+            assert len(volumes) == 1 and volumes[0] <= precedents[nom]
+            precedents[nom] = volumes[0]
+    assert precedents == {nom: 7_000 for nom in noms}
@@ -0,0 +1,56 @@
+import pytest
+from carburant import Carburant
+from index_inverse import IndexInverse
+
+
+@pytest.fixture
+def carburants(sp98_kwargs, sp95_kwargs, e85_kwargs, carburant_gazole_kwargs):
+    return [Carburant(**kwargs) for kwargs in (
+        sp98_kwargs, sp95_kwargs, e85_kwargs, carburant_gazole_kwargs)]
+
+
+@pytest.fixture
+def index_test(carburants):
+    return IndexInverse(carburants)
+
+
+def test_au_dessus(index_test, carburants):
+    sp98, sp95, _, _ = carburants
+    assert index_test.au_dessus(pytest.heptane, 0.02) == [(sp95, 0.05)]
+    assert index_test.au_dessus(pytest.heptane, 0.02, inclus=True) == \
+        [(sp95, 0.05), (sp98, 0.02)]
+    assert index_test.au_dessus(pytest.octane, 0.99) == []
+    assert index_test.au_dessus(pytest.butane, 0.0) == []
+
+
+def test_plus_riches(index_test, carburants):
+    sp98, sp95, _, _ = carburants
+    assert index_test.plus_riches(pytest.octane, 1) == [(sp98, 0.98)]
+    assert index_test.plus_riches(pytest.octane, 5) == \
+        [(sp98, 0.98), (sp95, 0.95)]
+    assert index_test.plus_riches(pytest.octane, 0) == []
+    with pytest.raises(ValueError):
+        index_test.plus_riches(pytest.octane, -1)
+
+
+def test_ajouter_incremental(index_test, sp95_e10_kwargs):
+    e90 = Carburant(**sp95_e10_kwargs)
+    index_test.ajouter(e90)
+    index_test.ajouter(e90)
+    assert len(index_test) == 5
+    assert [p for _, p in index_test.au_dessus(pytest.ethanol, 0.05)] == \
+        [0.9, 0.85]
+
+
+def test_retirer(index_test, carburants):
+    sp98, sp95, _, _ = carburants
+    index_test.retirer(sp98)
+    assert sp98 not in index_test
+    assert index_test.plus_riches(pytest.octane, 5) == [(sp95, 0.95)]
+    with pytest.raises(KeyError):
+        index_test.retirer(sp98)
+
+
+def test_ajouter_mauvais_type(index_test):
+    with pytest.raises(TypeError):
+        index_test.ajouter('SP95')
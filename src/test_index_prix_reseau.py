@@ -0,0 +1,116 @@
+import threading
+
+import numpy as np
+import pytest
+from carburant import Carburant
+from index_prix_reseau import IndexPrixReseau
+from pompe import Pompe
+from station import Station
+from substance_chimique import SubstanceChimique
+
+NOMS = ['SP95', 'Gazole']
+
+
+@pytest.fixture
+def stations():
+    octane = SubstanceChimique(
+        nom='octane', numero_cas='111-65-9', numero_ce='203-892-1')
+    carburants = {
+        nom: Carburant(nom=nom, composition_chimique={octane: 1.0})
+        for nom in NOMS}
+    generateur = np.random.default_rng(1)
+    return [
+        Station(
+            pompes={nom: Pompe(carburants[nom], 20, 10) for nom in NOMS},
+            prix={nom: round(float(generateur.uniform(1, 2)), 2)
+                  for nom in NOMS})
+        for _ in range(50)]
+
+
+def parcours(stations, nom, k):
+    prix = sorted(
+        (station.prix[nom], indice) for indice, station in enumerate(stations)
+        if station.prix.get(nom) is not None)
+    return [(p, stations[indice]) for p, indice in prix[:k]]
+
+
+def test_index_comme_parcours(stations):
+    index = IndexPrixReseau(stations)
+    generateur = np.random.default_rng(2)
+    for _ in range(3000):
+        station = stations[generateur.integers(len(stations))]
+        nom = NOMS[generateur.integers(len(NOMS))]
+        operation = generateur.integers(3)
+        prix = round(float(generateur.uniform(1, 2)), 2)
+        vide = station.prix[nom] is None
+        if operation == 0 and not vide:
+            station._mettre_a_jour_prix(nom, prix)
+        elif operation == 1:
+            station.essayer_servir(nom, int(generateur.integers(1, 8)))
+        else:
+            station._remplir_pompe(nom, 5, prix if vide else None)
+        k = int(generateur.integers(0, 8))
+        assert index.moins_chers(nom, k) == parcours(stations, nom, k)
+    for nom in NOMS:
+        assert index.moins_chers(nom, 100) == parcours(stations, nom, 100)
+    assert index.moins_cher('Inconnu') is None
+
+
+def test_index_actualiser(stations):
+    index = IndexPrixReseau(stations[:3])
+    moins_cher = min(stations[:3], key=lambda station: station.prix['SP95'])
+    indice = stations.index(moins_cher)
+    moins_cher.retirer_pompe('SP95')
+    index.actualiser(indice)
+    assert index.moins_chers('SP95', 3) == parcours(stations[:3], 'SP95', 3)
+
+    # Une station ajoutée ensuite est indexée
+    indice = index.ajouter_station(stations[3])
+    assert index.stations[indice] is stations[3]
+    assert index.moins_chers('SP95', 3) == parcours(stations[:4], 'SP95', 3)
+
+
+class PrixEspions(dict):
+    """Prix dont la première lecture laisse un autre thread agir."""
+
+    action = thread = None
+
+    def get(self, *arguments):
+        valeur = super().get(*arguments)
+        if self.action is not None and self.thread is None:
+            self.thread = threading.Thread(target=self.action)
+            self.thread.start()
+            # Le thread peut rester bloqué sur le verrou de l'index
+            self.thread.join(0.5)
+        return valeur
+
+
+def test_index_actualiser_concurrent(stations):
+    # Un prix lu par un observateur ne remplace pas celui qu'un
+    # `actualiser` concurrent a enregistré depuis
+    station = stations[0]
+    index = IndexPrixReseau([station])
+    station.prix = PrixEspions(station.prix)
+
+    def changer():
+        station.prix['SP95'] = 0.5
+        index.actualiser(0)
+    station.prix.action = changer
+    station._mettre_a_jour_prix('SP95', 0.9)
+    station.prix.thread.join(5)
+    assert index.moins_cher('SP95') == (0.5, station)
+
+
+def test_index_fermer(stations):
+    index = IndexPrixReseau(stations[:2])
+    index.fermer()
+    stations[0]._mettre_a_jour_prix('SP95', 0.5)
+    assert index.moins_cher('SP95')[0] != 0.5
+
+
+def test_index_arguments(stations):
+    index = IndexPrixReseau()
+    with pytest.raises(TypeError):
+        index.ajouter_station({})
+    with pytest.raises(ValueError):
+        index.moins_chers('SP95', -1)
@@ -0,0 +1,115 @@
+import os
+
+import pytest
+from carburant import Carburant
+from groupe_pompes import GroupePompes, StrategieTourniquet
+from instantane import ecrire_instantane, lire_instantane
+from pompe import Pompe
+from station import Station
+from substance_chimique import SubstanceChimique
+
+
+@pytest.fixture
+def stations_test():
+    butane = SubstanceChimique(
+        nom='butane', numero_cas='106-97-8', numero_ce='203-448-7')
+    propane = SubstanceChimique(
+        nom='propane', numero_cas='74-98-6', numero_ce='200-827-9')
+    gpl = Carburant('GPL', {butane: 0.6, propane: 0.4})
+    gaz = Carburant('Gaz', {propane: 1.0})
+    premiere = Station(
+        pompes={'GPL': Pompe(gpl, 100, 50),
+                'Gaz': [Pompe(gaz, 50, 20), Pompe(gaz, 50, 0)]},
+        prix={'GPL': 1.0, 'Gaz': 1.2}, concurrente=True)
+    seconde = Station(
+        pompes={'GPL': GroupePompes(
+                    [Pompe(gpl, 10, 5), Pompe(gpl, 10, 5)],
+                    StrategieTourniquet),
+                'Gaz': Pompe(gaz, 10, 1)},
+        prix={'GPL': 2.0, 'Gaz': 2.2})
+    seconde.servir('Gaz', 1)
+    return [premiere, seconde]
+
+
+def etats(stations):
+    return [{nom: station._etat(nom) for nom in station.pompes}
+            for station in stations]
+
+
+@pytest.mark.parametrize('valider', [True, False])
+@pytest.mark.parametrize('banque', [True, False])
+def test_instantane(tmp_path, stations_test, valider, banque):
+    chemin = str(tmp_path / 'parc.instantane')
+    ecrire_instantane(chemin, stations_test)
+    copies = lire_instantane(chemin, valider=valider, banque=banque)
+    assert etats(copies) == etats(stations_test)
+    premiere, seconde = copies
+    assert premiere.concurrente and not seconde.concurrente
+    assert seconde.pompes['GPL'].strategie is StrategieTourniquet
+    assert seconde.prix['Gaz'] is None
+
+    # Les carburants et substances sont partagés entre les pompes
+    assert premiere.pompes['GPL'].carburant is \
+        seconde.pompes['GPL'].pompes[0].carburant
+    assert premiere.pompes['GPL'].carburant == \
+        stations_test[0].pompes['GPL'].carburant
+
+    # Les stations restaurées fonctionnent normalement
+    premiere.servir('Gaz', 25)
+    assert premiere.pompes['Gaz'].volume_disponible == 0
+    assert premiere.prix['Gaz'] is None
+
+
+def test_instantane_corrompu(tmp_path, stations_test):
+    chemin = tmp_path / 'parc.instantane'
+    ecrire_instantane(str(chemin), stations_test)
+    donnees = bytearray(chemin.read_bytes())
+    donnees[-20] ^= 0xFF
+    chemin.write_bytes(bytes(donnees))
+    with pytest.raises(ValueError):
+        lire_instantane(str(chemin))
+    chemin.write_bytes(b'autre chose' * 4)
+    with pytest.raises(ValueError):
+        lire_instantane(str(chemin), valider=False)
+
+
+@pytest.mark.skipif(
+    not os.path.isdir('/proc/self/fd'), reason="/proc/self/fd absent")
+def test_instantane_corrompu_ferme(tmp_path, stations_test):
+    # Une lecture qui échoue ne laisse pas la projection ouverte
+    chemin = tmp_path / 'parc.instantane'
+    ecrire_instantane(str(chemin), stations_test)
+    donnees = chemin.read_bytes()
+    ouverts = len(os.listdir('/proc/self/fd'))
+
+    # Signature invalide, puis nom de substance illisible à la construction.
+    # Les exceptions sont conservées, avec les variables de leurs appels
+    erreurs = []
+    for corrompues in (bytes(8) + donnees[8:],
+                       donnees.replace(b'butane', b'\xff' * 6)):
+        chemin.write_bytes(corrompues)
+        for _ in range(5):
+            with pytest.raises(ValueError) as erreur:
+                lire_instantane(str(chemin), valider=False)
+            erreurs.append(erreur)
+    assert len(os.listdir('/proc/self/fd')) == ouverts
+
+
+def test_instantane_remplace_entier(tmp_path, stations_test, monkeypatch):
+    # Une écriture interrompue laisse l'instantané précédent intact
+    chemin = str(tmp_path / 'parc.instantane')
+    ecrire_instantane(chemin, stations_test)
+
+    def panne(descripteur):
+        raise OSError("Panne simulée.")
+    monkeypatch.setattr(os, 'fsync', panne)
+    with pytest.raises(OSError):
+        ecrire_instantane(chemin, stations_test[:1])
+    monkeypatch.undo()
+    assert etats(lire_instantane(chemin)) == etats(stations_test)
+
+
+def test_instantane_vide(tmp_path):
+    chemin = str(tmp_path / 'parc.instantane')
+    ecrire_instantane(chemin, [])
+    assert lire_instantane(chemin) == []
@@ -0,0 +1,154 @@
+import os
+import threading
+
+import numpy as np
+import pytest
+from carburant import Carburant
+from journal import Journal
+from pompe import Pompe
+from station import Station
+from substance_chimique import SubstanceChimique
+
+
+@pytest.fixture
+def creer_station():
+    butane = SubstanceChimique(
+        nom='butane', numero_cas='106-97-8', numero_ce='203-448-7')
+
+    def creer():
+        gpl = Carburant(nom='GPL', composition_chimique={butane: 1.0})
+        gaz = Carburant(nom='Gaz', composition_chimique={butane: 1.0})
+        return Station(
+            pompes={'GPL': Pompe(gpl, 100, 50),
+                    'Gaz': [Pompe(gaz, 50, 20), Pompe(gaz, 50, 30)]},
+            prix={'GPL': 1.0, 'Gaz': 1.2})
+    return creer
+
+
+def etat(station):
+    return {nom: station._etat(nom) for nom in station.pompes}
+
+
+def operer(station, graine, nombre):
+    generateur = np.random.default_rng(graine)
+    for _ in range(nombre):
+        nom = ['GPL', 'Gaz'][generateur.integers(2)]
+        if station.essayer_servir(nom, int(generateur.integers(1, 15)))[0]:
+            station._remplir_pompe(nom, 40, float(generateur.random() + 1))
+
+
+def test_journal_reprise(tmp_path, creer_station):
+    chemin = str(tmp_path / 'station.journal')
+    station = creer_station()
+    journal = Journal(chemin, station, taille_groupe=8)
+    operer(station, 0, 100)
+    journal.synchroniser()
+    attendu = etat(station)
+
+    # Les opérations non synchronisées sont perdues lors d'une panne
+    operer(station, 1, 3)
+    reprise = creer_station()
+    Journal.recuperer(chemin, reprise)
+    assert etat(reprise) == attendu
+
+
+def test_journal_groupe(tmp_path, creer_station):
+    chemin = str(tmp_path / 'station.journal')
+    station = creer_station()
+    with Journal(chemin, station, taille_groupe=4):
+        for _ in range(3):
+            station.servir('GPL', 1)
+        assert os.path.getsize(chemin) == 0
+        station.servir('Gaz', 1)
+        # Un enregistrement par clé modifiée dans le groupe
+        with open(chemin, 'rb') as fichier:
+            assert len(list(Journal.decoder(fichier.read()))) == 2
+
+    # Le journal fermé n'est plus abonné à la station
+    taille = os.path.getsize(chemin)
+    station.servir('GPL', 1)
+    assert os.path.getsize(chemin) == taille
+
+
+def test_journal_fin_corrompue(tmp_path, creer_station):
+    chemin = str(tmp_path / 'station.journal')
+    station = creer_station()
+    with Journal(chemin, station, taille_groupe=1):
+        operer(station, 2, 20)
+    attendu = etat(station)
+    with open(chemin, 'ab') as fichier:
+        fichier.write(Journal.encoder('GPL', (1,), 1.0)[:-3])
+    reprise = creer_station()
+    assert Journal.recuperer(chemin, reprise) > 0
+    assert etat(reprise) == attendu
+
+
+def test_journal_point_de_controle(tmp_path, creer_station):
+    chemin = str(tmp_path / 'station.journal')
+    station = creer_station()
+    with Journal(chemin, station, taille_groupe=5) as journal:
+        operer(station, 3, 50)
+        journal.point_de_controle()
+        assert os.path.getsize(chemin) == 0
+        operer(station, 4, 50)
+    reprise = creer_station()
+    Journal.recuperer(chemin, reprise)
+    assert etat(reprise) == etat(station)
+
+
+class PompeBloquante(Pompe):
+    """Pompe qui s'arrête au milieu d'un service, volume déjà retiré."""
+
+    milieu = None
+    reprendre = None
+
+    def _servir(self, volume):
+        volume_servi = super()._servir(volume)
+        if self.milieu is not None:
+            self.milieu.set()
+            self.reprendre.wait()
+        return volume_servi
+
+
+def test_journal_service_en_cours(tmp_path, creer_station):
+    # Une synchronisation déclenchée par une autre clé n'écrit pas l'état
+    # d'une pompe au milieu d'un service
+    chemin = str(tmp_path / 'station.journal')
+    gaz = creer_station().pompes['Gaz'].carburant
+
+    # Autre clé, d'un verrou différent de celui de 'Gaz'
+    autre = next(
+        nom for nom in (f'GPL-{i}' for i in range(100))
+        if hash(nom) % Station.NOMBRE_VERROUS !=
+        hash('Gaz') % Station.NOMBRE_VERROUS)
+    gpl = Carburant(autre, gaz.composition_chimique)
+
+    def creer(classe):
+        return Station(
+            pompes={autre: Pompe(gpl, 100, 50), 'Gaz': classe(gaz, 100, 50)},
+            prix={autre: 1.0, 'Gaz': 1.2}, concurrente=True)
+
+    station = creer(PompeBloquante)
+    journal = Journal(chemin, station, taille_groupe=2)
+    station.servir('Gaz', 10)
+
+    pompe = station.pompes['Gaz']
+    pompe.milieu, pompe.reprendre = threading.Event(), threading.Event()
+    thread = threading.Thread(target=station.servir, args=('Gaz', 40))
+    thread.start()
+    try:
+        assert pompe.milieu.wait(5)
+        station.servir(autre, 1)
+
+        # Reprise après une panne, le service en cours n'ayant pas abouti
+        reprise = creer(Pompe)
+        Journal.recuperer(chemin, reprise)
+        assert reprise._etat('Gaz') == ((40,), 1.2)
+        assert reprise._etat(autre) == ((49,), 1.0)
+    finally:
+        pompe.reprendre.set()
+        thread.join(5)
+    journal.fermer()
+    reprise = creer(Pompe)
+    Journal.recuperer(chemin, reprise)
+    assert reprise._etat('Gaz') == ((0,), None)
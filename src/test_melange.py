@@ -0,0 +1,72 @@
+import pytest
+from carburant import Carburant
+from melange import melanger, melanger_lot, remplir_avec_melange
+from pompe import Pompe
+
+
+@pytest.fixture
+def e85(e85_kwargs):
+    return Carburant(**e85_kwargs)
+
+
+@pytest.fixture
+def sp95(sp95_kwargs):
+    return Carburant(**sp95_kwargs)
+
+
+def test_melanger_proportions(e85, sp95):
+    melange = melanger(e85, 300, sp95, 100)
+    compacte = melange.composition_compacte
+    assert melange.nom == e85.nom
+    assert len(compacte) == 4
+    assert compacte.proportion(pytest.ethanol) == pytest.approx(0.85 * 0.75)
+    assert compacte.proportion(pytest.octane) == pytest.approx(0.95 * 0.25)
+    assert compacte.proportions.sum() == pytest.approx(1.0)
+
+
+def test_melanger_cuve_vide(e85, sp95):
+    melange = melanger(e85, 0, sp95, 100, nom='SP95')
+    assert melange == sp95
+
+
+def test_melanger_meme_carburant(sp95):
+    melange = melanger(sp95, 100, sp95, 50)
+    assert melange.composition_compacte.proportion(pytest.octane) == \
+        pytest.approx(0.95)
+    assert set(melange.composition_chimique) == set(sp95.composition_chimique)
+
+
+def test_melanger_lot(e85, sp95):
+    melanges = melanger_lot(
+        [e85, sp95, e85], [100, 50, 0], [sp95, e85, e85], [100, 50, 10])
+    assert melanges[0] == melanger(e85, 100, sp95, 100)
+    assert melanges[1] == melanger(sp95, 50, e85, 50)
+    assert melanges[2].composition_compacte == e85.composition_compacte
+    assert melanger_lot([], [], [], []) == []
+
+
+def test_melanger_arguments_invalides(e85, sp95):
+    with pytest.raises(ValueError):
+        melanger(e85, 0, sp95, 0)
+    with pytest.raises(ValueError):
+        melanger(e85, -1, sp95, 10)
+    with pytest.raises(ValueError):
+        melanger_lot([e85], [1, 2], [sp95], [1])
+    with pytest.raises(TypeError):
+        melanger(e85, 10, 'SP95', 10)
+
+
+def test_remplir_avec_melange(e85, sp95):
+    pompes = [
+        Pompe(carburant=e85, volume_maximal=100, volume_disponible=50),
+        Pompe(carburant=sp95, volume_maximal=100, volume_disponible=100),
+    ]
+    ajoutes = remplir_avec_melange(pompes, [sp95, e85], [80, 10])
+    assert ajoutes == [50, 0]
+    assert pompes[0].volume_disponible == 100
+    assert pompes[0].carburant.nom == e85.nom
+    assert pompes[0].carburant.composition_compacte.proportion(
+        pytest.ethanol) == pytest.approx(0.425)
+    assert pompes[1].carburant is sp95
+    with pytest.raises(ValueError):
+        remplir_avec_melange(pompes, [sp95], [0])
@@ -1,6 +1,7 @@
 import pytest
 from carburant import Carburant
 from pompe import Pompe
+from statut import Statut
 from substance_chimique import SubstanceChimique
 
 
@@ -102,3 +103,19 @@ def test_pompe_initialisation_volume_disponible_incorrect(carburant_test):
             volume_disponible=11), \
                 "Un volume disponible supérieur au volume " + \
                 "maximal devrait lever une ValueError."
+
+
+def test_pompe_volumes(pompe_test):
+    assert pompe_test.volume_maximal == 10
+    assert pompe_test.volume_disponible == 5
+    pompe_test._servir(2)
+    assert pompe_test.volume_disponible == 3
+    with pytest.raises(AttributeError):
+        pompe_test.volume_disponible = 10
+
+
+def test_pompe_essayer_servir(pompe_test):
+    assert pompe_test._essayer_servir(0) == (Statut.VOLUME_INVALIDE, 0)
+    assert pompe_test._essayer_servir(7) == (Statut.SERVI, 5)
+    assert pompe_test._essayer_servir(1) == (Statut.POMPE_VIDE, 0)
+    assert pompe_test._servir(1) == 0
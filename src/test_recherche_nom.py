@@ -0,0 +1,53 @@
+import pytest
+from recherche_nom import IndexTrigrammes, normaliser_nom, trigrammes
+from substance_chimique import SubstanceChimique
+
+
+@pytest.fixture
+def index_test(
+        ethanol_kwargs, octane_kwargs, heptane_kwargs, butane_kwargs,
+        propane_kwargs):
+    index = IndexTrigrammes()
+    for kwargs in (ethanol_kwargs, octane_kwargs, heptane_kwargs,
+                   butane_kwargs, propane_kwargs):
+        index.ajouter(SubstanceChimique(**kwargs))
+    return index
+
+
+def test_normaliser_nom():
+    assert normaliser_nom('Éthanol') == 'ethanol'
+    assert normaliser_nom(' Acide   ACÉTIQUE ') == 'acide acetique'
+
+
+def test_trigrammes():
+    assert trigrammes('ab') == {'  a', ' ab', 'ab '}
+
+
+@pytest.mark.parametrize("requete", ['ethanol', 'éthanol', 'etanol', 'ETHA'])
+def test_rechercher_ethanol(index_test, requete):
+    substance, score = index_test.rechercher(requete, k=1)[0]
+    assert substance.nom == 'éthanol'
+    assert 0 < score <= 1
+
+
+def test_rechercher_exact(index_test):
+    resultats = index_test.rechercher('butane')
+    assert resultats[0][0].nom == 'butane'
+    assert resultats[0][1] == 1.0
+    scores = [score for _, score in resultats]
+    assert scores == sorted(scores, reverse=True)
+
+
+def test_rechercher_k(index_test):
+    assert len(index_test.rechercher('ane', k=2)) == 2
+    assert index_test.rechercher('xyz') == []
+    with pytest.raises(ValueError):
+        index_test.rechercher('ane', k=0)
+
+
+def test_ajout_incremental(index_test, gazole_kwargs):
+    assert len(index_test) == 5
+    index_test.ajouter(SubstanceChimique(**gazole_kwargs))
+    index_test.ajouter(SubstanceChimique(**gazole_kwargs))
+    assert len(index_test) == 6
+    assert index_test.rechercher('gasole', k=1)[0][0].nom == 'gazole'
@@ -0,0 +1,63 @@
+import pytest
+from registre_substances import RegistreSubstances
+from substance_chimique import SubstanceChimique
+
+
+@pytest.fixture
+def registre_test(octane_kwargs, heptane_kwargs):
+    registre = RegistreSubstances()
+    registre.obtenir(**octane_kwargs)
+    registre.obtenir(**heptane_kwargs)
+    return registre
+
+
+def test_obtenir_interne(registre_test, octane_kwargs):
+    octane = registre_test.obtenir(**octane_kwargs)
+    assert octane is registre_test.obtenir(**octane_kwargs)
+    assert len(registre_test) == 2
+
+
+def test_ajouter_retourne_instance_enregistree(registre_test, octane_kwargs):
+    copie = SubstanceChimique(**octane_kwargs)
+    octane = registre_test.ajouter(copie)
+    assert octane is not copie
+    assert octane is registre_test.par_nom(octane_kwargs['nom'])
+    assert copie in registre_test
+
+
+def test_index(registre_test, heptane_kwargs):
+    heptane = registre_test.par_cas(heptane_kwargs['numero_cas'])
+    assert heptane is registre_test.par_ce(heptane_kwargs['numero_ce'])
+    assert heptane is registre_test.par_nom(heptane_kwargs['nom'])
+    assert set(registre_test) == {
+        heptane, registre_test.par_nom('octane')}
+
+
+def test_index_inconnu(registre_test):
+    with pytest.raises(KeyError):
+        registre_test.par_cas('50-00-0')
+    with pytest.raises(KeyError):
+        registre_test.par_ce('200-578-6')
+    with pytest.raises(KeyError):
+        registre_test.par_nom('éthanol')
+
+
+@pytest.mark.parametrize("kwargs", [
+    # Même nom, numéros différents
+    dict(nom='octane', numero_cas='64-17-5', numero_ce='200-578-6'),
+    # Même numéro CAS, nom différent
+    dict(nom='isooctane', numero_cas='111-65-9', numero_ce='200-578-6'),
+    # Même numéro CE, nom différent
+    dict(nom='isooctane', numero_cas='64-17-5', numero_ce='203-892-1'),
+])
+def test_conflit(registre_test, kwargs):
+    with pytest.raises(ValueError):
+        registre_test.obtenir(**kwargs)
+    with pytest.raises(ValueError):
+        registre_test.ajouter(SubstanceChimique(**kwargs))
+    assert len(registre_test) == 2
+
+
+def test_ajouter_mauvais_type(registre_test):
+    with pytest.raises(TypeError):
+        registre_test.ajouter('octane')
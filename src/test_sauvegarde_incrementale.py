@@ -0,0 +1,82 @@
+import os
+
+import numpy as np
+import pytest
+from carburant import Carburant
+from pompe import Pompe
+from sauvegarde_incrementale import SauvegardeIncrementale
+from station import Station
+from substance_chimique import SubstanceChimique
+
+
+@pytest.fixture
+def stations_test():
+    butane = SubstanceChimique(
+        nom='butane', numero_cas='106-97-8', numero_ce='203-448-7')
+    gpl = Carburant(nom='GPL', composition_chimique={butane: 1.0})
+    gaz = Carburant(nom='Gaz', composition_chimique={butane: 1.0})
+    return [Station(
+        pompes={'GPL': Pompe(gpl, 100, 50),
+                'Gaz': [Pompe(gaz, 50, 20), Pompe(gaz, 50, 30)]},
+        prix={'GPL': 1.0, 'Gaz': 1.2}) for _ in range(5)]
+
+
+def etats(stations):
+    return [{nom: station._etat(nom) for nom in station.pompes}
+            for station in stations]
+
+
+def operer(stations, generateur, nombre):
+    for _ in range(nombre):
+        station = stations[generateur.integers(len(stations))]
+        nom = ['GPL', 'Gaz'][generateur.integers(2)]
+        if station.essayer_servir(nom, int(generateur.integers(1, 15)))[0]:
+            station._remplir_pompe(nom, 40, float(generateur.random() + 1))
+
+
+def test_sauvegarde_incrementale(tmp_path, stations_test, monkeypatch):
+    # Fichiers publiés, pour vérifier qu'aucun n'est écrit pour rien
+    publies = []
+    remplacer = os.replace
+    monkeypatch.setattr(os, 'replace', lambda source, destination: (
+        publies.append(os.path.basename(destination)),
+        remplacer(source, destination)))
+
+    generateur = np.random.default_rng(0)
+    sauvegarde = SauvegardeIncrementale(
+        str(tmp_path), stations_test, compacter_apres=3)
+    for _ in range(7):
+        operer(stations_test, generateur, 20)
+        sauvegarde.point_de_controle()
+        copies = SauvegardeIncrementale.restaurer(str(tmp_path))
+        assert etats(copies) == etats(stations_test)
+
+    # Au plus deux fichiers de différences après compactage
+    fichiers = sorted(os.listdir(tmp_path))
+    assert fichiers == ['base-000002.bin', 'delta-000002-000000.bin']
+
+    # Le point de contrôle qui compacte n'écrit pas de différences
+    assert not [nom for nom in publies
+                if nom.startswith('delta') and nom.endswith('-000002.bin')]
+    assert publies.count('base-000001.bin') == 1
+
+
+def test_sauvegarde_seulement_modifiees(tmp_path, stations_test):
+    sauvegarde = SauvegardeIncrementale(str(tmp_path), stations_test)
+    assert sauvegarde.point_de_controle() == 0
+    stations_test[3].servir('Gaz', 5)
+    stations_test[3].servir('Gaz', 5)
+    stations_test[1]._mettre_a_jour_prix('GPL', 1.1)
+    assert sauvegarde.point_de_controle() == 2
+    sauvegarde.fermer()
+    stations_test[0].servir('GPL', 1)
+    assert sauvegarde.point_de_controle() == 0
+    copies = SauvegardeIncrementale.restaurer(str(tmp_path), valider=False)
+    assert copies[3]._etat('Gaz') == ((20, 20), 1.2)
+    assert copies[1].prix['GPL'] == 1.1
+    assert copies[0]._etat('GPL') == ((50,), 1.0)
+
+
+def test_sauvegarde_absente(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        SauvegardeIncrementale.restaurer(str(tmp_path))
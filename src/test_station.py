@@ -1,8 +1,16 @@
+import copy
+import sys
+import threading
+import time
+
+import numpy as np
 import pytest
+from groupe_pompes import GroupePompes
 from pompe import Pompe
 from carburant import Carburant
 from substance_chimique import SubstanceChimique
 from station import Station
+from statut import Statut
 
 
 @pytest.fixture
@@ -76,6 +84,17 @@ def test_prix_negatifs(pompte_test):
         Station(pompes={'SP95': pompe_test}, prix={'SP95': -2.0})
 
 
+def test_prix_manquant(carburant_test, pompe_test):
+    # Un prix manquant n'est admis que pour une pompe vide
+    vide = Pompe(carburant=carburant_test, volume_maximal=10)
+    station = Station(pompes={'SP95': vide}, prix={'SP95': None})
+    assert station.prix['SP95'] is None
+    with pytest.raises(ValueError):
+        Station(pompes={'SP95': pompe_test}, prix={'SP95': None})
+    with pytest.raises(ValueError):
+        Station(pompes={'SP95': [vide, pompe_test]}, prix={'SP95': None})
+
+
 def test_clefs_non_identiques(pompe_test):
     with pytest.raises(ValueError):
         Station(pompes={'SP95': pompe_test}, prix={'SP98': 2.0})
@@ -124,3 +143,228 @@ def test_remplir_pompe_vide_avec_prix_positif(station_test):
 def test_servir_volume_negatif(station_test):
     with pytest.raises(ValueError):
         station_test.servir('SP95', -1)
+
+
+def test_ajouter_pompe(station_test, pompe_sp98_kwargs):
+    station_test.ajouter_pompe('SP98', Pompe(**pompe_sp98_kwargs), 1.9)
+    assert station_test.prix['SP98'] == 1.9
+    station_test._remplir_pompe('SP98', 100, 1.95)
+    station_test.servir('SP98', 10)
+    assert station_test.pompes['SP98'].volume_disponible == 90
+    with pytest.raises(ValueError):
+        station_test.ajouter_pompe('SP98', Pompe(**pompe_sp98_kwargs), 1.9)
+    with pytest.raises(ValueError):
+        station_test.ajouter_pompe('E85', Pompe(**pompe_sp98_kwargs), -1)
+
+
+def test_retirer_pompe(station_test):
+    pompe = station_test.retirer_pompe('SP95')
+    assert pompe._vide() is False
+    assert 'SP95' not in station_test.prix
+    with pytest.raises(ValueError):
+        station_test.servir('SP95', 1)
+    with pytest.raises(ValueError):
+        station_test.retirer_pompe('SP95')
+
+
+def test_verifier_pompe_carburant_different(station_test, pompe_sp98_kwargs):
+    # La clé 'Gazole' désigne une pompe de SP98 : aucune pompe de Gazole
+    station_test.ajouter_pompe('Gazole', Pompe(**pompe_sp98_kwargs), 1.7)
+    with pytest.raises(ValueError):
+        station_test._remplir_pompe('Gazole', 10, 1.7)
+
+
+def servir_un_par_un(station, transactions):
+    """Sert les transactions avec `servir`, en relevant volumes et statuts."""
+    servis, statuts = [], []
+    for nom, volume in transactions:
+        pompe = station.pompes.get(nom)
+        avant = pompe.volume_disponible if pompe is not None else 0
+        try:
+            station.servir(nom, volume)
+            statuts.append(Statut.SERVI)
+        except ValueError as erreur:
+            statuts.append({
+                "Le nom du carburant est invalide.":
+                    Statut.CARBURANT_INVALIDE,
+                "Le carburant ne correspond à aucune pompe.":
+                    Statut.POMPE_INVALIDE,
+                "La pompe est vide.": Statut.POMPE_VIDE,
+                "Le volume doit être > 0.": Statut.VOLUME_INVALIDE,
+            }[str(erreur)])
+        apres = pompe.volume_disponible if pompe is not None else 0
+        servis.append(avant - apres)
+    return servis, statuts
+
+
+def test_servir_lot(station_test):
+    servis, statuts = station_test.servir_lot(
+        [('SP95', 2), ('E85', 1), ('SP95', -1), ('SP95', 4), ('SP95', 1)])
+    assert servis.tolist() == [2, 0, 0, 3, 0]
+    assert statuts.tolist() == [
+        Statut.SERVI, Statut.CARBURANT_INVALIDE, Statut.VOLUME_INVALIDE,
+        Statut.SERVI, Statut.POMPE_VIDE]
+    assert station_test.prix['SP95'] is None
+
+
+def test_servir_lot_colonnes(station_test):
+    servis, statuts = station_test.servir_lot(
+        ['SP95', 'SP95'], np.array([1, 1], dtype=np.int32))
+    assert servis.tolist() == [1, 1]
+    assert station_test.pompes['SP95'].volume_disponible == 3
+    with pytest.raises(TypeError):
+        station_test.servir_lot(['SP95'], [1.5])
+    with pytest.raises(ValueError):
+        station_test.servir_lot(['SP95'], [1, 2])
+    servis, statuts = station_test.servir_lot([])
+    assert len(servis) == len(statuts) == 0
+
+
+def test_servir_lot_comme_servir(pompe_test, carburant_test):
+    # Une pompe simple, un groupe de pompes et une clé sans pompe
+    pompe_gpl = Pompe(pompe_test.carburant, 10, 0)
+    groupe = GroupePompes([Pompe(carburant_test, 20, 12),
+                           Pompe(carburant_test, 20, 7)])
+    station = Station(
+        pompes={'SP95': pompe_test, 'GPL': pompe_gpl, 'Groupe': groupe},
+        prix={'SP95': 2.0, 'GPL': 1.0, 'Groupe': 1.5})
+    reference = copy.deepcopy(station)
+
+    generateur = np.random.default_rng(0)
+    noms = generateur.choice(['SP95', 'GPL', 'Groupe', 'E85'], 200)
+    volumes = generateur.integers(-1, 4, 200)
+    transactions = list(zip(noms.tolist(), volumes.tolist()))
+
+    servis, statuts = station.servir_lot(transactions)
+    servis_attendus, statuts_attendus = servir_un_par_un(
+        reference, transactions)
+    assert servis.tolist() == servis_attendus
+    assert statuts.tolist() == statuts_attendus
+    assert station.prix == reference.prix
+
+
+def test_essayer_servir(station_test):
+    assert station_test.essayer_servir('E85', 1) == \
+        (Statut.CARBURANT_INVALIDE, 0)
+    assert station_test.essayer_servir('SP95', 0) == \
+        (Statut.VOLUME_INVALIDE, 0)
+    assert station_test.essayer_servir('SP95', 2) == (Statut.SERVI, 2)
+    assert station_test.prix['SP95'] == 2.0
+    assert station_test.essayer_servir('SP95', 9) == (Statut.SERVI, 3)
+    assert station_test.prix['SP95'] is None
+    assert station_test.essayer_servir('SP95', 1) == (Statut.POMPE_VIDE, 0)
+    with pytest.raises(ValueError, match="La pompe est vide."):
+        station_test.servir('SP95', 1)
+
+
+class PompeLente:
+    """Pompe qui laisse la main aux autres threads au milieu d'un service."""
+
+    def __init__(self, carburant, volume_maximal, volume_disponible):
+        self.carburant = carburant
+        self.volume_maximal = volume_maximal
+        self.volume_disponible = volume_disponible
+
+    def _vide(self):
+        return self.volume_disponible == 0
+
+    def _remplir(self, volume):
+        disponible = self.volume_disponible
+        time.sleep(0)
+        self.volume_disponible = min(disponible + volume, self.volume_maximal)
+
+    def _servir(self, volume):
+        disponible = self.volume_disponible
+        time.sleep(0)
+        volume_servi = min(volume, disponible)
+        self.volume_disponible = disponible - volume_servi
+        return volume_servi
+
+
+def test_station_concurrente(carburant_test):
+    # Plusieurs threads servent et remplissent les mêmes pompes : aucun
+    # volume ne doit être perdu ni servi deux fois
+    noms = [f'SP95-{i}' for i in range(4)]
+    station = Station(
+        pompes={nom: PompeLente(
+            Carburant(nom, carburant_test.composition_chimique),
+            10 ** 9, 1_000) for nom in noms},
+        prix={nom: 2.0 for nom in noms}, concurrente=True)
+    servis = {nom: [] for nom in noms}
+    remplis = {nom: [] for nom in noms}
+
+    def travailler(graine):
+        generateur = np.random.default_rng(graine)
+        for i in generateur.integers(0, len(noms), 5_000).tolist():
+            nom = noms[i]
+            statut, volume = station.essayer_servir(
+                nom, int(generateur.integers(1, 20)))
+            servis[nom].append(volume)
+            if statut is Statut.POMPE_VIDE:
+                try:
+                    station._remplir_pompe(nom, 500, 2.0)
+                    remplis[nom].append(500)
+                except ValueError:
+                    # Un autre thread a rempli la pompe entre-temps
+                    pass
+
+    intervalle = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        threads = [threading.Thread(target=travailler, args=(graine,))
+                   for graine in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        sys.setswitchinterval(intervalle)
+
+    for nom in noms:
+        pompe = station.pompes[nom]
+        assert remplis[nom]
+        assert 1_000 + sum(remplis[nom]) - sum(servis[nom]) == \
+            pompe.volume_disponible
+        assert (station.prix[nom] is None) == pompe._vide()
+
+    # Une copie de la station a ses propres verrous
+    copie = copy.deepcopy(station)
+    copie._remplir_pompe(noms[0], 10, 2.0 if copie.pompes[noms[0]]._vide()
+                         else None)
+    assert copie.essayer_servir(noms[0], 1)[0] is Statut.SERVI
+
+
+def test_abonner(station_test):
+    evenements = []
+    station_test.abonner(evenements.append)
+    station_test.servir('SP95', 2)
+    station_test.servir_lot([('SP95', 1), ('SP95', 5)])
+    station_test._remplir_pompe('SP95', 4, 2.5)
+    station_test._mettre_a_jour_prix('SP95', 2.4)
+    assert [(e.operation, e.volume, e.prix) for e in evenements] == [
+        ('servir', 2, 2.0), ('servir', 1, 2.0), ('servir', 2, 2.0),
+        ('remplir', 4, 2.5), ('prix', 0, 2.4)]
+    station_test.desabonner(evenements.append)
+    station_test.servir('SP95', 1)
+    assert len(evenements) == 5
+
+
+def test_abonner_concurrent(carburant_test):
+    # Un autre thread désabonne le premier abonné pendant une
+    # notification : les abonnés suivants doivent tout de même la recevoir
+    station = Station(
+        pompes={'SP95': Pompe(carburant_test, 100, 50)},
+        prix={'SP95': 2.0}, concurrente=True)
+    evenements = []
+
+    def premier(evenement):
+        thread = threading.Thread(
+            target=station.desabonner, args=(premier,))
+        thread.start()
+        thread.join()
+
+    station.abonner(premier)
+    station.abonner(evenements.append)
+    station.servir('SP95', 1)
+    station.servir('SP95', 1)
+    assert len(evenements) == 2
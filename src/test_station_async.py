@@ -0,0 +1,84 @@
+import asyncio
+
+import pytest
+from carburant import Carburant
+from pompe import Pompe
+from station import Station
+from station_async import StationAsync
+from statut import Statut
+from substance_chimique import SubstanceChimique
+
+
+@pytest.fixture
+def station_test():
+    butane = SubstanceChimique(
+        nom='butane', numero_cas='106-97-8', numero_ce='203-448-7')
+    gpl = Carburant(nom='GPL', composition_chimique={butane: 1.0})
+    return Station(
+        pompes={'GPL': Pompe(gpl, 20, 4)}, prix={'GPL': 1.0})
+
+
+async def ventes_et_remplissage(guichet):
+    return await asyncio.gather(
+        guichet.essayer_servir('GPL', 4),
+        guichet.essayer_servir('GPL', 4),
+        guichet._remplir_pompe('GPL', 10),
+        return_exceptions=True)
+
+
+def test_remplissage_prioritaire(station_test):
+    async def scenario():
+        async with StationAsync(station_test) as guichet:
+            return await ventes_et_remplissage(guichet)
+
+    vente_1, vente_2, remplissage = asyncio.run(scenario())
+    # Le remplissage passe devant les deux ventes
+    assert vente_1 == vente_2 == (Statut.SERVI, 4)
+    assert remplissage is None
+    assert station_test.pompes['GPL'].volume_disponible == 6
+
+
+def test_ordre_arrivee(station_test):
+    async def scenario():
+        async with StationAsync(
+                station_test, remplissage_prioritaire=False) as guichet:
+            return await ventes_et_remplissage(guichet)
+
+    vente_1, vente_2, remplissage = asyncio.run(scenario())
+    # La première vente vide la pompe : le remplissage exige alors un prix
+    assert vente_1 == (Statut.SERVI, 4)
+    assert vente_2 == (Statut.POMPE_VIDE, 0)
+    assert isinstance(remplissage, ValueError)
+    assert station_test.prix['GPL'] is None
+
+
+def test_contre_pression_et_metriques(station_test):
+    async def scenario():
+        async with StationAsync(station_test, taille_file=2) as guichet:
+            resultats = await asyncio.gather(
+                *(guichet.essayer_servir('GPL', 1) for _ in range(6)))
+            return resultats, guichet.metriques('GPL')
+
+    resultats, metriques = asyncio.run(scenario())
+    assert [statut for statut, _ in resultats] == [Statut.SERVI] * 4 + \
+        [Statut.POMPE_VIDE] * 2
+    assert metriques.traitees == 6
+    assert metriques.profondeur == 0
+    assert 1 <= metriques.profondeur_maximale <= 2
+    assert metriques.attente_maximale >= metriques.attente_moyenne >= 0
+
+
+def test_erreurs(station_test):
+    async def scenario():
+        async with StationAsync(station_test) as guichet:
+            with pytest.raises(ValueError):
+                await guichet.servir('E85', 1)
+            with pytest.raises(ValueError):
+                await guichet.servir('GPL', 0)
+            await guichet._mettre_a_jour_prix('GPL', 1.5)
+            return guichet.metriques('E85')
+
+    assert asyncio.run(scenario()).traitees == 0
+    assert station_test.prix['GPL'] == 1.5
+    with pytest.raises(ValueError):
+        StationAsync(station_test, taille_file=0)
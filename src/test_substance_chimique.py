@@ -1,3 +1,4 @@
+import numpy as np
 import pytest
 from substance_chimique import SubstanceChimique
 
@@ -59,3 +60,126 @@ def test_incorrect_ce(gazole_kwargs):
     gazole_kwargs['numero_ce'] = 'invalid'
     with pytest.raises(ValueError):
         SubstanceChimique(**gazole_kwargs)
+
+
+@pytest.mark.parametrize("numeros_cas", [
+    ["50-00-0", "1234567-89-0", "123-45-67", "64-17-5", "68476-34-6"],
+    ["-00-0", "50-00-", "5a-00-0", "50-00-00", "50-00-01", "", "--"],
+    [],
+])
+def test_valide_cas_lot(numeros_cas):
+    attendu = [SubstanceChimique.valide_cas(numero) for numero in numeros_cas]
+    assert SubstanceChimique.valide_cas_lot(numeros_cas).tolist() == attendu
+
+
+@pytest.mark.parametrize("numeros_ce", [
+    ["200-578-6", "203-448-7", "123-456-8", "12-3456-7", "270-676-1"],
+    ["200-578-", "20a-578-6", "200-578-60", "", "invalid"],
+    [],
+])
+def test_valide_ce_lot(numeros_ce):
+    attendu = [SubstanceChimique.valide_ce(numero) for numero in numeros_ce]
+    assert SubstanceChimique.valide_ce_lot(numeros_ce).tolist() == attendu
+
+
+def test_valide_lot_tableau_numpy():
+    numeros_cas = np.array(["50-00-0", "123-45-67"])
+    assert SubstanceChimique.valide_cas_lot(numeros_cas).dtype == bool
+    assert SubstanceChimique.valide_cas_lot(numeros_cas).tolist() == \
+        [True, False]
+
+
+def test_immuable(butane_kwargs):
+    butane = SubstanceChimique(**butane_kwargs)
+    with pytest.raises(AttributeError):
+        butane.nom = 'propane'
+    with pytest.raises(AttributeError):
+        del butane.nom
+    assert not hasattr(butane, '__dict__')
+
+
+def test_hash_stable(butane_kwargs):
+    butane = SubstanceChimique(**butane_kwargs)
+    copie = SubstanceChimique(**butane_kwargs)
+    assert butane == copie
+    assert hash(butane) == hash(copie)
+    assert {butane: 1.0}[copie] == 1.0
+
+
+def test_copie(butane_kwargs):
+    import copy
+    import pickle
+    butane = SubstanceChimique(**butane_kwargs)
+    assert copy.deepcopy(butane) == butane
+    assert pickle.loads(pickle.dumps(butane)) == butane
+
+
+def test_egalite_substance_erronee(butane_kwargs):
+    butane = SubstanceChimique(**butane_kwargs)
+    erronee = SubstanceChimique(
+        nom='butane', numero_cas='74-98-6', numero_ce='200-827-9')
+    assert butane == butane
+    with pytest.raises(ValueError):
+        butane == erronee
+
+
+@pytest.mark.parametrize("numero_cas, cle", [
+    ("50-00-0", 50000),
+    ("64-17-5", 64175),
+    ("68476-34-6", 68476346),
+    ("0050-00-0", 50000),  # Zéros de tête ignorés
+])
+def test_cas_en_cle(numero_cas, cle):
+    assert SubstanceChimique.cas_en_cle(numero_cas) == cle
+    assert SubstanceChimique.cas_en_cle(SubstanceChimique.cle_en_cas(cle)) \
+        == cle
+
+
+@pytest.mark.parametrize("numero_ce, cle", [
+    ("200-578-6", 2005786),
+    ("012-345-4", 123454),
+])
+def test_ce_en_cle(numero_ce, cle):
+    assert SubstanceChimique.ce_en_cle(numero_ce) == cle
+    assert SubstanceChimique.cle_en_ce(cle) == numero_ce
+
+
+def test_cle_invalide():
+    with pytest.raises(ValueError):
+        SubstanceChimique.cas_en_cle("123-45-67")
+    with pytest.raises(ValueError):
+        SubstanceChimique.cle_en_cas(50001)
+    with pytest.raises(ValueError):
+        SubstanceChimique.ce_en_cle("123-456-8")
+    with pytest.raises(ValueError):
+        SubstanceChimique.cle_en_ce(-1)
+
+
+def test_cles_lot():
+    numeros_cas = ["50-00-0", "123-45-67", "68476-34-6", "0050-00-0"]
+    assert SubstanceChimique.cas_en_cle_lot(numeros_cas).tolist() == \
+        [50000, -1, 68476346, 50000]
+    numeros_ce = ["200-578-6", "123-456-8", "270-676-1"]
+    assert SubstanceChimique.ce_en_cle_lot(numeros_ce).tolist() == \
+        [2005786, -1, 2706761]
+
+
+def test_cle_substance(ethanol_kwargs, gazole_kwargs):
+    ethanol = SubstanceChimique(**ethanol_kwargs)
+    gazole = SubstanceChimique(**gazole_kwargs)
+    assert ethanol.cle == 64175 * 10 ** 7 + 2005786
+    assert ethanol.cle < gazole.cle < 2 ** 63
+
+
+def test_cle_calculee_une_fois(ethanol_kwargs, monkeypatch):
+    ethanol = SubstanceChimique(**ethanol_kwargs)
+    copie = SubstanceChimique._creer(**ethanol_kwargs)
+
+    # La clé lue n'est pas recalculée à partir des numéros
+    def interdit(numero):
+        raise AssertionError("Clé recalculée.")
+    monkeypatch.setattr(
+        SubstanceChimique, 'cas_en_cle', staticmethod(interdit))
+    monkeypatch.setattr(
+        SubstanceChimique, 'ce_en_cle', staticmethod(interdit))
+    assert ethanol.cle == copie.cle == 64175 * 10 ** 7 + 2005786